@@ -0,0 +1,216 @@
+import itertools
+import multiprocessing
+import queue
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import Model
+from Model.distance_field import DistanceField
+from Model.node_cell import Node_Cell
+
+# Tên hiển thị trong dropdown -> tên thuật toán của SolvingModel
+ALGORITHMS = {
+    "BFS": "BFS",
+    "DFS": "DFS",
+    "UCS": "UCS",
+    "A*": "A*",
+    "Bidirectional": "Bidirectional",
+    "Bidirectional Search": "Bidirectional",
+    "D* Lite": "D* Lite",
+    "Dial": "Dial",
+}
+
+def run_generate(width: int, height: int, mode: str, seed: Optional[int] = None):
+    """Sinh mê cung, trả về (grid, kết quả gọn để gửi qua queue) kèm trường khoảng cách tới đích"""
+    generator = Model.GenerationModel(width, height, Node_Cell, mode, seed)
+    generator.generate_maze()
+    plane = bytes(generator.get_status_plane())
+    return generator.grid, {
+        "plane": plane,
+        "field": DistanceField(plane, width, height, generator.end_pos) if generator.end_pos else None,
+        "width": width, "height": height,
+        "start": generator.start_pos, "end": generator.end_pos,
+        "mode": mode, "seed": seed,
+    }
+
+def run_solve(grid, width: int, height: int, start: Tuple[int, int], end: Tuple[int, int], algorithm: str,
+              solver: Optional[Model.SolvingModel] = None, costs: Optional[bytes] = None) -> Dict:
+    """Giải mê cung trên grid có sẵn, trả về đường đi, thứ tự thăm và metrics.
+
+    Truyền lại cùng solver cho cùng mê cung để D* Lite dùng lại trạng thái tìm kiếm.
+    costs: chi phí đi vào từng ô (xem SolvingModel.set_cost_plane), None = mọi bước cost 1.
+    """
+    solver = solver or Model.SolvingModel(grid, width, height)
+    cost_plane = None if costs is None else array("i", list(costs))
+    if cost_plane != solver.cost_plane:  # chỉ đặt lại khi đổi, để D* Lite giữ trạng thái
+        solver.set_cost_plane(cost_plane)
+    solver.start_pos, solver.end_pos = tuple(start), tuple(end)
+    metrics = solver.solve_maze(ALGORITHMS.get(algorithm, algorithm))
+    return {
+        "algorithm": algorithm, "found": bool(metrics),
+        "path": solver.solution_path[:],
+        "visit_order": solver.visit_order.tobytes(),
+        "nodes_expanded": solver.nodes_expanded,
+        "path_length": solver.path_length,
+        "solving_time": solver.solving_time,
+        "metrics": metrics.as_dict(),
+    }
+
+def _worker_main(jobs, results):
+    """Vòng lặp của tiến trình worker: nhận job, chạy Model, đẩy kết quả về"""
+    maze_id, grid, solver = None, None, None  # giữ lưới (và solver) của mê cung hiện tại để không phải dựng lại
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        job_id, kind, params = job
+        try:
+            if kind == "generate":
+                grid, result = run_generate(**params)
+                maze_id, solver = job_id, None
+            elif kind == "solve":
+                if params["maze_id"] != maze_id:
+                    grid = Model.grid_from_status_plane(params["plane"], params["width"], params["height"])
+                    maze_id, solver = params["maze_id"], None
+                if solver is None:
+                    solver = Model.SolvingModel(grid, params["width"], params["height"])
+                result = run_solve(grid, params["width"], params["height"], params["start"], params["end"],
+                                   params["algorithm"], solver, params.get("costs"))
+                result["maze_id"] = maze_id
+            else:
+                raise ValueError(f"Unknown job kind: {kind}")
+            results.put((job_id, kind, result))
+        except Exception as e:
+            results.put((job_id, "error", {"error": repr(e), "job_kind": kind}))
+
+class GameController:
+    """Nối GenerationModel / SolvingModel với App.
+
+    Việc sinh và giải chạy trong một tiến trình worker riêng nên vòng lặp 60 FPS
+    không bao giờ bị chặn; App gọi poll() mỗi frame để lấy kết quả (không chờ).
+    cancel() bỏ các job đang chờ và dừng hẳn job đang chạy.
+    compare() chạy mọi thuật toán song song trên một pool riêng (Controller.compare).
+    """
+    def __init__(self):
+        self._ctx = multiprocessing.get_context("spawn")
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, str] = {}
+        self._process = None
+        self._jobs = None
+        self._results = None
+
+        # Mê cung hiện tại (theo kết quả generate gần nhất)
+        self.maze: Optional[Dict] = None
+
+        # So sánh thuật toán: pool tạo khi cần lần đầu, giữ tới shutdown()
+        self._pool = None        # Controller.compare.SolverPool
+        self.comparison = None   # Controller.compare.Comparison đang chạy
+
+    # ---- worker
+    def _ensure_worker(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self._jobs = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._process = self._ctx.Process(target=_worker_main, args=(self._jobs, self._results), daemon=True)
+        self._process.start()
+
+    def _submit(self, kind: str, params: Dict) -> int:
+        self._ensure_worker()
+        job_id = next(self._ids)
+        self._pending[job_id] = kind
+        self._jobs.put((job_id, kind, params))
+        return job_id
+
+    # ---- requests
+    def generate(self, width: int, height: int, mode: str = "DFS", seed: Optional[int] = None) -> int:
+        return self._submit("generate", {"width": width, "height": height, "mode": mode, "seed": seed})
+
+    def solve(self, algorithm: str, start: Optional[Tuple[int, int]] = None,
+              costs: Optional[bytes] = None) -> Optional[int]:
+        """Giải mê cung hiện tại; start mặc định là điểm bắt đầu của mê cung, costs: chi phí từng ô"""
+        if self.maze is None:
+            return None
+        return self._submit("solve", {
+            "maze_id": self.maze["id"], "plane": self.maze["plane"],
+            "width": self.maze["width"], "height": self.maze["height"],
+            "start": tuple(start) if start else self.maze["start"], "end": self.maze["end"],
+            "algorithm": algorithm, "costs": costs,
+        })
+
+    def compare(self, start: Optional[Tuple[int, int]] = None, costs: Optional[bytes] = None,
+                algorithms: Optional[List[str]] = None) -> bool:
+        """So sánh mọi thuật toán trên mê cung hiện tại; poll() trả về từng kết quả (kind "compare")
+        rồi bảng tổng hợp (kind "compare_done")"""
+        if self.maze is None:
+            return False
+        self.cancel_compare()
+        if self._pool is None:
+            from Controller.compare import SolverPool  # nạp khi cần: python -m Controller.compare không bị nạp hai lần
+            self._pool = SolverPool()
+        self.comparison = self._pool.compare(
+            self.maze["plane"], self.maze["width"], self.maze["height"],
+            tuple(start) if start else self.maze["start"], self.maze["end"], algorithms, costs)
+        return True
+
+    def cancel_compare(self):
+        if self.comparison is not None:
+            self.comparison.cancel()
+            self.comparison = None
+
+    def cancel(self):
+        """Hủy mọi job chưa xong; nếu worker đang bận thì dừng tiến trình, lần sau tạo lại"""
+        self.cancel_compare()
+        if not self._pending:
+            return
+        self._pending.clear()
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        self._process = None
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending) or self.comparison is not None
+
+    def poll(self, max_results: int = 8) -> List[Dict]:
+        """Lấy các kết quả đã xong mà không chờ; kết quả của job đã hủy bị bỏ qua.
+
+        Job lỗi trả về kind "error" với "error" (repr của exception) và "job_kind".
+        """
+        out = []
+        while self._results is not None and len(out) < max_results:
+            try:
+                job_id, kind, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._pending.pop(job_id, None) is None:
+                continue
+            result["id"] = job_id
+            result["kind"] = kind
+            if kind == "generate":
+                self.maze = result
+            elif kind == "error" and result.get("job_kind") == "generate":
+                self.maze = None  # mê cung cũ không còn là mê cung hiện tại; App báo lỗi và cho sinh lại
+            out.append(result)
+        if self.comparison is not None:
+            comparison = self.comparison
+            for result in comparison.poll():
+                out.append({**result, "kind": "compare", "summary": comparison.summary()})
+            if comparison.done:
+                self.comparison = None
+                out.append({"kind": "compare_done", "summary": comparison.summary()})
+        return out
+
+    def shutdown(self):
+        self.cancel_compare()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._pending.clear()
+        if self._process is not None and self._process.is_alive():
+            self._jobs.put(None)
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
@@ -0,0 +1,206 @@
+"""Headless benchmark cho các thuật toán sinh / giải mê cung (không cần pygame).
+
+    python -m Controller.benchmark --out bench.json
+    python -m Controller.benchmark --sizes 21x13,101x101 --baseline bench_baseline.json
+    python -m Controller.benchmark --save-baseline bench_baseline.json
+
+Mỗi lần chạy ghi: thời gian (perf_counter, nhỏ nhất của nhiều lần lặp), bộ nhớ đỉnh
+(tracemalloc, đo ở một lần chạy riêng để không làm sai thời gian), nodes_expanded và path_length.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+import Model
+from Controller.cli import parse_algorithms, parse_modes, parse_size
+from Model.node_cell import Node_Cell
+
+DEFAULT_SIZES = [(21, 13), (51, 51), (101, 101), (251, 251), (501, 501), (1001, 1001), (2001, 2001)]
+DEFAULT_SEEDS = [1, 2, 3]
+DEFAULT_BUDGET = 30.0       # giây; vượt quá thì bỏ qua các kích thước lớn hơn của mode/thuật toán đó
+TIME_THRESHOLD = 0.25       # chậm hơn baseline > 25% là regression
+MEMORY_THRESHOLD = 0.10     # tốn bộ nhớ hơn baseline > 10% là regression
+MIN_TIME = 0.05             # bỏ qua so sánh thời gian với các lần chạy ngắn hơn (dưới mức nhiễu)
+MIN_REPEATS = 5             # mỗi phép đo lặp ít nhất chừng này lần ...
+MEASURE_TIME = 0.2          # ... và tới khi tổng thời gian đủ chừng này giây
+MAX_REPEATS = 200
+
+def measure(func, track_memory: bool = True, setup=None,
+            budget: Optional[float] = None) -> Tuple[float, int, Optional[int], object]:
+    """Lặp func, trả về (thời gian nhỏ nhất, số lần lặp, bộ nhớ đỉnh, kết quả).
+
+    setup() (không tính giờ) tạo trạng thái mới cho mỗi lần chạy, func(state) được đo;
+    bộ nhớ đo ở một lần chạy riêng sau cùng. Như timeit, gc được dọn trước và tắt trong lúc đo.
+    Có budget thì không lặp thêm lần nào làm tổng thời gian vượt budget; lần đầu đã vượt thì
+    cũng không đo bộ nhớ (kích thước lớn hơn sẽ bị bỏ qua).
+    """
+    setup = setup or (lambda: None)
+    best, total, runs = float("inf"), 0.0, 0
+    gc_enabled = gc.isenabled()
+    while runs < MAX_REPEATS and (runs < MIN_REPEATS or total < MEASURE_TIME) and \
+            not (budget is not None and runs and total + best > budget):
+        state = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func(state)
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_enabled: gc.enable()
+        best, total, runs = min(best, elapsed), total + elapsed, runs + 1
+    peak = None
+    if track_memory and (budget is None or best <= budget):
+        state = setup()
+        gc.collect()  # bộ đếm gc như nhau mỗi lần đo -> bộ nhớ đỉnh ổn định
+        tracemalloc.start()
+        try:
+            func(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, runs, peak, result
+
+def bench_generation(width: int, height: int, mode: str, seed: int, track_memory: bool = True,
+                     budget: Optional[float] = None):
+    def run(_):
+        generator = Model.GenerationModel(width, height, Node_Cell, mode, seed)
+        generator.generate_maze()
+        return generator
+    elapsed, runs, peak, generator = measure(run, track_memory, budget=budget)
+    record = {"kind": "generate", "mode": mode, "width": width, "height": height, "seed": seed,
+              "time": elapsed, "runs": runs, "peak_memory": peak}
+    return record, generator
+
+def bench_solving(generator, algorithm: str, track_memory: bool = True, budget: Optional[float] = None) -> Dict:
+    def setup():  # solver mới mỗi lần, để D* Lite không dùng lại kế hoạch của lần trước
+        solver = Model.SolvingModel(generator.grid, generator.maze_width, generator.height_width)
+        solver.start_pos, solver.end_pos = generator.start_pos, generator.end_pos
+        return solver
+    solvers = []
+    def run(solver):
+        solvers.append(solver)
+        return solver.solve_maze(algorithm)
+    elapsed, runs, peak, metrics = measure(run, track_memory, setup, budget)
+    solver = solvers[-1]
+    return {"kind": "solve", "mode": generator.mode, "algorithm": algorithm,
+            "width": generator.maze_width, "height": generator.height_width, "seed": generator.seed,
+            "time": elapsed, "runs": runs, "peak_memory": peak, "found": bool(metrics),
+            "nodes_expanded": solver.nodes_expanded, "path_length": solver.path_length,
+            "metrics": metrics.as_dict()}
+
+def run_benchmark(sizes, seeds, modes, algorithms, budget: float = DEFAULT_BUDGET,
+                  track_memory: bool = True, log=None) -> Dict:
+    results: List[Dict] = []
+    skipped = set()  # ("generate", mode) hoặc ("solve", algorithm) đã vượt budget
+    for width, height in sizes:
+        for mode in modes:
+            if ("generate", mode) in skipped:
+                continue
+            for seed in seeds:
+                record, generator = bench_generation(width, height, mode, seed, track_memory, budget)
+                results.append(record)
+                if log: log(record)
+                if record["time"] > budget:
+                    skipped.add(("generate", mode))
+                for algorithm in algorithms:
+                    if ("solve", algorithm) in skipped:
+                        continue
+                    record = bench_solving(generator, algorithm, track_memory, budget)
+                    results.append(record)
+                    if log: log(record)
+                    if record["time"] > budget:
+                        skipped.add(("solve", algorithm))
+                if ("generate", mode) in skipped:
+                    break
+    return {
+        "meta": {
+            "python": platform.python_version(), "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": [list(s) for s in sizes], "seeds": list(seeds),
+            "modes": list(modes), "algorithms": list(algorithms), "budget": budget,
+        },
+        "results": results,
+        "skipped": sorted(f"{kind}:{name}" for kind, name in skipped),
+    }
+
+def record_key(record: Dict) -> Tuple:
+    return (record["kind"], record["mode"], record.get("algorithm"), record["width"], record["height"], record["seed"])
+
+def compare(results: Dict, baseline: Dict, time_threshold: float = TIME_THRESHOLD,
+            memory_threshold: float = MEMORY_THRESHOLD) -> List[Dict]:
+    """So sánh với baseline; trả về danh sách regression (rỗng = đạt)"""
+    base = {record_key(r): r for r in baseline.get("results", [])}
+    problems = []
+    for record in results["results"]:
+        old = base.get(record_key(record))
+        if old is None:
+            continue
+        key = dict(zip(("kind", "mode", "algorithm", "width", "height", "seed"), record_key(record)))
+        if old["time"] >= MIN_TIME and record["time"] > old["time"] * (1 + time_threshold):
+            problems.append({**key, "metric": "time", "baseline": old["time"], "value": record["time"]})
+        if old.get("peak_memory") and record.get("peak_memory") and \
+                record["peak_memory"] > old["peak_memory"] * (1 + memory_threshold):
+            problems.append({**key, "metric": "peak_memory", "baseline": old["peak_memory"], "value": record["peak_memory"]})
+        for metric in ("nodes_expanded", "path_length"):
+            if metric in old and old[metric] != record.get(metric):
+                problems.append({**key, "metric": metric, "baseline": old[metric], "value": record.get(metric)})
+    return problems
+
+def parse_sizes(text: str) -> List[Tuple[int, int]]:
+    return [parse_size(part.strip()) for part in text.split(",")]
+
+def format_record(record: Dict) -> str:
+    name = record["mode"] if record["kind"] == "generate" else f"{record['mode']}/{record['algorithm']}"
+    memory = f"{record['peak_memory'] / 1e6:8.2f} MB" if record.get("peak_memory") is not None else "       - MB"
+    extra = f"  nodes={record['nodes_expanded']} path={record['path_length']}" if record["kind"] == "solve" else ""
+    return (f"{record['kind']:<8} {name:<32} {record['width']}x{record['height']:<6} seed={record['seed']:<4}"
+            f" {record['time'] * 1000:10.2f} ms x{record.get('runs', 1):<3} {memory}{extra}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GenerationModel / SolvingModel (headless)")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES, help="vd: 21x13,101x101,1001")
+    parser.add_argument("--seeds", type=lambda t: [int(s) for s in t.split(",")], default=DEFAULT_SEEDS)
+    parser.add_argument("--modes", type=parse_modes, default=Model.GENERATION_MODES)
+    parser.add_argument("--algorithms", type=parse_algorithms, default=Model.SOLVING_ALGORITHMS, help="vd: BFS,A* hoặc all")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="giây cho mỗi lần chạy trước khi bỏ kích thước lớn hơn")
+    parser.add_argument("--no-memory", action="store_true", help="không đo tracemalloc (chạy nhanh gấp đôi)")
+    parser.add_argument("--out", help="ghi kết quả JSON vào file này (mặc định stdout)")
+    parser.add_argument("--baseline", help="so sánh với file baseline, exit code 1 nếu có regression")
+    parser.add_argument("--save-baseline", help="ghi kết quả làm baseline mới")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    log = None if args.quiet else (lambda r: print(format_record(r), file=sys.stderr, flush=True))
+    results = run_benchmark(args.sizes, args.seeds, args.modes, args.algorithms, args.budget,
+                            not args.no_memory, log)
+
+    text = json.dumps(results, indent=1)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    elif not args.save_baseline:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.time_threshold, args.memory_threshold)
+        for p in problems:
+            print(f"REGRESSION {p['kind']} {p['mode']} {p['algorithm'] or ''} {p['width']}x{p['height']} "
+                  f"seed={p['seed']}: {p['metric']} {p['baseline']} -> {p['value']}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Giải mê cung hàng loạt từ dòng lệnh, xuất JSON Lines (không cần pygame).
+
+    python -m Controller.cli --generate 1000 --size 101x101 --mode DFS --algorithms BFS,A* > out.jsonl
+    python -m Controller.cli mazes/ other.txt --algorithms all --workers 8 --out results.jsonl
+
+Mỗi dòng kết quả là một (mê cung, thuật toán), được ghi ngay khi mê cung đó giải xong.
+Các mê cung được sinh/đọc lười và số job đang chạy bị giới hạn nên bộ nhớ không tăng theo
+số lượng mê cung.
+
+File mê cung: định dạng nhị phân của Model.maze_file (.mz, đọc qua mmap, không dựng lưới
+Node_Cell), hoặc dạng text: '#' là tường, '.' hoặc ' ' là đường, 'S' là start, 'E' là end.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import Model
+from Model.maze_file import MazeFile, is_maze_file
+from Model.node_cell import Node_Cell
+
+TEXT_WALL = "#"
+TEXT_START = "S"
+TEXT_END = "E"
+MAZE_EXTENSIONS = (".txt", ".maze", ".mz")
+
+def read_text_maze(path: str):
+    """File text -> (plane, width, height, start, end)"""
+    with open(path) as f:
+        lines = [line.rstrip("\r\n") for line in f]
+    while lines and not lines[-1].strip():  # chỉ bỏ dòng trống cuối file; dòng toàn ' ' là đường đi
+        lines.pop()
+    if not lines:
+        raise ValueError(f"Empty maze file: {path}")
+    width, height = max(len(line) for line in lines), len(lines)
+    plane = bytearray(width * height)  # 0 = tường (cả phần thiếu cuối dòng)
+    start = end = None
+    for y, line in enumerate(lines):
+        for x, ch in enumerate(line):
+            if ch == TEXT_WALL:
+                continue
+            plane[y * width + x] = 1
+            if ch == TEXT_START:
+                start, plane[y * width + x] = (x, y), 2
+            elif ch == TEXT_END:
+                end, plane[y * width + x] = (x, y), 3
+    if start is None:  # không đánh dấu -> ô mở đầu tiên / cuối cùng như GenerationModel
+        first = next((i for i, v in enumerate(plane) if v), None)
+        start = (first % width, first // width) if first is not None else None
+    if end is None:
+        last = next((i for i in range(len(plane) - 1, -1, -1) if plane[i]), None)
+        end = (last % width, last // width) if last is not None else None
+    return plane, width, height, start, end
+
+def iter_maze_files(paths: List[str]) -> Iterator[str]:
+    """Duyệt lười các file / thư mục được truyền vào"""
+    for path in paths:
+        if path == "-":
+            for line in sys.stdin:
+                if line.strip():
+                    yield line.strip()
+        elif os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(MAZE_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def iter_tasks(args) -> Iterator[Tuple]:
+    for path in iter_maze_files(args.mazes):
+        yield ("file", path)
+    if args.generate:
+        width, height = args.size
+        for i in range(args.generate):
+            seed = args.seed_start + i
+            for mode in args.modes:
+                yield ("generate", width, height, mode, seed)
+
+def run_task(task: Tuple, algorithms: List[str], include_path: bool = False,
+             save_dir: Optional[str] = None) -> List[Dict]:
+    """Sinh hoặc đọc một mê cung rồi giải bằng từng thuật toán; chạy được trong worker"""
+    maze_file = None
+    if task[0] == "generate":
+        _, width, height, mode, seed = task
+        info = {"source": "generate", "mode": mode, "seed": seed, "width": width, "height": height}
+    else:
+        info = {"source": task[1]}
+    try:
+        if task[0] == "generate":
+            generator = Model.GenerationModel(width, height, Node_Cell, mode, seed)
+            generator.generate_maze()
+            grid, start, end = generator.grid, generator.start_pos, generator.end_pos
+            if save_dir:
+                info["file"] = os.path.join(save_dir, f"{mode}_{width}x{height}_{seed}.mz")
+                generator.save(info["file"])
+        elif is_maze_file(task[1]):
+            grid = maze_file = MazeFile(task[1])
+            width, height, start, end = maze_file.width, maze_file.height, maze_file.start_pos, maze_file.end_pos
+            info.update(width=width, height=height, mode=maze_file.mode, seed=maze_file.seed)
+        else:
+            plane, width, height, start, end = read_text_maze(task[1])
+            grid = Model.grid_from_status_plane(plane, width, height)
+            info.update(width=width, height=height)
+    except Exception as e:
+        return [{**info, "error": repr(e)}]
+
+    results = []
+    solver = Model.SolvingModel(grid, width, height)
+    solver.start_pos, solver.end_pos = start, end
+    for algorithm in algorithms:
+        record = {**info, "algorithm": algorithm, "start": start, "end": end}
+        try:
+            t0 = time.perf_counter()
+            metrics = solver.solve_maze(algorithm)
+            record.update(found=bool(metrics), time=time.perf_counter() - t0,
+                          path_length=solver.path_length, nodes_expanded=solver.nodes_expanded,
+                          metrics=metrics.as_dict())
+            if include_path:
+                record["path"] = solver.solution_path[:]
+        except Exception as e:
+            record["error"] = repr(e)
+        results.append(record)
+    if maze_file is not None:
+        maze_file.close()
+    return results
+
+def run_batch(tasks: Iterator[Tuple], algorithms: List[str], emit, workers: int = 1,
+              include_path: bool = False, window: Optional[int] = None, save_dir: Optional[str] = None) -> int:
+    """Chạy các task, gọi emit(record) cho từng kết quả ngay khi xong. Trả về số kết quả."""
+    count = 0
+    if workers <= 1:
+        for task in tasks:
+            for record in run_task(task, algorithms, include_path, save_dir):
+                emit(record); count += 1
+        return count
+
+    window = window or workers * 4  # giới hạn số task đang chờ -> bộ nhớ phẳng
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = set()
+        for task in tasks:
+            inflight.add(pool.submit(run_task, task, algorithms, include_path, save_dir))
+            if len(inflight) >= window:
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for record in future.result():
+                        emit(record); count += 1
+        while inflight:
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    emit(record); count += 1
+    return count
+
+def parse_algorithms(text: str) -> List[str]:
+    if text.lower() == "all":
+        return list(Model.SOLVING_ALGORITHMS)
+    algorithms = [a.strip() for a in text.split(",") if a.strip()]
+    for algorithm in algorithms:
+        if algorithm not in Model.SOLVING_ALGORITHMS:
+            raise argparse.ArgumentTypeError(f"unknown algorithm {algorithm!r} (choose from {Model.SOLVING_ALGORITHMS})")
+    return algorithms
+
+def parse_modes(text: str) -> List[str]:
+    modes = [m.strip() for m in text.split(",") if m.strip()]
+    for mode in modes:
+        if mode not in Model.GENERATION_MODES:
+            raise argparse.ArgumentTypeError(f"unknown mode {mode!r} (choose from {Model.GENERATION_MODES})")
+    return modes
+
+def parse_size(text: str) -> Tuple[int, int]:
+    w, _, h = text.lower().partition("x")
+    try:
+        width, height = int(w), int(h or w)
+        Model.check_maze_size(width, height)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"bad size {text!r}: {e}") from None
+    return width, height
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Batch maze solver, one JSON line per result")
+    parser.add_argument("mazes", nargs="*", help="file mê cung hoặc thư mục ('-' = đọc danh sách từ stdin)")
+    parser.add_argument("--generate", type=int, default=0, metavar="N", help="sinh N mê cung cho mỗi mode")
+    parser.add_argument("--size", type=parse_size, default=(21, 13), help="kích thước khi sinh, vd 101x101")
+    parser.add_argument("--modes", "--mode", type=parse_modes, default=["DFS"], help="vd: DFS,Wilson")
+    parser.add_argument("--seed-start", type=int, default=0)
+    parser.add_argument("--algorithms", type=parse_algorithms, default=["BFS"], help="vd: BFS,A* hoặc all")
+    parser.add_argument("--workers", type=int, default=1, help="số tiến trình (1 = chạy tuần tự)")
+    parser.add_argument("--include-path", action="store_true", help="ghi cả danh sách ô của đường đi")
+    parser.add_argument("--save-dir", help="lưu các mê cung được sinh vào thư mục này (.mz)")
+    parser.add_argument("--out", help="file JSONL đầu ra (mặc định stdout)")
+    args = parser.parse_args(argv)
+    if not args.mazes and not args.generate:
+        parser.error("nothing to do: pass maze files or --generate N")
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        def emit(record):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+        if args.save_dir:
+            os.makedirs(args.save_dir, exist_ok=True)
+        run_batch(iter_tasks(args), args.algorithms, emit, args.workers, args.include_path,
+                  save_dir=args.save_dir)
+    finally:
+        if args.out:
+            out.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
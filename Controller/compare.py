@@ -0,0 +1,200 @@
+"""So sánh các thuật toán giải trên cùng một mê cung, chạy song song (không cần pygame).
+
+Mê cung (mảng byte trạng thái, theo sau là chi phí từng ô nếu có) được đặt một lần vào
+multiprocessing.shared_memory; mỗi tiến trình trong pool đọc thẳng vùng nhớ đó như một
+nguồn is_open / get_neighbors của SolvingModel (giống MazeFile), không nhận bản sao qua
+pickle và không dựng lưới Node_Cell. Kết quả từng thuật toán về ngay khi thuật toán đó
+xong, nên tổng thời gian xấp xỉ thời gian của thuật toán chậm nhất.
+
+    python -m Controller.compare --size 301x301 --mode Wilson
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import Model
+from Model.node_cell import Node_Cell
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # cùng thứ tự với SolvingModel.get_neighbors
+
+class SharedPlane:
+    """Mảng trạng thái (0 = tường) nằm trong shared memory, dùng làm nguồn cho SolvingModel"""
+    def __init__(self, buf, width: int, height: int):
+        self.width, self.height = width, height
+        self._plane = buf
+
+    def is_open(self, x: int, y: int) -> bool:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return self._plane[y * self.width + x] != 0
+
+    def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        width, height, plane = self.width, self.height, self._plane
+        neighbors = []
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and plane[ny * width + nx]:
+                neighbors.append((nx, ny))
+        return neighbors
+
+def solve_shared(name: str, width: int, height: int, start: Tuple[int, int], end: Tuple[int, int],
+                 algorithm: str, has_costs: bool) -> Dict:
+    """Chạy trong tiến trình của pool: giải trên vùng nhớ chung name"""
+    shm = shared_memory.SharedMemory(name=name)
+    count = width * height
+    plane = shm.buf[:count]
+    costs = shm.buf[count:2 * count] if has_costs else None
+    try:
+        solver = Model.SolvingModel(SharedPlane(plane, width, height), width, height)
+        if costs is not None:
+            solver.set_cost_plane(list(costs))
+        solver.start_pos, solver.end_pos = tuple(start), tuple(end)
+        metrics = solver.solve_maze(algorithm)
+        return {
+            "algorithm": algorithm, "found": bool(metrics),
+            "time": metrics.search_ns / 1e9,
+            "nodes_expanded": metrics.nodes_expanded,
+            "path_length": metrics.path_length,
+            "path_cost": metrics.path_cost,
+            "metrics": metrics.as_dict(),
+        }
+    finally:
+        plane.release()
+        if costs is not None:
+            costs.release()
+        shm.close()
+
+class Comparison:
+    """Một lần so sánh đang chạy. poll() lấy kết quả đã xong (không chờ), summary() để hiển thị."""
+    def __init__(self, shm: shared_memory.SharedMemory, futures: Dict, algorithms: Sequence[str]):
+        self._shm = shm
+        self._futures = futures  # future -> tên thuật toán
+        self.algorithms = list(algorithms)
+        self.results: Dict[str, Dict] = {}
+        self.started = time.perf_counter()
+        self.wall_time = 0.0
+
+    @property
+    def done(self) -> bool:
+        return not self._futures
+
+    def poll(self) -> List[Dict]:
+        """Các kết quả vừa xong kể từ lần gọi trước"""
+        out = []
+        for future in [f for f in self._futures if f.done()]:
+            algorithm = self._futures.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"algorithm": algorithm, "found": False, "error": repr(e)}
+            result["finished"] = time.perf_counter() - self.started
+            self.results[algorithm] = result
+            out.append(result)
+        if out:
+            self.wall_time = time.perf_counter() - self.started
+        if self.done:
+            self.close()
+        return out
+
+    def wait(self, timeout: Optional[float] = None) -> List[Dict]:
+        """Chờ tới khi mọi thuật toán xong (hoặc hết timeout), trả về các kết quả mới"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        out = self.poll()
+        while not self.done and (deadline is None or time.perf_counter() < deadline):
+            time.sleep(0.001)
+            out.extend(self.poll())
+        return out
+
+    def summary(self) -> Dict:
+        """Kết quả theo thứ tự thuật toán (chưa xong = None) kèm thời gian tổng"""
+        finished = [r for r in self.results.values() if "error" not in r]
+        times = [r["time"] for r in finished]
+        return {
+            "results": [self.results.get(a) for a in self.algorithms],
+            "finished": len(self.results), "total": len(self.algorithms),
+            "wall_time": self.wall_time,
+            "slowest": max(times, default=0.0),
+            "fastest": min(finished, key=lambda r: r["time"])["algorithm"] if finished else None,
+            "fewest_expanded": min(finished, key=lambda r: r["nodes_expanded"])["algorithm"] if finished else None,
+        }
+
+    def cancel(self):
+        for future in self._futures:
+            future.cancel()  # job đang chạy vẫn chạy nốt, kết quả bị bỏ
+        self._futures.clear()
+        self.close()
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+class SolverPool:
+    """Pool tiến trình giữ sẵn giữa các lần so sánh (chi phí khởi động spawn chỉ tốn một lần)"""
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or min(len(Model.SOLVING_ALGORITHMS), os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def compare(self, plane, width: int, height: int, start: Tuple[int, int], end: Tuple[int, int],
+                algorithms: Optional[Sequence[str]] = None, costs=None) -> Comparison:
+        """Gửi mọi thuật toán cho pool; mê cung được chép một lần vào shared memory"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        algorithms = list(algorithms or Model.SOLVING_ALGORITHMS)
+        count = width * height
+        shm = shared_memory.SharedMemory(create=True, size=count * (2 if costs is not None else 1))
+        shm.buf[:count] = bytes(plane[:count])
+        if costs is not None:
+            shm.buf[count:2 * count] = bytes(costs)  # chi phí 1..255 mỗi ô
+        futures = {}
+        try:
+            for algorithm in algorithms:
+                future = self._executor.submit(solve_shared, shm.name, width, height, tuple(start), tuple(end),
+                                               algorithm, costs is not None)
+                futures[future] = algorithm
+        except Exception:
+            for future in futures:
+                future.cancel()
+            shm.close(); shm.unlink()
+            raise
+        return Comparison(shm, futures, algorithms)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+def main(argv=None) -> int:
+    from Controller.cli import parse_size  # không nạp cli khi chỉ import Controller
+    parser = argparse.ArgumentParser(description="Run every solver on one maze in parallel and compare them.")
+    parser.add_argument("--size", type=parse_size, default=(101, 101), help="kích thước, vd 301x301")
+    parser.add_argument("--mode", default="DFS", choices=Model.GENERATION_MODES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    width, height = args.size
+    generator = Model.GenerationModel(width, height, Node_Cell, args.mode, args.seed)
+    generator.generate_maze()
+    pool = SolverPool(args.workers)
+    try:
+        comparison = pool.compare(generator.get_status_plane(), width, height, generator.start_pos, generator.end_pos)
+        for result in comparison.wait():
+            print(json.dumps({k: v for k, v in result.items() if k != "metrics"}), flush=True)
+        summary = comparison.summary()
+        del summary["results"]
+        print(json.dumps(summary))
+    finally:
+        pool.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
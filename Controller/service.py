@@ -0,0 +1,441 @@
+"""Dịch vụ HTTP/JSON cục bộ (asyncio) sinh và giải mê cung cho các service khác (không cần pygame).
+
+    python -m Controller.service --port 8765 --workers 4
+    python -m Controller.service --unix /tmp/maze.sock
+
+    POST /generate  {"width": 101, "height": 101, "mode": "DFS", "seed": 7}  -> thông tin + maze_id
+    POST /solve     {"maze_id": "DFS.101x101.7", "algorithm": "A*", "start": [1, 1]}  -> đường đi + metrics
+    GET  /maze/<maze_id>    mê cung dạng text ('#' tường, '.' đường, 'S' / 'E') như Controller.cli
+    GET  /metrics           (hoặc /metrics/cache, /metrics/queue, ...) cache, hàng đợi, độ trễ
+    GET  /health
+
+Việc nặng (sinh, giải) chạy trong một ProcessPoolExecutor, vòng lặp asyncio chỉ nhận / trả request:
+    - request giống hệt nhau đang chạy dùng chung một kết quả (coalescing)
+    - các truy vấn giải cùng một mê cung đến trong BATCH_WINDOW giây được gom thành một job
+      (gửi mê cung sang worker một lần, một SolvingModel cho cả lô)
+    - mê cung đã sinh nằm trong một LRU theo maze_id; maze_id = "mode.WxH.seed" nên mê cung
+      bị đẩy khỏi cache được sinh lại đúng như cũ khi cần
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import Model
+from Controller import ALGORITHMS
+from Controller.compare import SharedPlane
+from Model.node_cell import Node_Cell
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 64            # số mê cung giữ trong LRU
+BATCH_WINDOW = 0.005       # giây chờ gom các truy vấn giải cùng mê cung
+BATCH_MAX = 32             # lô đủ lớn thì gửi ngay
+MAX_CELLS = 2001 * 2001    # mê cung lớn nhất được sinh qua dịch vụ
+MAX_CELLS_BY_MODE = {"Wilson": 301 * 301}  # Wilson chậm hơn hẳn (random walk), ~8 s ở 301x301
+JOB_TIMEOUT = 60.0         # giây; job trong pool lâu hơn thì các request đang chờ nhận lỗi 504
+MAX_BODY = 1 << 20         # byte
+LATENCY_SAMPLES = 1024     # số mẫu gần nhất dùng cho p50 / p95
+ROUTES = ("generate", "solve", "maze", "metrics", "health")
+TEXT_CHARS = bytes.maketrans(bytes(range(6)), b"#.SE..")  # trạng thái -> ký tự của plane_to_text
+
+class ServiceError(Exception):
+    """Lỗi trả về cho client với mã HTTP status"""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+# ---- job chạy trong tiến trình của pool
+def generate_job(width: int, height: int, mode: str, seed: int) -> Dict:
+    generator = Model.GenerationModel(width, height, Node_Cell, mode, seed)
+    generator.generate_maze()
+    return {"plane": bytes(generator.get_status_plane()), "start": generator.start_pos, "end": generator.end_pos}
+
+def solve_batch_job(plane: bytes, width: int, height: int, queries: List[Tuple]) -> List[Dict]:
+    """Giải lần lượt các (thuật toán, start, end) trên cùng một mê cung"""
+    solver = Model.SolvingModel(SharedPlane(plane, width, height), width, height)
+    results = []
+    for algorithm, start, end in queries:
+        try:
+            solver.start_pos, solver.end_pos = start, end
+            metrics = solver.solve_maze(ALGORITHMS[algorithm])
+            results.append({
+                "found": bool(metrics),
+                "path": [list(p) for p in solver.solution_path],
+                "path_length": metrics.path_length,
+                "path_cost": metrics.path_cost,
+                "nodes_expanded": metrics.nodes_expanded,
+                "time": metrics.search_ns / 1e9,
+                "metrics": metrics.as_dict(),
+            })
+        except Exception as e:
+            results.append({"error": repr(e)})
+    return results
+
+def plane_to_text(plane, width: int, height: int) -> List[str]:
+    """Mảng trạng thái -> các dòng text mà Controller.cli.read_text_maze đọc được"""
+    text = bytes(plane).translate(TEXT_CHARS).decode("ascii")
+    return [text[y * width:(y + 1) * width] for y in range(height)]
+
+# ---- số liệu
+class MazeCache:
+    """LRU các mê cung đã sinh, đếm hit / miss / eviction.
+
+    coalesced: request đến khi mê cung đang được sinh, chờ chung job đó (không tính là miss).
+    """
+    def __init__(self, capacity: int = CACHE_SIZE):
+        self.capacity = capacity
+        self._mazes: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.coalesced = 0
+
+    def get(self, maze_id: str) -> Optional[Dict]:
+        maze = self._mazes.get(maze_id)
+        if maze is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._mazes.move_to_end(maze_id)
+        return maze
+
+    def put(self, maze_id: str, maze: Dict):
+        self._mazes[maze_id] = maze
+        self._mazes.move_to_end(maze_id)
+        while len(self._mazes) > self.capacity:
+            self._mazes.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {"size": len(self._mazes), "capacity": self.capacity, "hits": self.hits, "misses": self.misses,
+                "coalesced": self.coalesced, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+class LatencyStats:
+    """Số lần, trung bình (toàn bộ) và p50 / p95 / max (LATENCY_SAMPLES mẫu gần nhất), đơn vị ms"""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self._recent = deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self._recent.append(seconds)
+
+    def stats(self) -> Dict:
+        recent = sorted(self._recent)
+        pick = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] * 1000 if recent else 0.0
+        return {"count": self.count, "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+                "p50_ms": pick(0.5), "p95_ms": pick(0.95), "max_ms": recent[-1] * 1000 if recent else 0.0}
+
+# ---- dịch vụ
+class MazeService:
+    def __init__(self, workers: Optional[int] = None, cache_size: int = CACHE_SIZE,
+                 batch_window: float = BATCH_WINDOW, batch_max: int = BATCH_MAX, job_timeout: float = JOB_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window, self.batch_max = batch_window, batch_max
+        self.job_timeout = job_timeout
+        self.cache = MazeCache(cache_size)
+        self.latency: Dict[str, LatencyStats] = {}
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._inflight: Dict[Tuple, asyncio.Future] = {}   # khóa request -> kết quả đang tính
+        self._batches: Dict[str, Tuple[List, asyncio.TimerHandle]] = {}  # maze_id -> (truy vấn, hẹn giờ gửi)
+        self._pool_jobs = 0
+        self.requests = self.errors = self.coalesced = self.timeouts = 0
+        self.batch_count = self.batched_queries = self.max_batch = 0
+        self.started = time.time()
+
+    def _timing(self, name: str) -> LatencyStats:
+        return self.latency.setdefault(name, LatencyStats())
+
+    async def _run(self, func, *args):
+        """Chạy func trong pool; số job đang chờ / chạy là độ sâu hàng đợi.
+
+        Quá job_timeout thì báo lỗi cho mọi request đang chờ thay vì treo chúng; tiến trình
+        worker không dừng giữa chừng được nên job đó vẫn chạy nốt trong pool.
+        """
+        self._pool_jobs += 1
+        t0 = time.perf_counter()
+        try:
+            job = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+            return await asyncio.wait_for(job, self.job_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ServiceError(HTTPStatus.GATEWAY_TIMEOUT,
+                               f"{func.__name__} took longer than {self.job_timeout:g} s") from None
+        finally:
+            self._pool_jobs -= 1
+            self._timing("pool:" + func.__name__).add(time.perf_counter() - t0)
+
+    async def _coalesce(self, key: Tuple, make):
+        """Request trùng khóa với một request đang chạy thì chờ chung kết quả đó"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = self._inflight[key] = asyncio.ensure_future(make())
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)  # client bỏ đi không hủy việc của các client khác
+
+    # ---- mê cung
+    @staticmethod
+    def maze_id(width: int, height: int, mode: str, seed: int) -> str:
+        return f"{mode}.{width}x{height}.{seed}"
+
+    @staticmethod
+    def parse_maze_id(maze_id: str) -> Tuple[int, int, str, int]:
+        try:
+            mode, size, seed = maze_id.rsplit(".", 2)
+            width, _, height = size.partition("x")
+            return int(width), int(height), mode, int(seed)
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"bad maze_id {maze_id!r}") from None
+
+    async def get_maze(self, width: int, height: int, mode: str, seed: int) -> Dict:
+        if mode not in Model.GENERATION_MODES:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"unknown mode {mode!r} (choose from {Model.GENERATION_MODES})")
+        try:
+            Model.check_maze_size(width, height)
+        except ValueError as e:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        max_cells = MAX_CELLS_BY_MODE.get(mode, MAX_CELLS)
+        if width * height > max_cells:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"size {width}x{height} too large for {mode} (max {max_cells} cells)")
+        maze_id = self.maze_id(width, height, mode, seed)
+        key = ("generate", maze_id)
+        if key in self._inflight:  # chỉ request tạo job sinh mới tính là miss
+            self.cache.coalesced += 1
+        else:
+            maze = self.cache.get(maze_id)
+            if maze is not None:
+                return maze
+
+        async def generate():
+            result = await self._run(generate_job, width, height, mode, seed)
+            maze = {"maze_id": maze_id, "width": width, "height": height, "mode": mode, "seed": seed, **result}
+            self.cache.put(maze_id, maze)
+            return maze
+        return await self._coalesce(key, generate)
+
+    async def generate(self, params: Dict) -> Dict:
+        seed = params.get("seed")
+        maze = await self.get_maze(int(params["width"]), int(params.get("height", params["width"])),
+                                   params.get("mode", "DFS"), random.randrange(1 << 31) if seed is None else int(seed))
+        return {k: v for k, v in maze.items() if k != "plane"}
+
+    # ---- giải, gom theo mê cung
+    def _enqueue(self, maze: Dict, query: Tuple) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        maze_id = maze["maze_id"]
+        if maze_id not in self._batches:
+            self._batches[maze_id] = ([], loop.call_later(self.batch_window, self._flush, maze))
+        queries = self._batches[maze_id][0]
+        queries.append((query, future))
+        if len(queries) >= self.batch_max:
+            self._flush(maze)
+        return future
+
+    def _flush(self, maze: Dict):
+        queries, timer = self._batches.pop(maze["maze_id"], (None, None))
+        if not queries:
+            return
+        timer.cancel()
+        self.batch_count += 1
+        self.batched_queries += len(queries)
+        self.max_batch = max(self.max_batch, len(queries))
+        asyncio.ensure_future(self._solve_batch(maze, queries))
+
+    async def _solve_batch(self, maze: Dict, queries: List):
+        try:
+            results = await self._run(solve_batch_job, maze["plane"], maze["width"], maze["height"],
+                                      [query for query, _ in queries])
+        except ServiceError as e:  # vd quá job_timeout: trả đúng mã lỗi cho mọi truy vấn của lô
+            for _, future in queries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except Exception as e:
+            results = [{"error": repr(e)}] * len(queries)
+        for (_, future), result in zip(queries, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _cell(self, maze: Dict, value, name: str) -> Tuple[int, int]:
+        if value is None:
+            return tuple(maze[name])
+        try:
+            x, y = (int(v) for v in value)
+        except (TypeError, ValueError):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"{name} must be [x, y]") from None
+        if not (0 <= x < maze["width"] and 0 <= y < maze["height"]) or not maze["plane"][y * maze["width"] + x]:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"{name} {[x, y]} is not an open cell")
+        return x, y
+
+    async def solve(self, params: Dict) -> Dict:
+        algorithm = params.get("algorithm", "BFS")
+        if algorithm not in ALGORITHMS:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"unknown algorithm {algorithm!r} (choose from {list(ALGORITHMS)})")
+        if "maze_id" in params:
+            maze = await self.get_maze(*self.parse_maze_id(params["maze_id"]))
+        else:
+            maze = await self.get_maze(int(params["width"]), int(params.get("height", params["width"])),
+                                       params.get("mode", "DFS"), int(params.get("seed", 0)))
+        query = (algorithm, self._cell(maze, params.get("start"), "start"), self._cell(maze, params.get("end"), "end"))
+        result = await self._coalesce(("solve", maze["maze_id"]) + query, lambda: self._enqueue(maze, query))
+        if "error" in result:
+            raise ServiceError(HTTPStatus.INTERNAL_SERVER_ERROR, result["error"])
+        result = {"maze_id": maze["maze_id"], "algorithm": algorithm, "start": query[1], "end": query[2], **result}
+        if not params.get("include_path", True):
+            result.pop("path")
+        return result
+
+    async def maze_text(self, maze_id: str) -> Dict:
+        maze = await self.get_maze(*self.parse_maze_id(maze_id))
+        info = {k: v for k, v in maze.items() if k != "plane"}
+        # chép cả mê cung ra text: làm trong thread, không chặn vòng lặp
+        info["rows"] = await asyncio.get_running_loop().run_in_executor(
+            None, plane_to_text, maze["plane"], maze["width"], maze["height"])
+        return info
+
+    def metrics(self) -> Dict:
+        return {
+            "cache": self.cache.stats(),
+            "queue": {"pool_jobs": self._pool_jobs, "workers": self.workers, "inflight": len(self._inflight),
+                      "batched_queries": sum(len(queries) for queries, _ in self._batches.values())},
+            "batching": {"batches": self.batch_count, "queries": self.batched_queries, "max_batch": self.max_batch,
+                         "mean_batch": self.batched_queries / self.batch_count if self.batch_count else 0.0,
+                         "coalesced": self.coalesced},
+            "latency": {name: stats.stats() for name, stats in sorted(self.latency.items())},
+            "requests": self.requests, "errors": self.errors, "timeouts": self.timeouts,
+            "uptime": time.time() - self.started,
+        }
+
+    # ---- HTTP
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        """Một request -> (HTTP status, JSON)"""
+        path = urlsplit(target).path.rstrip("/") or "/"
+        parts = path.strip("/").split("/")
+        t0 = time.perf_counter()
+        self.requests += 1
+        try:
+            if method == "POST" and path in ("/generate", "/solve"):
+                try:
+                    params = json.loads(body or b"{}")
+                except ValueError as e:
+                    raise ServiceError(HTTPStatus.BAD_REQUEST, f"bad JSON: {e}") from None
+                if not isinstance(params, dict):
+                    raise ServiceError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+                payload = await (self.generate(params) if path == "/generate" else self.solve(params))
+            elif method == "GET" and parts[0] == "metrics" and len(parts) <= 2:
+                payload = self.metrics()
+                if len(parts) == 2:
+                    if parts[1] not in payload:
+                        raise ServiceError(HTTPStatus.NOT_FOUND, f"no metrics section {parts[1]!r}")
+                    payload = payload[parts[1]]
+            elif method == "GET" and parts[0] == "maze" and len(parts) == 2:
+                payload = await self.maze_text(parts[1])
+            elif method == "GET" and path == "/health":
+                payload = {"ok": True}
+            else:
+                raise ServiceError(HTTPStatus.NOT_FOUND, f"no route {method} {path}")
+            status = HTTPStatus.OK
+        except ServiceError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": f"bad request: {e!r}"}
+        except Exception as e:  # vd pool hỏng: báo lỗi cho client, dịch vụ vẫn chạy
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(e)}
+        if status != HTTPStatus.OK:
+            self.errors += 1
+        route = f"{method} /{parts[0]}" if parts[0] in ROUTES else "other"  # số khóa độ trễ có hạn
+        self._timing(route).add(time.perf_counter() - t0)
+        return status, payload
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 tối giản: Content-Length, keep-alive"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+                    keep = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method.upper(), target, body)
+                    keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep else 'close'}\r\n\r\n"
+                             .encode("latin-1") + data)
+                await writer.drain()
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, unix: Optional[str] = None):
+        if unix:
+            return await asyncio.start_unix_server(self._client, unix)
+        return await asyncio.start_server(self._client, host, port)
+
+    def close(self):
+        for queries, timer in self._batches.values():
+            timer.cancel()
+        self._batches.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+async def serve(args):
+    service = MazeService(args.workers, args.cache, args.batch_window, args.batch_max, args.job_timeout)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or "http://%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"maze service on {where} ({service.workers} workers)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON maze generation and solving service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 = cổng bất kỳ")
+    parser.add_argument("--unix", help="lắng nghe trên Unix socket này thay cho TCP")
+    parser.add_argument("--workers", type=int, default=None, help="số tiến trình của pool")
+    parser.add_argument("--cache", type=int, default=CACHE_SIZE, help="số mê cung giữ trong LRU")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW, help="giây gom truy vấn giải")
+    parser.add_argument("--batch-max", type=int, default=BATCH_MAX)
+    parser.add_argument("--job-timeout", type=float, default=JOB_TIMEOUT, help="giây tối đa cho một job trong pool")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
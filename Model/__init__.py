@@ -1,12 +1,19 @@
 import random
 import heapq
 import time
+import tracemalloc
+from array import array
 from collections import deque
 from typing import List, Tuple, Optional, Dict
 from Model.node_cell import Node_Cell
+from Model.maze_file import MazeFile, read_maze, write_maze
+from Model.dstar_lite import DStarLite, INF as DSTAR_INF
+from Model.distance_field import DistanceField, UNREACHABLE
+from Model.multi_goal import distance_matrix, visiting_order, stitch_path
+from Model.workspace import SolverWorkspace, WORKSPACES
 
 # Generation Algorithms: DFS, Kruskal, Binary Tree, Wilson, Recursive Division
-# Solving Algorithms: BFS, DFS, UCS, A*, Bidirectional Search
+# Solving Algorithms: BFS, DFS, UCS, A*, Bidirectional Search, D* Lite (tăng dần), Dial (hàng đợi theo bucket)
 # Các trạng thái của Node_Cell:
 # 0: Wall
 # 1: Path
@@ -15,11 +22,17 @@ from Model.node_cell import Node_Cell
 # 4: Path Found
 # 5: Moved Path
 
+GENERATION_MODES = ["DFS", "Kruskal", "Binary_Tree", "Wilson", "Recursive_Division"]
+SOLVING_ALGORITHMS = ["BFS", "DFS", "UCS", "A*", "Bidirectional", "D* Lite", "Dial"]
+WILSON_MAX_STEPS = 64  # hệ số giới hạn số bước của một random walk trong Wilson (chống treo)
+MIN_MAZE_SIZE = 3      # mê cung nhỏ nhất: một ô đi được bao quanh bởi tường
+
 class GenerationModel:
-    def __init__(self, maze_width, height_width, Node_Cell, mode):
+    def __init__(self, maze_width, height_width, Node_Cell, mode, seed: Optional[int] = None):
         self.maze_width = maze_width
         self.height_width = height_width
         self.mode = mode
+        self.seed = seed  # None = không cố định, ngược lại sinh lại được đúng mê cung
 
         # Khởi tạo lưới với tất cả ô là tường (status = 0)
         self.grid = [[Node_Cell(x, y, 0, False, 0, 0) for x in range(maze_width)] for y in range(height_width)]
@@ -39,7 +52,9 @@ class GenerationModel:
             nx, ny = x + dx, y + dy
             # Sửa lỗi: self.width -> self.maze_width, self.height -> self.height_width
             if 0 <= nx < self.maze_width and 0 <= ny < self.height_width:
-                neighbors
+                neighbors.append((nx, ny))
+
+        return neighbors
 
     def DFS(self, start_x: int, start_y: int):
         """Thuật toán Depth-First Search để sinh mê cung"""
@@ -94,11 +109,12 @@ class GenerationModel:
         parent = {}
 
         def find(pos):
-            if pos not in parent:
-                parent[pos] = pos
-            if parent[pos] != pos:
-                parent[pos] = find(parent[pos])
-            return parent[pos]
+            # Lặp, nén nửa đường đi (path halving): không đệ quy nên không chạm giới hạn đệ quy
+            parent.setdefault(pos, pos)
+            while parent[pos] != pos:
+                parent[pos] = parent[parent[pos]]
+                pos = parent[pos]
+            return pos
 
         def union(pos1, pos2):
             p1, p2 = find(pos1), find(pos2)
@@ -136,9 +152,14 @@ class GenerationModel:
 
     def Wilson(self):
         """Thuật toán Wilson để sinh mê cung"""
-        # Tạo danh sách tất cả các ô lẻ
+        # Tạo danh sách tất cả các ô lẻ (cùng tập ô với Kruskal / Binary_Tree)
         cells = [(x, y) for y in range(1, self.height_width, 2)
                  for x in range(1, self.maze_width, 2)]
+        if not cells:
+            raise ValueError(f"Maze {self.maze_width}x{self.height_width} too small for Wilson")
+        cell_set = set(cells)
+        # Tập ô liên thông nên random walk dừng với xác suất 1; giới hạn này chỉ để lỗi không thành treo
+        max_steps = WILSON_MAX_STEPS * len(cells) * max(1, len(cells).bit_length()) ** 2
 
         # Chọn ô đầu tiên làm điểm bắt đầu
         start = random.choice(cells)
@@ -149,12 +170,15 @@ class GenerationModel:
             # Chọn ô ngẫu nhiên chưa trong mê cung
             current = random.choice(remaining)
             path = [current]
+            steps = 0
 
             # Random walk cho đến khi gặp ô đã trong mê cung
             while self.grid[current[1]][current[0]].status != 1:
+                steps += 1
+                if steps > max_steps:
+                    raise RuntimeError(f"Wilson random walk did not reach the maze after {max_steps} steps")
                 neighbors = self.__get_neighbors(current[0], current[1])
-                valid_neighbors = [(x, y) for x, y in neighbors
-                                   if 1 <= x < self.maze_width - 1 and 1 <= y < self.height_width - 1]
+                valid_neighbors = [cell for cell in neighbors if cell in cell_set]
 
                 if valid_neighbors:
                     next_cell = random.choice(valid_neighbors)
@@ -240,6 +264,9 @@ class GenerationModel:
             self.__divide(wall_x + 1, y, width - (wall_x - x + 1), height)
     def generate_maze(self):
         """Sinh mê cung theo thuật toán đã chọn"""
+        if self.seed is not None:
+            random.seed(self.seed)
+
         if self.mode == "DFS":
             self.DFS(1, 1)  # Thêm tham số bắt buộc
         elif self.mode == "Kruskal":
@@ -257,6 +284,8 @@ class GenerationModel:
     def __set_start_end(self):
         """Đặt điểm bắt đầu và kết thúc"""
         # Tìm ô đường đi đầu tiên làm điểm bắt đầu
+        self.start_pos = None
+        self.end_pos = None
         for y in range(self.height_width):
             for x in range(self.maze_width):
                 if self.grid[y][x].status == 1:  # Path
@@ -276,10 +305,101 @@ class GenerationModel:
             if self.end_pos:
                 break
 
+    def get_status_plane(self) -> bytearray:
+        """Trạng thái các ô dưới dạng mảng byte (y * width + x)"""
+        return status_plane(self.grid)
+
+    def save(self, path: str, compress: bool = False):
+        """Ghi mê cung ra file nhị phân (xem Model.maze_file)"""
+        write_maze(path, self.get_status_plane(), self.maze_width, self.height_width,
+                   self.start_pos, self.end_pos, self.mode, self.seed, compress)
+
+    @classmethod
+    def load(cls, path: str, Node_Cell=Node_Cell) -> "GenerationModel":
+        """Đọc mê cung đã lưu bằng save()"""
+        data = read_maze(path)
+        model = cls(data["width"], data["height"], Node_Cell, data["mode"], data["seed"])
+        model.grid = grid_from_status_plane(data["plane"], data["width"], data["height"])
+        model.start_pos, model.end_pos = data["start"], data["end"]
+        model.generation_complete = True
+        return model
+
+def check_maze_size(width: int, height: int):
+    """ValueError nếu kích thước không sinh được mê cung đúng nghĩa (phải lẻ và >= MIN_MAZE_SIZE).
+
+    Các thuật toán sinh dùng ô tọa độ lẻ, tường ở tọa độ chẵn: kích thước chẵn làm mất viền ngoài.
+    """
+    for name, size in (("width", width), ("height", height)):
+        if size < MIN_MAZE_SIZE or size % 2 == 0:
+            raise ValueError(f"maze {name} must be odd and >= {MIN_MAZE_SIZE}, got {size}")
+
+def status_plane(grid: List[List[Node_Cell]]) -> bytearray:
+    """Lưới Node_Cell -> mảng byte trạng thái theo hàng (1 byte mỗi ô)"""
+    return bytearray(cell.status for row in grid for cell in row)
+
+def grid_from_status_plane(plane, width: int, height: int) -> List[List[Node_Cell]]:
+    """Mảng byte trạng thái -> lưới Node_Cell"""
+    return [[Node_Cell(x, y, plane[y * width + x], False, 0, 0) for x in range(width)] for y in range(height)]
+
+class SolverMetrics:
+    """Kết quả đo của một lần solve_maze (thời gian tính bằng ns, perf_counter_ns).
+
+    reset / search / reconstruct / mark được đo riêng: search không gồm phần tái tạo đường đi.
+    bool(metrics) == tìm được đường đi.
+    """
+    def __init__(self, algorithm: Optional[str] = None):
+        self.algorithm = algorithm
+        self.found = False
+        self.reset_ns = 0
+        self.search_ns = 0
+        self.reconstruct_ns = 0
+        self.mark_ns = 0
+        self.pushes = 0            # số lần đưa vào frontier (queue / stack / heap)
+        self.pops = 0              # số lần lấy ra khỏi frontier
+        self.duplicate_pops = 0    # lấy ra ô đã xét rồi bỏ qua (UCS, A*)
+        self.max_frontier = 0
+        self.nodes_expanded = 0
+        self.path_length = 0
+        self.path_cost = 0         # tổng chi phí các ô trên đường đi (trừ start), xem set_cost_plane
+        self.peak_memory: Optional[int] = None  # byte, chỉ khi solve_maze(track_memory=True)
+
+    def count(self, pushes: int, pops: int, duplicate_pops: int, max_frontier: int):
+        """Các thuật toán báo số liệu frontier khi kết thúc tìm kiếm"""
+        self.pushes += pushes
+        self.pops += pops
+        self.duplicate_pops += duplicate_pops
+        self.max_frontier = max(self.max_frontier, max_frontier)
+
+    @property
+    def total_ns(self) -> int:
+        return self.reset_ns + self.search_ns + self.reconstruct_ns + self.mark_ns
+
+    def __bool__(self) -> bool:
+        return self.found
+
+    def as_dict(self) -> Dict:
+        return {
+            "algorithm": self.algorithm, "found": self.found,
+            "reset_ns": self.reset_ns, "search_ns": self.search_ns,
+            "reconstruct_ns": self.reconstruct_ns, "mark_ns": self.mark_ns, "total_ns": self.total_ns,
+            "pushes": self.pushes, "pops": self.pops, "duplicate_pops": self.duplicate_pops,
+            "max_frontier": self.max_frontier, "nodes_expanded": self.nodes_expanded,
+            "path_length": self.path_length, "path_cost": self.path_cost, "peak_memory": self.peak_memory,
+        }
+
+    def __repr__(self):
+        return (f"SolverMetrics({self.algorithm}, found={self.found}, search={self.search_ns / 1e6:.3f}ms, "
+                f"expanded={self.nodes_expanded}, pushes={self.pushes}, max_frontier={self.max_frontier})")
+
 class SolvingModel:
-    def __init__(self, maze_grid: List[List[Node_Cell]], maze_width: int, maze_height: int):
-        # Dữ liệu mê cung
-        self.maze_grid = maze_grid
+    def __init__(self, maze_grid, maze_width: int, maze_height: int):
+        # Dữ liệu mê cung: lưới Node_Cell, hoặc nguồn có is_open/get_neighbors (vd MazeFile).
+        # Với nguồn không phải lưới thì không có trạng thái hiển thị để đánh dấu.
+        if hasattr(maze_grid, "is_open"):
+            self.source, self.maze_grid = maze_grid, None
+            self.get_neighbors = maze_grid.get_neighbors
+        else:
+            self.source, self.maze_grid = None, maze_grid
         self.maze_width = maze_width
         self.maze_height = maze_height
 
@@ -288,6 +408,16 @@ class SolvingModel:
         self.solution_path: List[Tuple[int, int]] = []
         self.visited_cells: List[Tuple[int, int]] = []
 
+        # Thứ tự thăm theo chỉ số ô (y * width + x), -1 = chưa thăm; g-cost ghi khi record_costs = True
+        self.visit_order = array('i', [-1]) * (maze_width * maze_height)
+        self.visit_costs = array('i', [-1]) * (maze_width * maze_height)
+        self.record_costs = False
+
+        # Chi phí đi vào từng ô (y * width + x), số nguyên >= 1; None = mọi bước cost 1.
+        # UCS, A*, Dial và D* Lite dùng; BFS / DFS / Bidirectional bỏ qua (chỉ đếm bước).
+        self.cost_plane: Optional[array] = None
+        self.min_cost = self.max_cost = 1
+
         # Trạng thái giải
         self.solving_complete = False
         self.solution_found = False
@@ -299,21 +429,60 @@ class SolvingModel:
         # Metrics
         self.steps_taken = 0
         self.path_length = 0
+        self.path_cost = 0
         self.nodes_expanded = 0
-        self.solving_time = 0.0
-
-    def reset_solving_state(self):
-        """Reset trạng thái để giải lại"""
-        self.solution_path.clear()
+        self.solving_time = 0.0  # thời gian tìm kiếm (giây), chi tiết trong self.metrics
+        self.metrics = SolverMetrics()
+
+        # D* Lite giữ trạng thái tìm kiếm giữa các lần giải (xem update_cells)
+        self.planner: Optional[DStarLite] = None
+
+        # Bộ nhớ làm việc của các thuật toán (Model.workspace), chỉ giữ trong lúc solve_maze
+        self.workspace: Optional[SolverWorkspace] = None
+
+        # Nhiều đích (solve_goals): trường khoảng cách cache theo goal, thứ tự đi tìm được
+        self.goal_fields: Dict[Tuple[int, int], DistanceField] = {}
+        self.goal_order: List[Tuple[int, int]] = []
+
+    def reset_solving_state(self, full: bool = True):
+        """Reset trạng thái để giải lại.
+
+        full=False chỉ dọn các ô mà lần giải trước đã đánh dấu (tốn theo số ô đó, không theo
+        kích thước mê cung); dùng cho D* Lite khi lưới không bị ai khác đánh dấu.
+        """
+        touched = self.visited_cells + self.solution_path if not full else None
+        if self.maze_grid is not None:
+            for x, y in self.visited_cells:
+                cell = self.maze_grid[y][x]
+                cell.g_cost = cell.h_cost = cell.f_cost = 0
+        if touched is not None:
+            for x, y in self.visited_cells:
+                self.visit_order[y * self.maze_width + x] = -1
+                if self.record_costs:
+                    self.visit_costs[y * self.maze_width + x] = -1
+        else:
+            self.visit_order = array('i', [-1]) * (self.maze_width * self.maze_height)
+            if self.record_costs:
+                self.visit_costs = array('i', [-1]) * (self.maze_width * self.maze_height)
+        self.solution_path = []
         self.visited_cells.clear()
         self.solving_complete = False
         self.solution_found = False
         self.steps_taken = 0
         self.path_length = 0
+        self.path_cost = 0
         self.nodes_expanded = 0
         self.solving_time = 0.0
 
         # Reset visual state
+        if self.maze_grid is None:
+            return
+        if touched is not None:
+            for x, y in touched:
+                cell = self.maze_grid[y][x]
+                if cell.status in [4, 5]:
+                    cell.status = 2 if (x, y) == self.start_pos else (3 if (x, y) == self.end_pos else 1)
+            return
         for y in range(self.maze_height):
             for x in range(self.maze_width):
                 if self.maze_grid[y][x].status in [4, 5]:  # Path Found, Moved Path
@@ -337,20 +506,108 @@ class SolvingModel:
 
         return neighbors
 
+    def set_cost_plane(self, costs=None):
+        """Đặt chi phí đi vào từng ô: dãy số nguyên >= 1 theo hàng (y * width + x); None = cost 1"""
+        if costs is None:
+            self.cost_plane = None
+            self.min_cost = self.max_cost = 1
+        else:
+            plane = array('i', list(costs))
+            if len(plane) != self.maze_width * self.maze_height:
+                raise ValueError(f"Cost plane has {len(plane)} cells, maze has {self.maze_width * self.maze_height}")
+            self.min_cost, self.max_cost = min(plane), max(plane)
+            if self.min_cost < 1:
+                raise ValueError("Cell costs must be positive integers")
+            self.cost_plane = plane
+        self.planner = None  # g / rhs của D* Lite tính theo chi phí cũ
+
+    def step_cost(self, pos: Tuple[int, int]) -> int:
+        """Chi phí bước vào ô pos"""
+        if self.cost_plane is None:
+            return 1
+        return self.cost_plane[pos[1] * self.maze_width + pos[0]]
+
+    def record_visit(self, pos: Tuple[int, int], g_cost: Optional[int] = None, h_cost: int = 0):
+        """Ghi nhận một ô vừa được thăm: danh sách, mảng thứ tự thăm và trạng thái hiển thị"""
+        self.visit_index(pos[1] * self.maze_width + pos[0], g_cost, h_cost, pos)
+
+    def visit_index(self, index: int, g_cost: Optional[int] = None, h_cost: int = 0,
+                    pos: Optional[Tuple[int, int]] = None):
+        """record_visit theo chỉ số ô (các thuật toán làm việc với chỉ số)"""
+        if pos is None:
+            pos = (index % self.maze_width, index // self.maze_width)
+        if self.visit_order[index] < 0:  # giữ lần thăm đầu tiên
+            self.visit_order[index] = len(self.visited_cells)
+        if self.record_costs and g_cost is not None:
+            self.visit_costs[index] = g_cost
+        self.visited_cells.append(pos)
+
+        # Đánh dấu ô đã thăm (và chi phí thật của ô với các thuật toán có chi phí)
+        if self.maze_grid is not None:
+            cell = self.maze_grid[pos[1]][pos[0]]
+            if g_cost is not None:
+                cell.g_cost, cell.h_cost, cell.f_cost = g_cost, h_cost, g_cost + h_cost
+            if pos != self.start_pos and pos != self.end_pos:
+                cell.status = 5  # Moved Path
+
+    def cell_index(self, pos: Tuple[int, int]) -> int:
+        return pos[1] * self.maze_width + pos[0]
+
+    def neighbor_indices(self, i: int) -> List[int]:
+        """Chỉ số các ô láng giềng đi được, cùng thứ tự với get_neighbors"""
+        width = self.maze_width
+        y, x = divmod(i, width)
+        grid = self.maze_grid
+        if grid is None:
+            return [ny * width + nx for nx, ny in self.get_neighbors(x, y)]
+        neighbors = []
+        if y + 1 < self.maze_height and grid[y + 1][x].status != 0:
+            neighbors.append(i + width)
+        if y > 0 and grid[y - 1][x].status != 0:
+            neighbors.append(i - width)
+        if x + 1 < width and grid[y][x + 1].status != 0:
+            neighbors.append(i + 1)
+        if x > 0 and grid[y][x - 1].status != 0:
+            neighbors.append(i - 1)
+        return neighbors
+
     def heuristic(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
-        """Hàm heuristic cho A* (Manhattan distance)"""
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+        """Hàm heuristic cho A* (Manhattan distance nhân chi phí ô nhỏ nhất, vẫn admissible)"""
+        return (abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])) * self.min_cost
 
-    def reconstruct_path(self, came_from: Dict[Tuple[int, int], Tuple[int, int]]) -> List[Tuple[int, int]]:
-        """Tái tạo đường đi từ came_from dictionary"""
+    def begin_workspace(self) -> SolverWorkspace:
+        """Workspace cho lần giải này: lấy từ pool lần đầu (solve_maze trả lại), thế hệ mới mỗi lần"""
+        if self.workspace is None:
+            self.workspace = WORKSPACES.acquire(self.maze_width * self.maze_height)
+        else:
+            self.workspace.begin()
+        return self.workspace
+
+    def reconstruct_path(self, end: int, parent: Optional[array] = None) -> List[Tuple[int, int]]:
+        """Tái tạo đường đi start -> end theo mảng parent của workspace"""
+        t0 = time.perf_counter_ns()
+        parent = self.workspace.parent if parent is None else parent
+        width = self.maze_width
         path = []
-        current = self.end_pos
-
-        while current is not None:
-            path.append(current)
-            current = came_from.get(current)
+        i = end
+        while i >= 0:
+            path.append((i % width, i // width))
+            i = parent[i]
 
         path.reverse()
+        self.metrics.reconstruct_ns += time.perf_counter_ns() - t0
+        return path
+
+    def join_paths(self, meet: int) -> List[Tuple[int, int]]:
+        """Ghép đường đi của Bidirectional Search tại ô gặp nhau (parent phía start, parent2 phía end)"""
+        path = self.reconstruct_path(meet)
+        t0 = time.perf_counter_ns()
+        parent2, width = self.workspace.parent2, self.maze_width
+        i = parent2[meet]
+        while i >= 0:
+            path.append((i % width, i // width))
+            i = parent2[i]
+        self.metrics.reconstruct_ns += time.perf_counter_ns() - t0
         return path
 
     def BFS(self) -> bool:
@@ -358,268 +615,458 @@ class SolvingModel:
         if not self.start_pos or not self.end_pos:
             return False
 
-        queue = deque([self.start_pos])
-        visited = {self.start_pos}
-        came_from = {self.start_pos: None}
+        ws = self.begin_workspace()
+        parent, seen, gen = ws.parent, ws.seen, ws.generation
+        start, end = self.cell_index(self.start_pos), self.cell_index(self.end_pos)
+        queue = deque([start])
+        seen[start], parent[start] = gen, -1
+        pushes, pops, max_frontier = 1, 0, 1
+        found = False
 
         while queue:
             current = queue.popleft()
+            pops += 1
             self.nodes_expanded += 1
 
-            if current == self.end_pos:
-                self.solution_path = self.reconstruct_path(came_from)
+            if current == end:
+                self.solution_path = self.reconstruct_path(end)
                 self.path_length = len(self.solution_path)
-                return True
+                found = True
+                break
 
-            for neighbor in self.get_neighbors(*current):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    came_from[neighbor] = current
+            for neighbor in self.neighbor_indices(current):
+                if seen[neighbor] != gen:
+                    seen[neighbor], parent[neighbor] = gen, current
                     queue.append(neighbor)
+                    pushes += 1
 
-                    # Đánh dấu ô đã thăm
-                    if neighbor != self.end_pos:
-                        self.maze_grid[neighbor[1]][neighbor[0]].status = 5  # Moved Path
+                    self.visit_index(neighbor)
+            if len(queue) > max_frontier:
+                max_frontier = len(queue)
 
-                    self.visited_cells.append(neighbor)
-
-        return False
+        self.metrics.count(pushes, pops, 0, max_frontier)
+        return found
 
     def DFS(self) -> bool:
         """Depth-First Search - Tìm một đường đi (không nhất thiết ngắn nhất)"""
         if not self.start_pos or not self.end_pos:
             return False
 
-        stack = [self.start_pos]
-        visited = {self.start_pos}
-        came_from = {self.start_pos: None}
+        ws = self.begin_workspace()
+        parent, seen, gen = ws.parent, ws.seen, ws.generation
+        start, end = self.cell_index(self.start_pos), self.cell_index(self.end_pos)
+        stack = [start]
+        seen[start], parent[start] = gen, -1
+        pushes, pops, max_frontier = 1, 0, 1
+        found = False
 
         while stack:
             current = stack.pop()
+            pops += 1
             self.nodes_expanded += 1
 
-            if current == self.end_pos:
-                self.solution_path = self.reconstruct_path(came_from)
+            if current == end:
+                self.solution_path = self.reconstruct_path(end)
                 self.path_length = len(self.solution_path)
-                return True
+                found = True
+                break
 
-            for neighbor in self.get_neighbors(*current):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    came_from[neighbor] = current
+            for neighbor in self.neighbor_indices(current):
+                if seen[neighbor] != gen:
+                    seen[neighbor], parent[neighbor] = gen, current
                     stack.append(neighbor)
+                    pushes += 1
 
-                    # Đánh dấu ô đã thăm
-                    if neighbor != self.end_pos:
-                        self.maze_grid[neighbor[1]][neighbor[0]].status = 5  # Moved Path
-
-                    self.visited_cells.append(neighbor)
+                    self.visit_index(neighbor)
+            if len(stack) > max_frontier:
+                max_frontier = len(stack)
 
-        return False
+        self.metrics.count(pushes, pops, 0, max_frontier)
+        return found
 
     def UCS(self) -> bool:
         """Uniform Cost Search - Tìm đường đi với chi phí thấp nhất"""
         if not self.start_pos or not self.end_pos:
             return False
 
-        # Priority queue: (cost, position)
-        heap = [(0, self.start_pos)]
-        visited = set()
-        came_from = {self.start_pos: None}
-        cost_so_far = {self.start_pos: 0}
+        ws = self.begin_workspace()
+        parent, cost, seen, closed, gen = ws.parent, ws.cost, ws.seen, ws.closed, ws.generation
+        costs = self.cost_plane
+        start, end = self.cell_index(self.start_pos), self.cell_index(self.end_pos)
+        # Priority queue: (cost, cell)
+        heap = [(0, start)]
+        seen[start], cost[start], parent[start] = gen, 0, -1
+        pushes, pops, duplicates, max_frontier = 1, 0, 0, 1
+        found = False
 
         while heap:
             current_cost, current = heapq.heappop(heap)
+            pops += 1
 
-            if current in visited:
+            if closed[current] == gen:
+                duplicates += 1
                 continue
 
-            visited.add(current)
+            closed[current] = gen
             self.nodes_expanded += 1
 
-            if current == self.end_pos:
-                self.solution_path = self.reconstruct_path(came_from)
+            if current == end:
+                self.solution_path = self.reconstruct_path(end)
                 self.path_length = len(self.solution_path)
-                return True
+                found = True
+                break
 
-            for neighbor in self.get_neighbors(*current):
-                new_cost = current_cost + 1  # Giả sử mỗi bước có cost = 1
+            for neighbor in self.neighbor_indices(current):
+                new_cost = current_cost + (1 if costs is None else costs[neighbor])
 
-                if neighbor not in visited and (neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]):
-                    cost_so_far[neighbor] = new_cost
-                    came_from[neighbor] = current
+                if closed[neighbor] != gen and (seen[neighbor] != gen or new_cost < cost[neighbor]):
+                    seen[neighbor], cost[neighbor], parent[neighbor] = gen, new_cost, current
                     heapq.heappush(heap, (new_cost, neighbor))
+                    pushes += 1
 
-                    # Đánh dấu ô đã thăm
-                    if neighbor != self.end_pos:
-                        self.maze_grid[neighbor[1]][neighbor[0]].status = 5  # Moved Path
+                    self.visit_index(neighbor, new_cost)
+            if len(heap) > max_frontier:
+                max_frontier = len(heap)
 
-                    self.visited_cells.append(neighbor)
-
-        return False
+        self.metrics.count(pushes, pops, duplicates, max_frontier)
+        return found
 
     def A_star(self) -> bool:
         """A* Search - Tìm đường đi tối ưu với heuristic"""
         if not self.start_pos or not self.end_pos:
             return False
 
-        # Priority queue: (f_score, g_score, position)
-        heap = [(0, 0, self.start_pos)]
-        visited = set()
-        came_from = {self.start_pos: None}
-        g_score = {self.start_pos: 0}
+        ws = self.begin_workspace()
+        parent, cost, seen, closed, gen = ws.parent, ws.cost, ws.seen, ws.closed, ws.generation
+        costs, width, min_cost = self.cost_plane, self.maze_width, self.min_cost
+        end_x, end_y = self.end_pos
+        start, end = self.cell_index(self.start_pos), self.cell_index(self.end_pos)
+        # Priority queue: (f_score, g_score, cell)
+        heap = [(0, 0, start)]
+        seen[start], cost[start], parent[start] = gen, 0, -1
+        pushes, pops, duplicates, max_frontier = 1, 0, 0, 1
+        found = False
 
         while heap:
             f_score, g_score_current, current = heapq.heappop(heap)
+            pops += 1
 
-            if current in visited:
+            if closed[current] == gen:
+                duplicates += 1
                 continue
 
-            visited.add(current)
+            closed[current] = gen
             self.nodes_expanded += 1
 
-            if current == self.end_pos:
-                self.solution_path = self.reconstruct_path(came_from)
+            if current == end:
+                self.solution_path = self.reconstruct_path(end)
                 self.path_length = len(self.solution_path)
-                return True
+                found = True
+                break
 
-            for neighbor in self.get_neighbors(*current):
-                tentative_g_score = g_score_current + 1
+            for neighbor in self.neighbor_indices(current):
+                tentative_g_score = g_score_current + (1 if costs is None else costs[neighbor])
 
-                if neighbor not in visited and (neighbor not in g_score or tentative_g_score < g_score[neighbor]):
-                    g_score[neighbor] = tentative_g_score
-                    f_score = tentative_g_score + self.heuristic(neighbor, self.end_pos)
-                    came_from[neighbor] = current
-                    heapq.heappush(heap, (f_score, tentative_g_score, neighbor))
+                if closed[neighbor] != gen and (seen[neighbor] != gen or tentative_g_score < cost[neighbor]):
+                    seen[neighbor], cost[neighbor], parent[neighbor] = gen, tentative_g_score, current
+                    y, x = divmod(neighbor, width)
+                    h_score = (abs(x - end_x) + abs(y - end_y)) * min_cost
+                    heapq.heappush(heap, (tentative_g_score + h_score, tentative_g_score, neighbor))
+                    pushes += 1
 
-                    # Đánh dấu ô đã thăm
-                    if neighbor != self.end_pos:
-                        self.maze_grid[neighbor[1]][neighbor[0]].status = 5  # Moved Path
+                    self.visit_index(neighbor, tentative_g_score, h_score)
+            if len(heap) > max_frontier:
+                max_frontier = len(heap)
 
-                    self.visited_cells.append(neighbor)
+        self.metrics.count(pushes, pops, duplicates, max_frontier)
+        return found
 
-        return False
+    def Dial(self) -> bool:
+        """Thuật toán Dial - UCS với hàng đợi bucket cho chi phí nguyên nhỏ (không dùng heapq)
+
+        Chi phí mỗi bước <= max_cost nên mọi ô trong hàng đợi có khoảng cách thuộc
+        [d, d + max_cost]: max_cost + 1 bucket xoay vòng là đủ, lấy ra / đưa vào đều O(1).
+        """
+        if not self.start_pos or not self.end_pos:
+            return False
+
+        ws = self.begin_workspace()
+        parent, cost, seen, gen = ws.parent, ws.cost, ws.seen, ws.generation
+        costs = self.cost_plane
+        start, end = self.cell_index(self.start_pos), self.cell_index(self.end_pos)
+        bucket_count = self.max_cost + 1
+        buckets = [[] for _ in range(bucket_count)]
+        buckets[0].append(start)
+        seen[start], cost[start], parent[start] = gen, 0, -1
+        pushes, pops, duplicates, max_frontier = 1, 0, 0, 1
+        pending = 1
+        current_cost = 0
+        found = False
+
+        while pending and not found:
+            bucket = buckets[current_cost % bucket_count]
+            while bucket:
+                current = bucket.pop()
+                pops += 1
+                pending -= 1
+                if cost[current] != current_cost:  # đã có đường rẻ hơn
+                    duplicates += 1
+                    continue
+
+                self.nodes_expanded += 1
+                if current == end:
+                    self.solution_path = self.reconstruct_path(end)
+                    self.path_length = len(self.solution_path)
+                    found = True
+                    break
+
+                for neighbor in self.neighbor_indices(current):
+                    new_cost = current_cost + (1 if costs is None else costs[neighbor])
+                    if seen[neighbor] != gen or new_cost < cost[neighbor]:
+                        seen[neighbor], cost[neighbor], parent[neighbor] = gen, new_cost, current
+                        buckets[new_cost % bucket_count].append(neighbor)
+                        pushes += 1
+                        pending += 1
+
+                        self.visit_index(neighbor, new_cost)
+                if pending > max_frontier:
+                    max_frontier = pending
+            current_cost += 1
+
+        self.metrics.count(pushes, pops, duplicates, max_frontier)
+        return found
 
     def Bidirectional_Search(self) -> bool:
         """Bidirectional Search - Tìm kiếm từ cả hai đầu"""
         if not self.start_pos or not self.end_pos:
             return False
 
+        # seen / parent cho phía start, closed / parent2 cho phía end
+        ws = self.begin_workspace()
+        parent, seen, parent2, seen_end, gen = ws.parent, ws.seen, ws.parent2, ws.closed, ws.generation
+        start, end = self.cell_index(self.start_pos), self.cell_index(self.end_pos)
+
         # Khởi tạo cho tìm kiếm từ start
-        queue_start = deque([self.start_pos])
-        visited_start = {self.start_pos}
-        came_from_start = {self.start_pos: None}
+        queue_start = deque([start])
+        seen[start], parent[start] = gen, -1
 
         # Khởi tạo cho tìm kiếm từ end
-        queue_end = deque([self.end_pos])
-        visited_end = {self.end_pos}
-        came_from_end = {self.end_pos: None}
+        queue_end = deque([end])
+        seen_end[end], parent2[end] = gen, -1
+
+        pushes, pops, max_frontier = 2, 0, 2
+        found = False
 
         while queue_start or queue_end:
             # Tìm kiếm từ start
             if queue_start:
                 current_start = queue_start.popleft()
+                pops += 1
                 self.nodes_expanded += 1
 
                 # Kiểm tra giao điểm
-                if current_start in visited_end:
-                    # Tái tạo đường đi
-                    path_start = []
-                    node = current_start
-                    while node is not None:
-                        path_start.append(node)
-                        node = came_from_start.get(node)
-                    path_start.reverse()
-
-                    path_end = []
-                    node = came_from_end[current_start]
-                    while node is not None:
-                        path_end.append(node)
-                        node = came_from_end.get(node)
-
-                    self.solution_path = path_start + path_end
+                if seen_end[current_start] == gen:
+                    self.solution_path = self.join_paths(current_start)
                     self.path_length = len(self.solution_path)
-                    return True
+                    found = True
+                    break
 
-                for neighbor in self.get_neighbors(*current_start):
-                    if neighbor not in visited_start:
-                        visited_start.add(neighbor)
-                        came_from_start[neighbor] = current_start
+                for neighbor in self.neighbor_indices(current_start):
+                    if seen[neighbor] != gen:
+                        seen[neighbor], parent[neighbor] = gen, current_start
                         queue_start.append(neighbor)
+                        pushes += 1
 
-                        if neighbor not in [self.start_pos, self.end_pos]:
-                            self.maze_grid[neighbor[1]][neighbor[0]].status = 5  # Moved Path
-
-                        self.visited_cells.append(neighbor)
+                        self.visit_index(neighbor)
 
             # Tìm kiếm từ end
             if queue_end:
                 current_end = queue_end.popleft()
+                pops += 1
                 self.nodes_expanded += 1
 
                 # Kiểm tra giao điểm
-                if current_end in visited_start:
-                    # Tái tạo đường đi
-                    path_start = []
-                    node = current_end
-                    while node is not None:
-                        path_start.append(node)
-                        node = came_from_start.get(node)
-                    path_start.reverse()
-
-                    path_end = []
-                    node = came_from_end[current_end]
-                    while node is not None:
-                        path_end.append(node)
-                        node = came_from_end.get(node)
-
-                    self.solution_path = path_start + path_end
+                if seen[current_end] == gen:
+                    self.solution_path = self.join_paths(current_end)
                     self.path_length = len(self.solution_path)
-                    return True
+                    found = True
+                    break
 
-                for neighbor in self.get_neighbors(*current_end):
-                    if neighbor not in visited_end:
-                        visited_end.add(neighbor)
-                        came_from_end[neighbor] = current_end
+                for neighbor in self.neighbor_indices(current_end):
+                    if seen_end[neighbor] != gen:
+                        seen_end[neighbor], parent2[neighbor] = gen, current_end
                         queue_end.append(neighbor)
+                        pushes += 1
+
+                        self.visit_index(neighbor)
+
+            if len(queue_start) + len(queue_end) > max_frontier:
+                max_frontier = len(queue_start) + len(queue_end)
 
-                        if neighbor not in [self.start_pos, self.end_pos]:
-                            self.maze_grid[neighbor[1]][neighbor[0]].status = 5  # Moved Path
+        self.metrics.count(pushes, pops, 0, max_frontier)
+        return found
 
-                        self.visited_cells.append(neighbor)
+    def is_open_index(self, i: int) -> bool:
+        """Ô có chỉ số i = y * width + x có đi được không"""
+        y, x = divmod(i, self.maze_width)
+        if self.maze_grid is None:
+            return self.source.is_open(x, y)
+        return self.maze_grid[y][x].status != 0
 
-        return False
+    def update_cells(self, cells):
+        """Báo các ô (x, y) vừa đổi tường <-> đường (sau khi đã sửa lưới / nguồn).
 
-    def solve_maze(self, algorithm: str) -> bool:
-        """Giải mê cung với thuật toán được chọn"""
+        Lần solve_maze("D* Lite") tiếp theo chỉ tìm lại phần bị ảnh hưởng; các trường
+        khoảng cách của solve_goals được sửa tại chỗ.
+        """
+        if self.planner is not None:
+            self.planner.notify(cells)
+        for field in self.goal_fields.values():
+            for x, y in cells:
+                field.set_open(x, y, self.is_open_index(y * self.maze_width + x))
+
+    def D_star_lite(self) -> bool:
+        """D* Lite - giữ trạng thái giữa các lần giải, hỗ trợ start di chuyển và ô thay đổi"""
         if not self.start_pos or not self.end_pos:
             return False
 
-        self.algorithm = algorithm
+        if self.planner is None or self.planner.goal != tuple(self.end_pos):
+            self.planner = DStarLite(self.maze_width, self.maze_height, self.is_open_index, self.end_pos, self.start_pos,
+                                     self.cost_plane, self.min_cost)
+        planner = self.planner
+        planner.move_start(self.start_pos)
+
+        def expand(i):
+            if not self.is_open_index(i):
+                return  # ô vừa thành tường: không đánh dấu (status 5 sẽ biến nó thành đường)
+            cost = min(planner.g[i], planner.rhs[i])
+            self.visit_index(i, cost if cost < DSTAR_INF else None)
+        path = planner.plan(expand)
+        self.nodes_expanded += planner.expanded
+        self.metrics.count(planner.pushes, planner.pops, planner.duplicate_pops, planner.max_frontier)
+        if path is None:
+            return False
+        self.solution_path = path
+        self.path_length = len(path)
+        return True
+
+    def goal_field(self, goal: Tuple[int, int]) -> DistanceField:
+        """Trường khoảng cách tới goal, dựng lần đầu rồi dùng lại (update_cells giữ nó đúng)"""
+        goal = tuple(goal)
+        field = self.goal_fields.get(goal)
+        if field is None:
+            if self.maze_grid is None:
+                plane = self.source.to_plane()
+            else:
+                plane = status_plane(self.maze_grid)
+            field = self.goal_fields[goal] = DistanceField(plane, self.maze_width, self.maze_height, goal)
+            self.nodes_expanded += len(field.dist) - field.dist.count(UNREACHABLE)
+        return field
+
+    def solve_goals(self, goals: List[Tuple[int, int]]) -> "SolverMetrics":
+        """Đi từ start_pos qua mọi ô trong goals (thứ tự tùy chọn) với tổng số bước nhỏ nhất.
+
+        Thứ tự tìm được nằm ở goal_order, đường đi ở solution_path. Đếm số bước (không dùng
+        cost_plane): trường khoảng cách là BFS. nodes_expanded chỉ tính các trường mới dựng.
+        """
+        self.metrics = metrics = SolverMetrics("Multi-goal")
+        self.goal_order = []
+        if not self.start_pos:
+            return metrics
+
+        self.algorithm = "Multi-goal"
+        goals = [tuple(g) for g in goals]
+        t0 = time.perf_counter_ns()
         self.reset_solving_state()
+        t1 = time.perf_counter_ns()
+        fields = [self.goal_field(g) for g in goals]
+        matrix = distance_matrix(self.start_pos, goals, fields)
+        if all(d >= 0 for d in matrix[0][1:]):  # vô hướng: tới được từ start thì tới được nhau
+            _, order = visiting_order(matrix)
+            t2 = time.perf_counter_ns()
+            self.solution_path = stitch_path(self.start_pos, goals, fields, order)
+            metrics.reconstruct_ns = time.perf_counter_ns() - t2
+            self.goal_order = [goals[j] for j in order]
+            self.path_length = len(self.solution_path)
+            self.solution_found = True
+        t2 = time.perf_counter_ns()
+
+        if self.solution_found and self.maze_grid is not None:
+            for x, y in self.solution_path:
+                if (x, y) != self.start_pos and (x, y) != self.end_pos:
+                    self.maze_grid[y][x].status = 4  # Path Found
+        t3 = time.perf_counter_ns()
+
+        metrics.reset_ns = t1 - t0
+        metrics.search_ns = t2 - t1 - metrics.reconstruct_ns
+        metrics.mark_ns = t3 - t2
+        metrics.found = self.solution_found
+        metrics.nodes_expanded = self.nodes_expanded
+        metrics.path_length = self.path_length
+        if self.solution_path:
+            self.path_cost = sum(map(self.step_cost, self.solution_path[1:]))
+        metrics.path_cost = self.path_cost
+        self.solving_time = metrics.search_ns / 1e9
+        self.solving_complete = True
+        return metrics
 
-        start_time = time.time()
-
-        if algorithm == "BFS":
-            self.solution_found = self.BFS()
-        elif algorithm == "DFS":
-            self.solution_found = self.DFS()
-        elif algorithm == "UCS":
-            self.solution_found = self.UCS()
-        elif algorithm == "A*":
-            self.solution_found = self.A_star()
-        elif algorithm == "Bidirectional":
-            self.solution_found = self.Bidirectional_Search()
-        else:
-            raise ValueError(f"Unknown algorithm: {algorithm}")
+    def solve_maze(self, algorithm: str, track_memory: bool = False) -> "SolverMetrics":
+        """Giải mê cung với thuật toán được chọn.
 
-        self.solving_time = time.time() - start_time
-        self.solving_complete = True
+        Trả về SolverMetrics (bool(metrics) == solution_found). track_memory=True đo bộ nhớ
+        đỉnh bằng tracemalloc, làm chậm lần giải nên các thời gian đo được khi đó chỉ để tham khảo.
+        """
+        self.metrics = metrics = SolverMetrics(algorithm)
+        if not self.start_pos or not self.end_pos:
+            return metrics
 
-        # Đánh dấu đường đi tìm được
-        if self.solution_found:
-            for pos in self.solution_path:
-                if pos not in [self.start_pos, self.end_pos]:
-                    self.maze_grid[pos[1]][pos[0]].status = 4  # Path Found
+        self.algorithm = algorithm
+        solvers = {
+            "BFS": self.BFS,
+            "DFS": self.DFS,
+            "UCS": self.UCS,
+            "A*": self.A_star,
+            "Bidirectional": self.Bidirectional_Search,
+            "D* Lite": self.D_star_lite,
+            "Dial": self.Dial,
+        }
+        if algorithm not in solvers:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
 
-        return self.solution_found
\ No newline at end of file
+        tracing = track_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            t0 = time.perf_counter_ns()
+            self.reset_solving_state(full=algorithm != "D* Lite")
+            t1 = time.perf_counter_ns()
+            self.solution_found = solvers[algorithm]()
+            t2 = time.perf_counter_ns()
+
+            # Đánh dấu đường đi tìm được
+            if self.solution_found and self.maze_grid is not None:
+                for pos in self.solution_path:
+                    if pos not in [self.start_pos, self.end_pos]:
+                        self.maze_grid[pos[1]][pos[0]].status = 4  # Path Found
+            t3 = time.perf_counter_ns()
+            if tracing:
+                metrics.peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            if self.workspace is not None:  # trả về pool cho lần giải sau (mê cung cùng kích thước)
+                WORKSPACES.release(self.workspace)
+                self.workspace = None
+            if tracing:
+                tracemalloc.stop()
+
+        metrics.reset_ns = t1 - t0
+        metrics.search_ns = t2 - t1 - metrics.reconstruct_ns
+        metrics.mark_ns = t3 - t2
+        metrics.found = self.solution_found
+        metrics.nodes_expanded = self.nodes_expanded
+        metrics.path_length = self.path_length
+        if self.solution_path:
+            self.path_cost = sum(map(self.step_cost, self.solution_path[1:]))
+        metrics.path_cost = self.path_cost
+        self.solving_time = metrics.search_ns / 1e9
+        self.solving_complete = True
+        return metrics
@@ -0,0 +1,180 @@
+"""Thống kê mê cung bằng NumPy, cho một hoặc cả lô mảng trạng thái (get_status_plane()).
+
+Mọi phép tính là phép toán mảng trên khối (số mê cung, cao, rộng), không có vòng lặp
+Python theo từng ô; vòng lặp duy nhất là theo các bước BFS (số bước dài nhất trong lô,
+BFS của mọi mê cung chạy cùng lúc) và theo vài vòng móc / nén nhãn khi gom hành lang.
+Lô lớn được chia thành các khối CHUNK_CELLS ô để giới hạn bộ nhớ.
+
+Ô đi được: trạng thái khác 0; start / end lấy từ ô trạng thái 2 / 3.
+    degree        số láng giềng đi được của mỗi ô (0..4)
+    dead end      ô có degree 1;  junction: degree >= 3
+    hành lang     thành phần liên thông các ô degree 2 (kể cả góc rẽ), độ dài = số ô
+    river         số ô ngoài đường giải / số ngõ cụt ngoài đường giải: cao = ít nhánh cụt
+                  nhưng dài, thấp = nhiều nhánh cụt ngắn
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+CHUNK_CELLS = 1 << 22
+CORRIDOR_BINS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)  # cận dưới của từng nhóm độ dài hành lang
+
+def stack_planes(planes, width: int, height: int) -> np.ndarray:
+    """Một mảng trạng thái (bytes / bytearray / ndarray) hoặc dãy các mảng -> uint8 (n, height, width)"""
+    if isinstance(planes, (bytes, bytearray, memoryview)):
+        planes = [planes]
+    if isinstance(planes, np.ndarray):
+        return planes.reshape(-1, height, width).astype(np.uint8, copy=False)
+    count = width * height
+    data = b"".join(bytes(plane[:count]) for plane in planes)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, height, width)
+
+def _degree(open_: np.ndarray) -> np.ndarray:
+    deg = np.zeros(open_.shape, np.uint8)
+    deg[:, 1:, :] += open_[:, :-1, :]
+    deg[:, :-1, :] += open_[:, 1:, :]
+    deg[:, :, 1:] += open_[:, :, :-1]
+    deg[:, :, :-1] += open_[:, :, 1:]
+    deg *= open_
+    return deg
+
+def _flood(open_: np.ndarray, seeds: np.ndarray) -> np.ndarray:
+    """BFS đồng thời trên cả lô: số bước từ seeds tới mỗi ô, -1 = không tới được.
+
+    Frontier là mảng chỉ số phẳng (mỗi mê cung có viền tường để láng giềng không tràn
+    sang mê cung khác), nên mỗi bước chỉ tốn theo số ô trên frontier, không theo cả lô.
+    """
+    n, height, width = open_.shape
+    padded = np.zeros((n, height + 2, width + 2), bool)
+    padded[:, 1:-1, 1:-1] = open_
+    is_open = padded.reshape(-1)
+    offsets = np.array([1, -1, width + 2, -(width + 2)])
+    dist = np.full(is_open.size, -1, np.int32)
+    marks = np.zeros_like(padded)
+    marks[:, 1:-1, 1:-1] = seeds & open_
+    frontier = np.flatnonzero(marks)
+    dist[frontier] = 0
+    step = 0
+    while frontier.size:
+        step += 1
+        candidates = (frontier[:, None] + offsets).reshape(-1)
+        candidates = candidates[is_open[candidates] & (dist[candidates] < 0)]
+        frontier = np.unique(candidates)
+        dist[frontier] = step
+    return dist.reshape(padded.shape)[:, 1:-1, 1:-1]
+
+def _components(mask: np.ndarray):
+    """Thành phần liên thông của mask: (chỉ số phẳng các ô trong mask, nhãn của từng ô).
+
+    Nhãn là vị trí (trong mảng chỉ số) của ô nhỏ nhất thuộc thành phần. Chỉ làm việc trên
+    các ô trong mask và các cạnh giữa chúng: mỗi vòng móc gốc lớn vào gốc nhỏ qua mọi cạnh
+    còn nối hai gốc khác nhau, nén đường (nhãn của nhãn), rồi bỏ các cạnh đã cùng thành phần.
+    """
+    n, height, width = mask.shape
+    cells = np.flatnonzero(mask)
+    right = np.flatnonzero(mask[:, :, :-1] & mask[:, :, 1:])
+    right = right // (width - 1) * width + right % (width - 1)
+    down = np.flatnonzero(mask[:, :-1, :] & mask[:, 1:, :])
+    down = down // ((height - 1) * width) * (height * width) + down % ((height - 1) * width)
+    a = np.searchsorted(cells, np.concatenate([right, down]))
+    b = np.searchsorted(cells, np.concatenate([right + 1, down + width]))
+    labels = np.arange(len(cells))
+    while len(a):
+        la, lb = labels[a], labels[b]
+        differ = la != lb
+        a, b, la, lb = a[differ], b[differ], la[differ], lb[differ]
+        labels[np.maximum(la, lb)] = np.minimum(la, lb)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return cells, labels
+
+def _marker(planes: np.ndarray, status: int) -> np.ndarray:
+    """Mặt nạ một ô trạng thái status mỗi mê cung (ô đầu tiên nếu có nhiều) và mê cung nào có"""
+    flat = planes.reshape(len(planes), -1) == status
+    first = flat.argmax(axis=1)
+    has = flat[np.arange(len(planes)), first]
+    mask = np.zeros(flat.shape, bool)
+    mask[np.arange(len(planes)), first] = has
+    return mask.reshape(planes.shape), has
+
+def _analyze_chunk(planes: np.ndarray) -> Dict[str, np.ndarray]:
+    n, height, width = planes.shape
+    open_ = planes != 0
+    deg = _degree(open_)
+    maze = np.repeat(np.arange(n), height * width).reshape(planes.shape)
+
+    open_cells = open_.sum(axis=(1, 2))
+    degree_hist = np.bincount((maze * 5 + deg)[open_], minlength=n * 5).reshape(n, 5)
+    dead_end = deg == 1
+    dead_ends = degree_hist[:, 1]
+    junctions = degree_hist[:, 3] + degree_hist[:, 4]
+    inner = degree_hist[:, 2:].sum(axis=1)
+    branching = (degree_hist[:, 2:] * np.arange(1, 4)).sum(axis=1) / np.maximum(inner, 1)
+    # số cạnh giữa hai ô đi được kề nhau; liên thông thì loops = cạnh - ô + 1 (0 = mê cung hoàn hảo)
+    edges = (open_[:, 1:, :] & open_[:, :-1, :]).sum(axis=(1, 2)) + (open_[:, :, 1:] & open_[:, :, :-1]).sum(axis=(1, 2))
+
+    # hành lang
+    corridor = deg == 2
+    cells, labels = _components(corridor)
+    roots, lengths = np.unique(labels, return_counts=True)
+    owner = cells[roots] // (height * width)
+    corridor_count = np.bincount(owner, minlength=n)
+    corridor_total = np.bincount(owner, weights=lengths, minlength=n)
+    corridor_max = np.zeros(n, np.int64)
+    np.maximum.at(corridor_max, owner, lengths)
+    bins = np.searchsorted(CORRIDOR_BINS, lengths, side="right") - 1
+    corridor_hist = np.bincount(owner * len(CORRIDOR_BINS) + bins,
+                                minlength=n * len(CORRIDOR_BINS)).reshape(n, len(CORRIDOR_BINS))
+
+    # đường giải và liên thông
+    start, has_start = _marker(planes, 2)
+    end, has_end = _marker(planes, 3)
+    from_start = _flood(open_, start)
+    from_end = _flood(open_, end)
+    reachable = (from_start >= 0).sum(axis=(1, 2))
+    steps = np.where(end, from_start, -1).max(axis=(1, 2))
+    solved = has_start & has_end & (steps >= 0)
+    on_path = (from_start >= 0) & (from_end >= 0) & (from_start + from_end == steps[:, None, None]) & solved[:, None, None]
+    path_cells = on_path.sum(axis=(1, 2))
+    off_dead_ends = (dead_end & ~on_path).sum(axis=(1, 2))
+
+    return {
+        "open_cells": open_cells,
+        "dead_ends": dead_ends,
+        "junctions": junctions,
+        "degree_hist": degree_hist,
+        "branching_factor": branching,
+        "loops": edges - open_cells + 1,
+        "corridor_count": corridor_count,
+        "corridor_mean": corridor_total / np.maximum(corridor_count, 1),
+        "corridor_max": corridor_max,
+        "corridor_hist": corridor_hist,
+        "solution_length": np.where(solved, steps + 1, -1),  # số ô, như SolvingModel.path_length
+        "solution_ratio": np.where(solved, path_cells / np.maximum(open_cells, 1), 0.0),
+        "river": np.where(solved, (open_cells - path_cells) / np.maximum(off_dead_ends, 1), 0.0),
+        "reachable": reachable,
+        "connected": has_start & (reachable == open_cells),
+    }
+
+def analyze(planes, width: int, height: int) -> Dict[str, np.ndarray]:
+    """Thống kê cho cả lô: mỗi khóa là một mảng, phần tử i ứng với mê cung thứ i"""
+    batch = stack_planes(planes, width, height)
+    per_chunk = max(1, CHUNK_CELLS // (width * height))
+    parts = [_analyze_chunk(batch[i:i + per_chunk]) for i in range(0, len(batch), per_chunk)]
+    if not parts:
+        parts = [_analyze_chunk(np.zeros((0, height, width), np.uint8))]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+def analyze_plane(plane, width: int, height: int) -> Dict:
+    """Thống kê một mê cung, giá trị Python thường (list cho histogram)"""
+    stats = analyze([plane], width, height)
+    return {key: value[0].tolist() for key, value in stats.items()}
+
+def summarize(stats: Dict[str, np.ndarray], keys: Sequence[str] = ("dead_ends", "junctions", "branching_factor",
+                                                                 "corridor_mean", "solution_length", "river")) -> Dict:
+    """Trung bình / nhỏ nhất / lớn nhất của vài chỉ số trên cả lô"""
+    return {key: {"mean": float(stats[key].mean()), "min": float(stats[key].min()), "max": float(stats[key].max())}
+            for key in keys if len(stats[key])}
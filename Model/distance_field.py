@@ -0,0 +1,139 @@
+"""Trường khoảng cách tới đích: số bước ngắn nhất từ mọi ô tới goal.
+
+Dựng một lần bằng BFS ngược từ goal khi tạo màn chơi; sau đó "còn bao xa" và "bước
+tiếp theo nên đi" là tra mảng O(1). Khi một ô đổi tường <-> đường, set_open() chỉ sửa
+phần bị ảnh hưởng thay vì dựng lại toàn bộ.
+"""
+import heapq
+from array import array
+from collections import deque
+from typing import List, Optional, Tuple
+
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+NO_STEP = 255
+UNREACHABLE = -1
+
+class DistanceField:
+    def __init__(self, plane, width: int, height: int, goal: Tuple[int, int]):
+        """plane: trạng thái các ô theo hàng (0 = tường), như GenerationModel.get_status_plane()"""
+        self.width, self.height = width, height
+        self.goal = tuple(goal)
+        self.open = bytearray(1 if v else 0 for v in plane[:width * height])
+        self.dist = array("i", [UNREACHABLE]) * (width * height)
+        self.step = bytearray([NO_STEP]) * (width * height)  # hướng đi về phía goal (chỉ số DIRECTIONS)
+        self.build()
+
+    # ---- tra cứu O(1)
+    def distance(self, x: int, y: int) -> int:
+        """Số bước còn lại tới goal, -1 nếu không tới được"""
+        return self.dist[y * self.width + x]
+
+    def best_move(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """(dx, dy) của bước tiếp theo trên một đường ngắn nhất, None nếu đã ở goal / không tới được"""
+        code = self.step[y * self.width + x]
+        return None if code == NO_STEP else DIRECTIONS[code]
+
+    def path_from(self, x: int, y: int) -> List[Tuple[int, int]]:
+        path = [(x, y)] if self.distance(x, y) >= 0 else []
+        move = self.best_move(x, y)
+        while path and move:
+            x += move[0]; y += move[1]
+            path.append((x, y))
+            move = self.best_move(x, y)
+        return path
+
+    # ---- dựng / sửa
+    def _neighbors(self, i: int):
+        """(chỉ số ô láng giềng, mã hướng từ láng giềng về ô i)"""
+        width = self.width
+        x, y = i % width, i // width
+        if y > 0: yield i - width, 2
+        if x < width - 1: yield i + 1, 3
+        if y < self.height - 1: yield i + width, 0
+        if x > 0: yield i - 1, 1
+
+    def build(self):
+        """BFS ngược từ goal trên toàn bộ mê cung"""
+        dist, step, is_open = self.dist, self.step, self.open
+        for i in range(len(dist)):
+            dist[i] = UNREACHABLE; step[i] = NO_STEP
+        gx, gy = self.goal
+        start = gy * self.width + gx
+        if not is_open[start]:
+            return
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for n, code in self._neighbors(i):
+                if is_open[n] and dist[n] == UNREACHABLE:
+                    dist[n] = d; step[n] = code
+                    queue.append(n)
+
+    def set_open(self, x: int, y: int, is_open: bool) -> int:
+        """Đổi một ô thành đường / tường và sửa trường; trả về số ô đã cập nhật"""
+        i = y * self.width + x
+        if bool(self.open[i]) == bool(is_open):
+            return 0
+        self.open[i] = 1 if is_open else 0
+        if (x, y) == self.goal:
+            self.build()
+            return len(self.dist)
+        return self._opened(i) if is_open else self._closed(i)
+
+    def _relax_from(self, seeds) -> int:
+        """Lan truyền các giá trị giảm đi từ seeds (Dijkstra với trọng số 1)"""
+        dist, step, is_open = self.dist, self.step, self.open
+        heap = [(dist[i], i) for i in seeds]
+        heapq.heapify(heap)
+        updated = 0
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d != dist[i]:
+                continue
+            updated += 1
+            for n, code in self._neighbors(i):
+                if is_open[n] and (dist[n] == UNREACHABLE or dist[n] > d + 1):
+                    dist[n] = d + 1; step[n] = code
+                    heapq.heappush(heap, (d + 1, n))
+        return updated
+
+    def _best_neighbor(self, i: int):
+        best, best_code = UNREACHABLE, NO_STEP
+        for n, code in self._neighbors(i):
+            d = self.dist[n]
+            if self.open[n] and d != UNREACHABLE and (best == UNREACHABLE or d < best):
+                best, best_code = d, code ^ 2  # hướng từ i sang n là ngược của n sang i
+        return best, best_code
+
+    def _opened(self, i: int) -> int:
+        best, code = self._best_neighbor(i)
+        if best == UNREACHABLE:
+            return 0  # ô mới nằm trong vùng không tới được goal
+        self.dist[i] = best + 1; self.step[i] = code
+        return self._relax_from([i])
+
+    def _closed(self, i: int) -> int:
+        dist, step, is_open = self.dist, self.step, self.open
+        # các ô có đường ngắn nhất đi qua i: cây con của i theo con trỏ step
+        affected = [i]
+        dist[i] = UNREACHABLE; step[i] = NO_STEP
+        k = 0
+        while k < len(affected):
+            j = affected[k]; k += 1
+            for n, code in self._neighbors(j):
+                if step[n] == code and dist[n] != UNREACHABLE:
+                    dist[n] = UNREACHABLE; step[n] = NO_STEP
+                    affected.append(n)
+        # tính lại từ các láng giềng không bị ảnh hưởng
+        seeds = []
+        for j in affected[1:]:
+            if not is_open[j]:
+                continue
+            best, code = self._best_neighbor(j)
+            if best != UNREACHABLE:
+                dist[j] = best + 1; step[j] = code
+                seeds.append(j)
+        self._relax_from(seeds)
+        return len(affected)
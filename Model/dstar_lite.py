@@ -0,0 +1,150 @@
+"""D* Lite (Koenig & Likhachev 2002): lập kế hoạch tăng dần cho mê cung thay đổi.
+
+Tìm kiếm đi ngược từ goal và giữ lại g / rhs / hàng đợi giữa các lần hỏi. Khi ô đổi
+tường <-> đường (notify) hoặc điểm xuất phát di chuyển (move_start), lần plan() sau chỉ
+mở rộng lại phần bị ảnh hưởng thay vì tìm lại từ đầu.
+
+Chi phí bước vào ô n là costs[n] (None = 1); heuristic là Manhattan nhân min_cost.
+"""
+import heapq
+from array import array
+from typing import Callable, List, Optional, Tuple
+
+INF = 1 << 40
+
+class DStarLite:
+    def __init__(self, width: int, height: int, is_open: Callable[[int], bool],
+                 goal: Tuple[int, int], start: Tuple[int, int], costs=None, min_cost: int = 1):
+        """is_open(i): ô có chỉ số i = y * width + x đi được không (đọc trực tiếp từ mê cung)"""
+        self.width, self.height = width, height
+        self.is_open = is_open
+        self.costs = costs
+        self.min_cost = min_cost if costs is not None else 1
+        self.goal = tuple(goal)
+        self.start = tuple(start)
+        self._goal = goal[1] * width + goal[0]
+        self._start = start[1] * width + start[0]
+        self.g = array("q", [INF]) * (width * height)
+        self.rhs = array("q", [INF]) * (width * height)
+        self.km = 0
+        self._heap = []
+        self._queued = {}  # ô -> khóa hiện hành; mục trong heap khác khóa này là mục cũ
+
+        # Số liệu, cộng dồn trong một lần plan()
+        self.pushes = self.pops = self.duplicate_pops = self.max_frontier = self.expanded = 0
+
+        self.rhs[self._goal] = 0
+        self._push(self._goal)
+
+    # ---- tiện ích
+    def _neighbors(self, i: int):
+        width = self.width
+        x = i % width
+        if i >= width: yield i - width
+        if x < width - 1: yield i + 1
+        if i + width < width * self.height: yield i + width
+        if x > 0: yield i - 1
+
+    def _h(self, i: int) -> int:
+        width = self.width
+        return (abs(i % width - self._start % width) + abs(i // width - self._start // width)) * self.min_cost
+
+    def _key(self, i: int) -> Tuple[int, int]:
+        m = min(self.g[i], self.rhs[i])
+        return (m + self._h(i) + self.km, m)
+
+    def _push(self, i: int):
+        key = self._key(i)
+        self._queued[i] = key
+        heapq.heappush(self._heap, (key, i))
+        self.pushes += 1
+        if len(self._heap) > self.max_frontier:
+            self.max_frontier = len(self._heap)
+
+    def _update(self, i: int):
+        g, rhs, costs = self.g, self.rhs, self.costs
+        if i != self._goal:
+            best = INF
+            if self.is_open(i):
+                for n in self._neighbors(i):
+                    if g[n] < INF and self.is_open(n):
+                        cost = g[n] + (1 if costs is None else costs[n])
+                        if cost < best:
+                            best = cost
+                rhs[i] = best
+            else:
+                rhs[i] = INF
+        if g[i] != rhs[i]:
+            self._push(i)
+        else:
+            self._queued.pop(i, None)
+
+    # ---- API
+    def move_start(self, start: Tuple[int, int]):
+        """Điểm xuất phát mới (vd người chơi đã đi vài bước)"""
+        start = tuple(start)
+        if start == self.start:
+            return
+        new = start[1] * self.width + start[0]
+        self.km += self._h(new)  # _h vẫn tính theo start cũ: h(start cũ, start mới)
+        self.start, self._start = start, new
+
+    def notify(self, cells):
+        """Các ô (x, y) vừa đổi trạng thái tường / đường trong mê cung"""
+        for x, y in cells:
+            i = y * self.width + x
+            self._update(i)
+            for n in self._neighbors(i):
+                self._update(n)
+
+    def plan(self, on_expand: Optional[Callable[[int], None]] = None) -> Optional[List[Tuple[int, int]]]:
+        """Sửa lại kế hoạch rồi trả về đường đi start -> goal (None nếu không có)"""
+        self.pushes = self.pops = self.duplicate_pops = self.expanded = 0
+        self.max_frontier = len(self._heap)
+        g, rhs, heap, queued = self.g, self.rhs, self._heap, self._queued
+        start = self._start
+        while heap:
+            key, u = heap[0]
+            if queued.get(u) != key:
+                heapq.heappop(heap); self.pops += 1; self.duplicate_pops += 1
+                continue
+            if not (key < self._key(start) or rhs[start] != g[start]):
+                break
+            heapq.heappop(heap); self.pops += 1
+            del queued[u]
+            new_key = self._key(u)
+            if key < new_key:
+                self._push(u)
+                continue
+            self.expanded += 1
+            if on_expand is not None:
+                on_expand(u)
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = INF
+                self._update(u)
+            for n in self._neighbors(u):
+                self._update(n)
+        return self.path()
+
+    def path(self) -> Optional[List[Tuple[int, int]]]:
+        g, width, costs = self.g, self.width, self.costs
+        i = self._start
+        if g[i] >= INF or not self.is_open(i):
+            return None
+        path = [(i % width, i // width)]
+        for _ in range(len(g)):
+            if i == self._goal:
+                return path
+            best, best_g = -1, INF
+            for n in self._neighbors(i):
+                if g[n] < INF and self.is_open(n):
+                    cost = g[n] + (1 if costs is None else costs[n])
+                    if cost < best_g:
+                        best, best_g = n, cost
+            if best < 0:
+                return None
+            i = best
+            path.append((i % width, i // width))
+        return None
@@ -0,0 +1,186 @@
+"""Định dạng nhị phân cho mê cung (.mz).
+
+Bố cục file (little-endian):
+    header  HEADER_FORMAT (72 byte): magic, version, flags, width, height,
+            start x/y, end x/y (-1 = không có), seed, tên mode (ASCII, MODE_SIZE byte;
+            bản 1 chỉ có 16 byte, vẫn đọc được)
+    payload tường dạng bit: 1 bit mỗi ô theo hàng (y * width + x), 1 = đi được,
+            bit thấp trước; nén zlib nếu có FLAG_ZLIB
+
+Start/end nằm trong header nên 1 bit mỗi ô là đủ; trạng thái 4/5 (đường đi,
+ô đã thăm) chỉ là hiển thị nên không được lưu.
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import List, Optional, Tuple
+
+MAGIC = b"MAZE"
+FORMAT_VERSION = 2
+HEADER_FORMATS = {1: "<4sBBHIIiiiiq16s", 2: "<4sBBHIIiiiiq32s"}  # theo version
+HEADER_FORMAT = HEADER_FORMATS[FORMAT_VERSION]
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MODE_SIZE = 32
+FLAG_ZLIB = 1
+FLAG_SEED = 2
+
+# 8 byte 0/1 (bit k ở byte k) -> 1 byte, bằng một phép nhân
+_GATHER = 0x0102040810204080
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+# 1 byte -> 8 byte 0/1
+_SPREAD = [bytes((b >> k) & 1 for k in range(8)) for b in range(256)]
+# trạng thái -> 0/1 (mọi trạng thái khác 0 đều đi được)
+_OPEN = bytes([0] + [1] * 255)
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # cùng thứ tự với SolvingModel.get_neighbors
+
+def pack_plane(plane) -> bytes:
+    """Mảng byte trạng thái -> bit đi được (1 bit mỗi ô)"""
+    ones = bytes(plane).translate(_OPEN)
+    ones += bytes(-len(ones) % 8)
+    groups = array("Q", ones)
+    if groups.itemsize != 8 or sys.byteorder != "little":  # phép nhân cần uint64 little-endian
+        return bytes(sum(ones[i + k] << k for k in range(8)) for i in range(0, len(ones), 8))
+    return bytes((((q * _GATHER) & _MASK64) >> 56) for q in groups)
+
+def unpack_plane(bits, width: int, height: int, start=None, end=None) -> bytearray:
+    """Bit đi được -> mảng byte trạng thái (0 tường, 1 đường, 2 start, 3 end)"""
+    count = width * height
+    plane = bytearray(b"".join([_SPREAD[b] for b in bits[:(count + 7) // 8]])[:count])
+    if start is not None:
+        plane[start[1] * width + start[0]] = 2
+    if end is not None:
+        plane[end[1] * width + end[0]] = 3
+    return plane
+
+def _pos(x: int, y: int) -> Optional[Tuple[int, int]]:
+    return None if x < 0 else (x, y)
+
+def encode_header(width, height, start, end, mode, seed, compress) -> bytes:
+    flags = (FLAG_ZLIB if compress else 0) | (FLAG_SEED if seed is not None else 0)
+    sx, sy = start if start else (-1, -1)
+    ex, ey = end if end else (-1, -1)
+    name = (mode or "").encode("ascii")
+    if len(name) > MODE_SIZE:  # không cắt ngắn: tên mode đọc lại phải đúng như lúc ghi
+        raise ValueError(f"Mode name longer than {MODE_SIZE} bytes: {mode!r}")
+    return struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, flags, 0, width, height,
+                       sx, sy, ex, ey, seed or 0, name)
+
+def decode_header(data, offset: int = 0) -> dict:
+    """Header ở data[offset:] -> dict; "header_size" là độ dài header theo version của file"""
+    if len(data) < offset + 5:
+        raise ValueError("File too short for a maze header")
+    magic, version = struct.unpack_from("<4sB", data, offset)
+    if magic != MAGIC:
+        raise ValueError(f"Not a maze file (magic {magic!r})")
+    if version not in HEADER_FORMATS:
+        raise ValueError(f"Unsupported maze file version {version}")
+    header_format = HEADER_FORMATS[version]
+    header_size = struct.calcsize(header_format)
+    if len(data) < offset + header_size:
+        raise ValueError("File too short for a maze header")
+    _, _, flags, _, width, height, sx, sy, ex, ey, seed, mode = \
+        struct.unpack_from(header_format, data, offset)
+    return {
+        "width": width, "height": height,
+        "start": _pos(sx, sy), "end": _pos(ex, ey),
+        "mode": mode.rstrip(b"\0").decode("ascii") or None,
+        "seed": seed if flags & FLAG_SEED else None,
+        "compressed": bool(flags & FLAG_ZLIB),
+        "header_size": header_size,
+    }
+
+def write_maze(path: str, plane, width: int, height: int, start=None, end=None,
+               mode: Optional[str] = None, seed: Optional[int] = None, compress: bool = False):
+    """Ghi mê cung ra file; compress=True nhỏ hơn nhưng không đọc mmap trực tiếp được"""
+    bits = pack_plane(plane)
+    if compress:
+        bits = zlib.compress(bits, 9)
+    with open(path, "wb") as f:
+        f.write(encode_header(width, height, start, end, mode, seed, compress))
+        f.write(bits)
+
+def read_maze(path: str) -> dict:
+    """Đọc toàn bộ file -> header + "plane" (mảng byte trạng thái)"""
+    with MazeFile(path) as maze:
+        info = maze.info()
+        info["plane"] = maze.to_plane()
+    return info
+
+def is_maze_file(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+class MazeFile:
+    """Đọc file mê cung qua mmap, không chép dữ liệu; SolvingModel truy vấn trực tiếp.
+
+    File nén zlib phải giải nén vào bộ nhớ (vẫn chỉ 1 bit mỗi ô).
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._bits = memoryview(b"")
+        try:
+            header = decode_header(self._mmap)
+        except ValueError:
+            self.close()
+            raise
+        self.width, self.height = header["width"], header["height"]
+        self.start_pos, self.end_pos = header["start"], header["end"]
+        self.mode, self.seed = header["mode"], header["seed"]
+        self.compressed = header["compressed"]
+        payload = header["header_size"]
+        if self.compressed:
+            self._bits = memoryview(zlib.decompress(self._mmap[payload:]))
+        else:
+            self._bits = memoryview(self._mmap)[payload:]
+        if len(self._bits) * 8 < self.width * self.height:
+            self.close()
+            raise ValueError(f"Truncated maze file: {path}")
+
+    def info(self) -> dict:
+        return {"width": self.width, "height": self.height, "start": self.start_pos,
+                "end": self.end_pos, "mode": self.mode, "seed": self.seed}
+
+    def is_open(self, x: int, y: int) -> bool:
+        """Ô (x, y) có đi được không (ngoài biên = tường)"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        i = y * self.width + x
+        return bool(self._bits[i >> 3] >> (i & 7) & 1)
+
+    def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Các ô láng giềng đi được, cùng thứ tự với SolvingModel.get_neighbors"""
+        width, height, bits = self.width, self.height, self._bits
+        neighbors = []
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                i = ny * width + nx
+                if bits[i >> 3] >> (i & 7) & 1:
+                    neighbors.append((nx, ny))
+        return neighbors
+
+    @property
+    def bits(self) -> memoryview:
+        """Bit đi được như trong file (1 bit mỗi ô, y * width + x, bit thấp trước), không chép"""
+        return self._bits
+
+    def to_plane(self) -> bytearray:
+        return unpack_plane(self._bits, self.width, self.height, self.start_pos, self.end_pos)
+
+    def close(self):
+        if self._mmap is None:
+            return
+        self._bits.release()
+        self._mmap.close(); self._file.close()
+        self._mmap = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
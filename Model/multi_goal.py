@@ -0,0 +1,117 @@
+"""Thu thập nhiều đích: đi từ start qua mọi goal (thứ tự tùy chọn) với tổng số bước nhỏ nhất.
+
+Mỗi goal có một DistanceField (BFS ngược, dựng một lần rồi cache) nên khoảng cách giữa
+mọi cặp điểm là tra mảng. Thứ tự đi là bài toán người bán hàng dạng đường mở:
+    <= EXACT_LIMIT goal  quy hoạch động bitmask, chính xác, O(2^k * k^2)
+    nhiều hơn            láng giềng gần nhất rồi cải thiện bằng 2-opt, nhanh, gần tối ưu
+Đường đi cuối cùng nối các đoạn theo con trỏ step của từng DistanceField, không tìm lại.
+"""
+from typing import List, Sequence, Tuple
+
+from Model.distance_field import DistanceField
+
+EXACT_LIMIT = 10
+TWO_OPT_PASSES = 50
+
+def distance_matrix(start: Tuple[int, int], goals: Sequence[Tuple[int, int]],
+                    fields: Sequence[DistanceField]) -> List[List[int]]:
+    """Ma trận số bước giữa các điểm: chỉ số 0 = start, j = goals[j - 1]; -1 = không tới được"""
+    points = [tuple(start)] + [tuple(g) for g in goals]
+    size = len(points)
+    matrix = [[0] * size for _ in range(size)]
+    for j, field in enumerate(fields, 1):
+        for i, (x, y) in enumerate(points):
+            matrix[i][j] = field.distance(x, y)
+        matrix[j][0] = matrix[0][j]  # mê cung vô hướng: đối xứng
+    return matrix
+
+def route_cost(matrix: List[List[int]], order: Sequence[int]) -> int:
+    """Tổng số bước đi start -> goals theo order (chỉ số goal tính từ 0)"""
+    cost, current = 0, 0
+    for j in order:
+        cost += matrix[current][j + 1]
+        current = j + 1
+    return cost
+
+def exact_order(matrix: List[List[int]]) -> Tuple[int, List[int]]:
+    """Quy hoạch động trên tập goal đã đi (bitmask) và goal cuối cùng"""
+    k = len(matrix) - 1
+    if k == 0:
+        return 0, []
+    full = (1 << k) - 1
+    inf = float("inf")
+    best = [[inf] * k for _ in range(full + 1)]
+    parent = [[-1] * k for _ in range(full + 1)]
+    for j in range(k):
+        best[1 << j][j] = matrix[0][j + 1]
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for last in range(k):
+            cost = row[last]
+            if cost == inf:
+                continue
+            dist = matrix[last + 1]
+            rest = full ^ mask
+            while rest:
+                bit = rest & -rest
+                rest ^= bit
+                nxt = bit.bit_length() - 1
+                new_cost = cost + dist[nxt + 1]
+                if new_cost < best[mask | bit][nxt]:
+                    best[mask | bit][nxt] = new_cost
+                    parent[mask | bit][nxt] = last
+    last = min(range(k), key=best[full].__getitem__)
+    cost = best[full][last]
+    order, mask = [], full
+    while last >= 0:
+        order.append(last)
+        last, mask = parent[mask][last], mask ^ (1 << last)
+    order.reverse()
+    return cost, order
+
+def heuristic_order(matrix: List[List[int]]) -> Tuple[int, List[int]]:
+    """Láng giềng gần nhất, sau đó 2-opt (đảo đoạn) tới khi không còn cải thiện"""
+    k = len(matrix) - 1
+    remaining = set(range(1, k + 1))
+    route = [0]
+    while remaining:
+        dist = matrix[route[-1]]
+        nxt = min(remaining, key=dist.__getitem__)
+        remaining.remove(nxt)
+        route.append(nxt)
+
+    # đường mở: đảo route[i..j] chỉ đổi cạnh (i-1, i) và (j, j+1) (nếu j không phải cuối)
+    for _ in range(TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, len(route) - 1):
+            a, b = route[i - 1], route[i]
+            for j in range(i + 1, len(route)):
+                c = route[j]
+                if j + 1 < len(route):
+                    d = route[j + 1]
+                    delta = matrix[a][c] + matrix[b][d] - matrix[a][b] - matrix[c][d]
+                else:
+                    delta = matrix[a][c] - matrix[a][b]
+                if delta < 0:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    b = route[i]
+                    improved = True
+        if not improved:
+            break
+    order = [p - 1 for p in route[1:]]
+    return route_cost(matrix, order), order
+
+def visiting_order(matrix: List[List[int]]) -> Tuple[int, List[int]]:
+    """(tổng số bước, thứ tự goal); chính xác khi ít goal, heuristic khi nhiều"""
+    if len(matrix) - 1 <= EXACT_LIMIT:
+        return exact_order(matrix)
+    return heuristic_order(matrix)
+
+def stitch_path(start: Tuple[int, int], goals: Sequence[Tuple[int, int]], fields: Sequence[DistanceField],
+                order: Sequence[int]) -> List[Tuple[int, int]]:
+    """Nối các đoạn start -> goal -> goal ... theo cây con trỏ của từng trường khoảng cách"""
+    path = [tuple(start)]
+    for j in order:
+        leg = fields[j].path_from(*path[-1])
+        path.extend(leg[1:])
+    return path
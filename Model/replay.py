@@ -0,0 +1,355 @@
+"""Ghi / phát lại lượt chơi dạng nhị phân gọn (.mzr), không cần chạy lại solver.
+
+Bố cục file (little-endian):
+    REPLAY_HEADER  magic, version, tick_ms
+    mê cung        header + bit của Model.maze_file (file phát lại tự đủ)
+    các block      BLOCK_HEADER (keyframe: thời điểm, vị trí, số bước, trace gần nhất) + sự kiện
+    chỉ mục        số block + mỗi block một INDEX_ENTRY (offset + keyframe)
+    footer         offset của chỉ mục + INDEX_MAGIC
+
+Sự kiện, thời gian tính bằng tick (tick_ms) so với sự kiện trước:
+    move   1 byte: dt << 2 | hướng (2 bit); dt >= DT_ESCAPE thì dt ghi varint phía sau
+    đặc biệt  SPECIAL << 2 | loại, varint dt, rồi dữ liệu:
+        KIND_TRACE     varint k + k ô đã thăm theo thứ tự (delta, zigzag varint),
+                       varint m + đường đi (ô đầu + hướng 2 bit, 4 bước mỗi byte)
+        KIND_POSITION  varint x, varint y (đặt lại vị trí người chơi)
+
+File thiếu chỉ mục (app bị tắt ngang) vẫn phát được: đọc lần lượt các block header.
+"""
+import bisect
+import mmap
+import struct
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from Model.maze_file import decode_header, encode_header, pack_plane, unpack_plane
+
+MAGIC = b"MZRP"
+INDEX_MAGIC = b"MZRI"
+FORMAT_VERSION = 1
+TICK_MS = 10
+KEYFRAME_EVERY = 256      # số sự kiện mỗi block; seek chỉ phải giải mã tối đa chừng này
+
+REPLAY_HEADER = struct.Struct("<4sBxH")
+BLOCK_HEADER = struct.Struct("<IIiiIq")   # ticks, độ dài, x, y, steps, offset trace gần nhất (-1)
+INDEX_ENTRY = struct.Struct("<QIiiIq")    # offset block, ticks, x, y, steps, offset trace
+FOOTER = struct.Struct("<Q4s")
+
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]   # mã 0 lên, 1 phải, 2 xuống, 3 trái
+DIR_CODES = {d: i for i, d in enumerate(DIRECTIONS)}
+DT_ESCAPE = 62
+SPECIAL = 63
+KIND_TRACE = 0
+KIND_POSITION = 1
+PATH_DIRS = 0             # đường đi liền nhau: hướng 2 bit
+PATH_DELTAS = 1           # dự phòng khi có bước không kề nhau
+
+def write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        b = data[pos]; pos += 1
+        value |= (b & 0x7F) << shift
+        if b < 0x80:
+            return value, pos
+        shift += 7
+
+def zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+def unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+def visit_sequence(visit_order) -> List[int]:
+    """Mảng thứ tự thăm theo ô (-1 = chưa thăm) -> danh sách ô theo thứ tự thăm
+
+    visit_order: array('i') hoặc bytes của nó (kết quả gửi về từ Controller).
+    """
+    view = memoryview(visit_order)
+    if view.format != "i":
+        visit_order = view.cast("B").cast("i")
+    return [cell for _, cell in sorted((o, cell) for cell, o in enumerate(visit_order) if o >= 0)]
+
+def encode_trace(visit_order, path: Sequence[Tuple[int, int]], width: int) -> bytearray:
+    out = bytearray()
+    cells = visit_sequence(visit_order)
+    write_varint(out, len(cells))
+    prev = 0
+    for cell in cells:
+        write_varint(out, zigzag(cell - prev)); prev = cell
+    write_varint(out, len(path))
+    if not path:
+        return out
+    steps = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:])]
+    x, y = path[0]
+    write_varint(out, y * width + x)
+    if all(step in DIR_CODES for step in steps):
+        out.append(PATH_DIRS)
+        for i in range(0, len(steps), 4):
+            byte = 0
+            for j, step in enumerate(steps[i:i + 4]):
+                byte |= DIR_CODES[step] << (2 * j)
+            out.append(byte)
+    else:
+        out.append(PATH_DELTAS)
+        for dx, dy in steps:
+            write_varint(out, zigzag(dx)); write_varint(out, zigzag(dy))
+    return out
+
+def decode_trace(data, pos: int, width: int, height: int) -> Tuple[array, List[Tuple[int, int]]]:
+    """-> (visit_order như SolvingModel.visit_order, đường đi)"""
+    visit_order = array("i", [-1]) * (width * height)
+    count, pos = read_varint(data, pos)
+    cell = 0
+    for rank in range(count):
+        delta, pos = read_varint(data, pos)
+        cell += unzigzag(delta)
+        visit_order[cell] = rank
+    length, pos = read_varint(data, pos)
+    if not length:
+        return visit_order, []
+    first, pos = read_varint(data, pos)
+    x, y = first % width, first // width
+    path = [(x, y)]
+    kind = data[pos]; pos += 1
+    for i in range(length - 1):
+        if kind == PATH_DIRS:
+            dx, dy = DIRECTIONS[(data[pos + i // 4] >> (2 * (i % 4))) & 3]
+        else:
+            dx, pos = read_varint(data, pos); dy, pos = read_varint(data, pos)
+            dx, dy = unzigzag(dx), unzigzag(dy)
+        x += dx; y += dy
+        path.append((x, y))
+    return visit_order, path
+
+class ReplayRecorder:
+    """Ghi sự kiện vào file theo block; bộ nhớ chỉ giữ block hiện tại và chỉ mục (nhỏ)."""
+    def __init__(self, path: str, plane, width: int, height: int, start: Tuple[int, int],
+                 mode: Optional[str] = None, seed: Optional[int] = None,
+                 tick_ms: int = TICK_MS, keyframe_every: int = KEYFRAME_EVERY):
+        self.path = path
+        self.width, self.height = width, height
+        self.tick_ms = tick_ms
+        self.keyframe_every = keyframe_every
+        self._file = open(path, "wb")
+        self._file.write(REPLAY_HEADER.pack(MAGIC, FORMAT_VERSION, tick_ms))
+        self._file.write(encode_header(width, height, start, None, mode, seed, False))
+        self._file.write(pack_plane(plane))
+
+        self.x, self.y = start
+        self.steps = 0
+        self._ticks = 0
+        self._trace_offset = -1
+        self._index: List[Tuple] = []
+        self._new_block()
+
+    def _new_block(self):
+        self._block_offset = self._file.tell()
+        self._block_key = (self._ticks, self.x, self.y, self.steps, self._trace_offset)
+        self._buf = bytearray()
+        self._events = 0
+
+    def _tag(self, t: float, low: int, special: bool = False):
+        if self._events >= self.keyframe_every:
+            self.flush_block()
+        ticks = max(self._ticks, int(t * 1000 / self.tick_ms))
+        dt = ticks - self._ticks
+        self._ticks = ticks
+        self._events += 1
+        if special:
+            self._buf.append(SPECIAL << 2 | low); write_varint(self._buf, dt)
+        elif dt < DT_ESCAPE:
+            self._buf.append(dt << 2 | low)
+        else:
+            self._buf.append(DT_ESCAPE << 2 | low); write_varint(self._buf, dt)
+
+    def move(self, dx: int, dy: int, t: float):
+        """Một bước của người chơi tại thời điểm t (giây, thời gian chơi)"""
+        self._tag(t, DIR_CODES[(dx, dy)])
+        self.x += dx; self.y += dy; self.steps += 1
+
+    def position(self, x: int, y: int, t: float):
+        self._tag(t, KIND_POSITION, special=True)
+        write_varint(self._buf, x); write_varint(self._buf, y)
+        self.x, self.y = x, y
+
+    def trace(self, visit_order, path: Sequence[Tuple[int, int]], t: float):
+        """Kết quả một lần giải: thứ tự thăm + đường đi"""
+        self._tag(t, KIND_TRACE, special=True)
+        self._trace_offset = self._block_offset + BLOCK_HEADER.size + len(self._buf)
+        self._buf += encode_trace(visit_order, path, self.width)
+
+    def flush_block(self):
+        """Ghi block hiện tại ra file (file đọc được ngay cả khi chưa close)"""
+        if self._events:
+            ticks, x, y, steps, trace = self._block_key
+            self._file.write(BLOCK_HEADER.pack(ticks, len(self._buf), x, y, steps, trace))
+            self._file.write(self._buf)
+            self._index.append((self._block_offset,) + self._block_key)
+        self._file.flush()
+        self._new_block()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush_block()
+        index_offset = self._file.tell()
+        self._file.write(struct.pack("<I", len(self._index)))
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(FOOTER.pack(index_offset, INDEX_MAGIC))
+        self._file.close(); self._file = None
+
+class ReplayState:
+    __slots__ = ("x", "y", "steps", "trace_offset", "trace_ticks")
+
+    def __init__(self, x, y, steps, trace_offset, trace_ticks=-1):
+        self.x, self.y, self.steps = x, y, steps
+        self.trace_offset, self.trace_ticks = trace_offset, trace_ticks
+
+class ReplayPlayer:
+    """Phát lại file .mzr: chỉ đọc chỉ mục lúc mở, block và trace được giải mã khi cần."""
+    MAX_CACHED_BLOCKS = 4
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.tick_ms = REPLAY_HEADER.unpack_from(self._data)
+        if magic != MAGIC or version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Not a replay file: {path}")
+        maze = decode_header(self._data, REPLAY_HEADER.size)
+        self.width, self.height = maze["width"], maze["height"]
+        self.start, self.mode, self.seed = maze["start"], maze["mode"], maze["seed"]
+        self._maze_bits = REPLAY_HEADER.size + maze["header_size"]
+        self._blocks_start = self._maze_bits + (self.width * self.height + 7) // 8
+        self._index = self._read_index()
+        self._ticks = [entry[1] for entry in self._index]
+        self._decoded: Dict[int, List[Tuple]] = {}
+        self._traces: Dict[int, Tuple] = {}
+        self._duration = None
+
+    def _read_index(self) -> List[Tuple]:
+        data = self._data
+        if len(data) >= self._blocks_start + FOOTER.size:
+            index_offset, magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+            if magic == INDEX_MAGIC:
+                count = struct.unpack_from("<I", data, index_offset)[0]
+                return [INDEX_ENTRY.unpack_from(data, index_offset + 4 + i * INDEX_ENTRY.size) for i in range(count)]
+        # không có chỉ mục: quét các block header
+        index, pos = [], self._blocks_start
+        while pos + BLOCK_HEADER.size <= len(data):
+            ticks, length, x, y, steps, trace = BLOCK_HEADER.unpack_from(data, pos)
+            if pos + BLOCK_HEADER.size + length > len(data):
+                break
+            index.append((pos, ticks, x, y, steps, trace))
+            pos += BLOCK_HEADER.size + length
+        return index
+
+    @property
+    def plane(self) -> bytearray:
+        return unpack_plane(self._data[self._maze_bits:self._blocks_start], self.width, self.height, self.start)
+
+    def _block(self, i: int) -> List[Tuple]:
+        """Sự kiện của block i: (ticks, dx, dy, x, y, trace_offset) đã tính sẵn vị trí"""
+        events = self._decoded.get(i)
+        if events is not None:
+            return events
+        offset, ticks, x, y, _, _ = self._index[i]
+        _, length, _, _, _, _ = BLOCK_HEADER.unpack_from(self._data, offset)
+        data, pos = self._data, offset + BLOCK_HEADER.size
+        end = pos + length
+        events = []
+        while pos < end:
+            tag = data[pos]; pos += 1
+            high, low = tag >> 2, tag & 3
+            if high == SPECIAL:
+                dt, pos = read_varint(data, pos); ticks += dt
+                if low == KIND_POSITION:
+                    x, pos = read_varint(data, pos); y, pos = read_varint(data, pos)
+                    events.append((ticks, 0, x, y, -1))
+                elif low == KIND_TRACE:
+                    events.append((ticks, 0, x, y, pos))
+                    pos = self._skip_trace(pos)
+                else:
+                    raise ValueError(f"Unknown replay event {low} in {self.path}")
+                continue
+            if high == DT_ESCAPE:
+                high, pos = read_varint(data, pos)
+            ticks += high
+            dx, dy = DIRECTIONS[low]
+            x += dx; y += dy
+            events.append((ticks, 1, x, y, -1))
+        if len(self._decoded) >= self.MAX_CACHED_BLOCKS:
+            self._decoded.pop(next(iter(self._decoded)))
+        self._decoded[i] = events
+        return events
+
+    def _skip_trace(self, pos: int) -> int:
+        data = self._data
+        count, pos = read_varint(data, pos)
+        for _ in range(count):
+            while data[pos] & 0x80: pos += 1
+            pos += 1
+        length, pos = read_varint(data, pos)
+        if not length:
+            return pos
+        _, pos = read_varint(data, pos)
+        kind = data[pos]; pos += 1
+        if kind == PATH_DIRS:
+            return pos + (length - 1 + 3) // 4
+        for _ in range(2 * (length - 1)):
+            _, pos = read_varint(data, pos)
+        return pos
+
+    @property
+    def duration(self) -> float:
+        """Thời điểm của sự kiện cuối (giây)"""
+        if self._duration is None:
+            ticks = 0
+            if self._index:
+                events = self._block(len(self._index) - 1)
+                ticks = events[-1][0] if events else self._index[-1][1]
+            self._duration = ticks * self.tick_ms / 1000
+        return self._duration
+
+    def state_at(self, t: float) -> ReplayState:
+        """Trạng thái tại thời điểm t: nhảy tới keyframe gần nhất rồi giải mã tối đa một block"""
+        ticks = t * 1000 / self.tick_ms
+        i = bisect.bisect_right(self._ticks, ticks) - 1
+        if i < 0:
+            return ReplayState(self.start[0], self.start[1], 0, -1)
+        _, _, x, y, steps, trace = self._index[i]
+        state = ReplayState(x, y, steps, trace)
+        for event_ticks, moved, ex, ey, event_trace in self._block(i):
+            if event_ticks > ticks:
+                break
+            state.x, state.y = ex, ey
+            state.steps += moved
+            if event_trace >= 0:
+                state.trace_offset, state.trace_ticks = event_trace, event_ticks
+        return state
+
+    def trace(self, offset: int) -> Tuple[array, List[Tuple[int, int]]]:
+        """Giải mã trace tại offset (ReplayState.trace_offset), có cache"""
+        if offset not in self._traces:
+            self._traces.clear()
+            self._traces[offset] = decode_trace(self._data, offset, self.width, self.height)
+        return self._traces[offset]
+
+    def close(self):
+        if self._data is not None:
+            self._data.close(); self._file.close()
+            self._data = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
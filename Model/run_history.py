@@ -0,0 +1,115 @@
+"""Lịch sử các lượt chơi, lưu bền vững bằng SQLite (thư viện chuẩn).
+
+Chỉ thêm (append-only): mỗi lượt là một INSERT, không sửa / xóa. Đọc theo trang bằng
+keyset pagination (WHERE key > ? LIMIT n) nên mở trang nào cũng tốn như nhau dù bảng
+có hàng triệu dòng, khác với OFFSET phải quét qua mọi dòng phía trước.
+"""
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_DB = os.path.join(os.path.expanduser("~"), ".monkeys_treasure", "history.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    created  REAL    NOT NULL,
+    duration REAL    NOT NULL,
+    steps    INTEGER NOT NULL,
+    rank     TEXT    NOT NULL,
+    mode     TEXT    NOT NULL,
+    width    INTEGER,
+    height   INTEGER,
+    seed     INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_mode ON runs (mode, id);
+CREATE INDEX IF NOT EXISTS idx_runs_rank ON runs (rank, id);
+CREATE INDEX IF NOT EXISTS idx_runs_duration ON runs (duration, id);
+"""
+
+COLUMNS = ("id", "created", "duration", "steps", "rank", "mode", "width", "height", "seed")
+FILTERS = ("mode", "rank")
+
+# Thứ tự sắp xếp -> (cột khóa, tăng dần?). Khóa luôn kết thúc bằng id nên là duy nhất.
+ORDERS = {
+    "newest": (("id",), False),
+    "fastest": (("duration", "id"), True),
+}
+
+def run_rank(duration: float, steps: int) -> str:
+    return "S" if duration < 30 and steps < 50 else ("A" if duration < 60 else ("B" if duration < 120 else "C"))
+
+def format_duration(duration: float) -> str:
+    return f"{int(duration // 60):02d}:{int(duration % 60):02d}"
+
+class RunStore:
+    """Kho lịch sử lượt chơi. path=":memory:" để dùng tạm (không ghi đĩa)."""
+    def __init__(self, path: str = DEFAULT_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL + synchronous=NORMAL: mỗi INSERT không phải chờ fsync, an toàn khi app bị tắt ngang
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._counts: Dict[tuple, int] = {}
+
+    def append(self, duration: float, steps: int, mode: str, rank: Optional[str] = None,
+               width: Optional[int] = None, height: Optional[int] = None,
+               seed: Optional[int] = None, created: Optional[float] = None) -> int:
+        """Thêm một lượt, trả về id (tăng dần theo thời gian)"""
+        rank = rank or run_rank(duration, steps)
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (created, duration, steps, rank, mode, width, height, seed) VALUES (?,?,?,?,?,?,?,?)",
+                (created or time.time(), duration, steps, rank, mode, width, height, seed))
+        for key in list(self._counts):  # cập nhật số đếm đã cache thay vì đếm lại
+            if all(dict(key).get(name) in (None, value) for name, value in (("mode", mode), ("rank", rank))):
+                self._counts[key] += 1
+        return cur.lastrowid
+
+    def _where(self, filters: Dict) -> tuple:
+        clauses, params = [], []
+        for name in FILTERS:
+            if filters.get(name) is not None:
+                clauses.append(f"{name} = ?"); params.append(filters[name])
+        return clauses, params
+
+    def count(self, **filters) -> int:
+        """Số lượt (theo bộ lọc); đếm một lần rồi cache, append() cập nhật"""
+        key = tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+        if key not in self._counts:
+            clauses, params = self._where(filters)
+            sql = "SELECT COUNT(*) FROM runs" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+            self._counts[key] = self.conn.execute(sql, params).fetchone()[0]
+        return self._counts[key]
+
+    def page(self, after: Optional[Sequence] = None, limit: int = 50, order: str = "newest",
+             backward: bool = False, **filters) -> List[Dict]:
+        """Tối đa limit lượt đứng sau khóa after theo order (backward=True: đứng trước, gần nhất trước)
+
+        after là khóa của một dòng (xem key()); None = từ đầu danh sách (hoặc từ cuối nếu backward).
+        """
+        columns, ascending = ORDERS[order]
+        if backward:
+            ascending = not ascending
+        clauses, params = self._where(filters)
+        if after is not None:
+            op = ">" if ascending else "<"
+            clauses.append(f"({', '.join(columns)}) {op} ({', '.join('?' * len(columns))})")
+            params.extend(after)
+        direction = "ASC" if ascending else "DESC"
+        sql = (f"SELECT {', '.join(COLUMNS)} FROM runs"
+               + (" WHERE " + " AND ".join(clauses) if clauses else "")
+               + " ORDER BY " + ", ".join(f"{c} {direction}" for c in columns) + " LIMIT ?")
+        return [dict(row) for row in self.conn.execute(sql, params + [limit])]
+
+    @staticmethod
+    def key(row: Dict, order: str = "newest") -> tuple:
+        return tuple(row[c] for c in ORDERS[order][0])
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,59 @@
+"""Bộ nhớ làm việc dùng lại cho các thuật toán giải, đánh chỉ số theo ô (i = y * width + x).
+
+Thay cho set visited và dict came_from / cost_so_far mới tạo mỗi lần giải: các mảng
+array cấp phát một lần cho mỗi kích thước mê cung rồi dùng lại. Dấu "đã thấy" / "đã xét"
+là số thế hệ: ô được coi là đã đánh dấu khi seen[i] == generation, nên bắt đầu lần giải
+mới chỉ cần tăng generation, không phải xóa mảng. parent / cost chỉ có nghĩa ở ô đã thấy.
+"""
+import threading
+from array import array
+from typing import Dict, List
+
+MAX_GENERATION = 0xFFFFFFFF  # 'I' là 32 bit không dấu
+MAX_POOLED = 4               # số workspace rảnh giữ lại cho mỗi kích thước
+
+class SolverWorkspace:
+    def __init__(self, size: int):
+        self.size = size
+        self.parent = array("i", [-1]) * size   # ô trước trên đường đi (-1 = gốc)
+        self.cost = array("i", [0]) * size      # chi phí tốt nhất đã biết
+        self.seen = array("I", [0]) * size      # == generation: đã thấy (parent / cost hợp lệ)
+        self.closed = array("I", [0]) * size    # == generation: đã xét (hoặc phía end của Bidirectional)
+        self.parent2 = array("i", [-1]) * size  # con trỏ của phía end (Bidirectional)
+        self.generation = 0
+
+    def begin(self) -> int:
+        """Bắt đầu một lần giải: mọi dấu cũ mất hiệu lực; trả về thế hệ mới"""
+        if self.generation >= MAX_GENERATION:
+            self.seen = array("I", [0]) * self.size
+            self.closed = array("I", [0]) * self.size
+            self.generation = 0
+        self.generation += 1
+        return self.generation
+
+class WorkspacePool:
+    """Các workspace rảnh theo kích thước; acquire() lấy lại cái cũ nếu có"""
+    def __init__(self, max_pooled: int = MAX_POOLED):
+        self.max_pooled = max_pooled
+        self._free: Dict[int, List[SolverWorkspace]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> SolverWorkspace:
+        with self._lock:
+            free = self._free.get(size)
+            workspace = free.pop() if free else None
+        workspace = workspace or SolverWorkspace(size)
+        workspace.begin()
+        return workspace
+
+    def release(self, workspace: SolverWorkspace):
+        with self._lock:
+            free = self._free.setdefault(workspace.size, [])
+            if len(free) < self.max_pooled:
+                free.append(workspace)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+WORKSPACES = WorkspacePool()
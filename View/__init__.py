@@ -1,11 +1,30 @@
-import os, sys, math, random, pygame, time
-import Model
+import os, sys, math, random, sqlite3, pygame, time
+import numpy as np
+from Controller import GameController
+from View.camera import Camera, ChunkRenderer, MIN_CELL_SIZE
+from View.minimap import PlaneImage, Minimap, search_status_plane, LOD_CELL_SIZE
+from View.heatmap import SearchHeatmap
+from View.asset_pipeline import AssetPipeline, ASSETS_LOADED, list_images
+from View.profiler import PROFILER
+from Model.run_history import RunStore, ORDERS, format_duration, run_rank
+from Model.replay import ReplayRecorder, ReplayPlayer
+from Model.distance_field import DistanceField
 GAME_TITLE = "Monkey's Treasure"
 FULLSCREEN = False
 RIGHT_PANEL_W = 360
 FPS = 60
+IDLE_WAIT_MAX = 1000      # ms; longest idle sleep, so controller results are still picked up
+HINT_PULSE_FPS = 15       # redraw rate of the hint pulse while otherwise idle
 MAZE_COLS, MAZE_ROWS = 21, 13
+GEN_MODE = "DFS"          # GenerationModel mode used for new levels
+DEFAULT_ALGO = "BFS"      # used by AUTO SOLVE when the dropdown is still "None"
+AUTO_STEP_TIME = 0.12     # seconds per monkey step while auto solving
+TERRAIN_COSTS = (1, 1, 1, 2, 4)  # floor_map terrain type -> step cost for UCS / A* / Dial / D* Lite
 CELL_GAP = 0  # khít nhau
+MAX_CELL_SIZE = 96
+REPLAY_DIR = os.path.join(os.path.expanduser("~"), ".monkeys_treasure", "replays")
+REPLAY_SPEEDS = (0.25, 64.0)  # min / max playback speed
+REPLAY_SEEK = 5.0             # seconds per Left/Right while replaying
 
 ASSETS = os.path.join(os.path.dirname(__file__), "assets")
 IMG = lambda name: os.path.join(ASSETS, name)
@@ -33,14 +52,14 @@ PALETTES = {
 def draw_shadow(surface, rect, radius=16, offset=(0,6), alpha=110):
     s = pygame.Surface((rect.w+20, rect.h+20), pygame.SRCALPHA)
     pygame.draw.rect(s, (0,0,0,alpha), pygame.Rect(10,10,rect.w,rect.h), border_radius=radius)
-    surface.blit(s, (rect.x-10+offset[0], rect.y-10+offset[1]))
+    surface.blit(s, (rect.x-10+offset[0], rect.y-10+offset[1])); PROFILER.count_blits()
 
 def draw_glass_card(surface, rect, radius=18, bg=(16,20,16,180), border=(90,120,90), border_alpha=60):
     draw_shadow(surface, rect, radius, (0,10), 120)
     card = pygame.Surface(rect.size, pygame.SRCALPHA)
     pygame.draw.rect(card, bg, card.get_rect(), border_radius=radius)
     pygame.draw.rect(card, (*border, border_alpha), card.get_rect(), 2, border_radius=radius)
-    surface.blit(card, rect.topleft)
+    surface.blit(card, rect.topleft); PROFILER.count_blits()
 
 def draw_smooth_rect(surface, rect, color, radius=16, border=0, border_color=(0,0,0)):
     # Supersampling to smooth edges
@@ -50,7 +69,15 @@ def draw_smooth_rect(surface, rect, color, radius=16, border=0, border_color=(0,
     if border>0:
         pygame.draw.rect(temp, border_color, temp.get_rect(), border*scale, border_radius=radius*scale)
     temp = pygame.transform.smoothscale(temp, rect.size)
-    surface.blit(temp, rect.topleft)
+    surface.blit(temp, rect.topleft); PROFILER.count_blits()
+
+def terrain_tile(tile, cost):
+    """Darker floor for costlier terrain (pre-rendered once per cell size)"""
+    if cost <= 1: return tile
+    tile = tile.copy()
+    shade = max(90, 255 - 40*cost)
+    tile.fill((shade, shade, shade), special_flags=pygame.BLEND_RGB_MULT)
+    return tile
 
 def try_load_font(size):
     prefer = os.path.join(ASSETS, "fonts", "PressStart2P.ttf")
@@ -80,7 +107,7 @@ class Button:
         draw_shadow(surface, self.rect, radius=14, offset=(0,6), alpha=100)
         draw_smooth_rect(surface, self.rect, bg, radius=14, border=2, border_color=border_col)
         label = self.font.render(self.text, True, color)
-        surface.blit(label, label.get_rect(center=self.rect.center))
+        surface.blit(label, label.get_rect(center=self.rect.center)); PROFILER.count_blits()
 
     def handle_event(self, event):
         if not self.enabled: return
@@ -107,7 +134,7 @@ class Dropdown:
         draw_smooth_rect(surface, self.rect, bg, radius=14, border=2, border_color=border)
         text = self.selected if self.selected else self.default_text
         label = self.font.render(text, True, (240,240,240))
-        surface.blit(label, (self.rect.x+12, self.rect.y+(self.rect.h-label.get_height())//2))
+        surface.blit(label, (self.rect.x+12, self.rect.y+(self.rect.h-label.get_height())//2)); PROFILER.count_blits()
         # caret
         pygame.draw.polygon(surface, (200,200,200),
                             [(self.rect.right-22, self.rect.y+self.rect.h//2-4),
@@ -124,6 +151,7 @@ class Dropdown:
                 lab = self.font.render(opt, True, (40,40,40))
                 surface.blit(lab, (r.x+12, r.y+(r.h-lab.get_height())//2))
                 pygame.draw.line(surface, (230,230,230), (r.x, r.bottom-1), (r.right, r.bottom-1))
+            PROFILER.count_blits(len(self.options))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -145,38 +173,124 @@ class Dropdown:
                     self.open = True
 
 class ModalHistory:
-    def __init__(self, get_history):
-        self.get_history = get_history
+    """Virtualized run list: only the rows on screen are fetched (keyset pages) and rendered."""
+    ROW_H = 26
+    ORDERS = list(ORDERS)
+
+    def __init__(self, store):
+        self.store = store
         self.visible = False
+        self.order = "newest"
+        self.rows = []; self.offset = 0; self.page_size = 12
+        self._labels = {}  # row id -> rendered cells, only for the rows on screen
+
+    # ---- paging
+    def _set_rows(self, rows):
+        self.rows = rows
+        ids = {row["id"] for row in rows}
+        self._labels = {k: v for k, v in self._labels.items() if k in ids}
+
+    def open(self):
+        self.visible = True; self.home()
+
+    def home(self):
+        self._set_rows(self.store.page(limit=self.page_size, order=self.order)); self.offset = 0
+
+    def end(self):
+        self._set_rows(self.store.page(limit=self.page_size, order=self.order, backward=True)[::-1])
+        self.offset = max(0, self.store.count() - len(self.rows))
+
+    def scroll(self, n):
+        if not self.rows or n == 0: return
+        key = self.store.key
+        if n > 0:
+            more = self.store.page(after=key(self.rows[-1], self.order), limit=n, order=self.order)
+            rows = self.rows + more
+            dropped = max(0, len(rows) - self.page_size)
+            self._set_rows(rows[dropped:]); self.offset += dropped
+        else:
+            newer = self.store.page(after=key(self.rows[0], self.order), limit=-n, order=self.order, backward=True)
+            self._set_rows((newer[::-1] + self.rows)[:self.page_size]); self.offset -= len(newer)
+
+    def set_page_size(self, n):
+        n = max(1, n)
+        if n == self.page_size: return
+        self.page_size = n
+        if not self.rows: self.home(); return
+        top = self.rows[0]
+        self._set_rows([top] + self.store.page(after=self.store.key(top, self.order), limit=n-1, order=self.order))
+
+    def cycle_order(self):
+        self.order = self.ORDERS[(self.ORDERS.index(self.order)+1) % len(self.ORDERS)]
+        self.home()
+
+    def handle_event(self, event):
+        """Returns True when the event was used by the modal (it blocks the game underneath)."""
+        if not self.visible: return False
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll(-3*event.y)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button in (1, 2, 3): self.visible = False
+        elif event.type == pygame.KEYDOWN:
+            k = event.key
+            if k in (pygame.K_DOWN, pygame.K_s): self.scroll(1)
+            elif k in (pygame.K_UP, pygame.K_w): self.scroll(-1)
+            elif k == pygame.K_PAGEDOWN: self.scroll(self.page_size)
+            elif k == pygame.K_PAGEUP: self.scroll(-self.page_size)
+            elif k == pygame.K_HOME: self.home()
+            elif k == pygame.K_END: self.end()
+            elif k == pygame.K_TAB: self.cycle_order()
+            elif k in (pygame.K_F3, pygame.K_F4): return False
+            else: self.visible = False
+        else:
+            return False
+        return True
+
+    # ---- drawing
+    def _row_labels(self, row, font_row):
+        labels = self._labels.get(row["id"])
+        if labels is None:
+            cols = [str(row["id"]), format_duration(row["duration"]), str(row["steps"]), row["rank"], row["mode"]]
+            labels = self._labels[row["id"]] = [font_row.render(val, True, (40,40,40)) for val in cols]
+        return labels
 
     def draw(self, surface, screen_rect, font_header, font_row):
         if not self.visible: return
         overlay = pygame.Surface(screen_rect.size, pygame.SRCALPHA)
         overlay.fill((0,0,0,160))
-        surface.blit(overlay, (0,0))
+        surface.blit(overlay, (0,0)); PROFILER.count_blits()
         w = int(screen_rect.w*0.65); h = int(screen_rect.h*0.65)
         panel = pygame.Rect((screen_rect.w-w)//2, (screen_rect.h-h)//2, w, h)
         draw_glass_card(surface, panel, radius=18, bg=(250,250,250,235), border=(60,60,60), border_alpha=80)
+        total = self.store.count()
         title = font_header.render("History", True, (20,20,20))
         surface.blit(title, (panel.x+16, panel.y+12))
+        info = font_row.render(f"{total} runs · {self.order} (Tab)", True, (90,90,90))
+        surface.blit(info, (panel.right-24-info.get_width(), panel.y+18)); PROFILER.count_blits(2)
         headers = ["#", "Time", "Steps", "Rank", "Mode"]
-        col_w = [60, 200, 160, 120, w-60-200-160-120-48]
+        col_w = [100, 160, 160, 120, w-100-160-160-120-48]
         x = panel.x+24; y = panel.y+64
         for i, head in enumerate(headers):
             lab = font_row.render(head, True, (60,60,60)); surface.blit(lab, (x, y)); x += col_w[i]
         y += 28; pygame.draw.line(surface, (220,220,220), (panel.x+16, y), (panel.right-16, y))
         y += 12
-        history = self.get_history()
+        body = pygame.Rect(panel.x+16, y, panel.w-32, panel.bottom-24-y)
+        self.set_page_size(body.h // self.ROW_H)
         row_alt = (245,245,245)
-        for idx, item in enumerate(history, start=1):
-            if idx % 2 == 0:
-                pygame.draw.rect(surface, row_alt, pygame.Rect(panel.x+16, y-4, panel.w-32, 26), border_radius=6)
+        for i, row in enumerate(self.rows):
+            if (self.offset+i) % 2 == 1:
+                pygame.draw.rect(surface, row_alt, pygame.Rect(body.x, y-4, body.w-12, self.ROW_H), border_radius=6)
             x = panel.x+24
-            cols = [str(idx), item.get("time_str","--"), str(item.get("steps","--")), item.get("rank","--"), item.get("mode","--")]
-            for i, val in enumerate(cols):
-                lab = font_row.render(val, True, (40,40,40)); surface.blit(lab, (x, y)); x += col_w[i]
-            y += 26
-            if y > panel.bottom-32: break
+            for j, lab in enumerate(self._row_labels(row, font_row)):
+                surface.blit(lab, (x, y)); x += col_w[j]
+            y += self.ROW_H
+        PROFILER.count_blits((len(self.rows)+1)*len(headers))  # rows + header row
+        if total > len(self.rows):  # scrollbar
+            track = pygame.Rect(body.right-6, body.y, 4, body.h)
+            thumb_h = max(16, track.h*len(self.rows)//total)
+            thumb_y = track.y + (track.h-thumb_h)*min(self.offset, total-len(self.rows))//max(1, total-len(self.rows))
+            pygame.draw.rect(surface, (225,225,225), track, border_radius=2)
+            pygame.draw.rect(surface, (140,140,140), (track.x, thumb_y, track.w, thumb_h), border_radius=2)
 
 # ---------- Sprites ----------
 class FloatingBanana(pygame.sprite.Sprite):
@@ -190,14 +304,23 @@ class FloatingBanana(pygame.sprite.Sprite):
 
     def update(self, dt):
         self.t += dt
-        dy = math.sin(self.t*2.2) * (self.cell_size*0.10)
-        self.offset = (0, int(dy))
+        self.offset = (0, self.bob(self.t))
+
+    def bob(self, t):
+        return int(math.sin(t*2.2) * (self.cell_size*0.10))
+
+    def next_frame_in(self):
+        """Seconds (on the FPS grid) until the bob moves the banana by a whole pixel"""
+        now = self.bob(self.t)
+        for k in range(1, FPS+1):
+            if self.bob(self.t + k/FPS) != now: return k/FPS
+        return 1.0
 
     def draw(self, surface, pos_px):
         shadow = pygame.Surface((self.rect.w, self.rect.h//6), pygame.SRCALPHA)
         pygame.draw.ellipse(shadow, (0,0,0,80), shadow.get_rect())
         surface.blit(shadow, (pos_px[0], pos_px[1]+self.rect.h-6))
-        surface.blit(self.base_image, (pos_px[0], pos_px[1]+self.offset[1]))
+        surface.blit(self.base_image, (pos_px[0], pos_px[1]+self.offset[1])); PROFILER.count_blits(2)
 
 class MonkeyIdle(pygame.sprite.Sprite):
     def __init__(self, frames, fallback, cell_size):
@@ -212,14 +335,17 @@ class MonkeyIdle(pygame.sprite.Sprite):
             if self.timer >= 1.0/self.fps:
                 self.timer = 0.0; self.index = (self.index+1) % len(self.frames)
 
+    def next_frame_in(self):
+        return max(0.0, 1.0/self.fps - self.timer) if self.fps>0 and len(self.frames)>1 else None
+
     def current(self):
         return self.frames[self.index]
 
 # ---------- Maze data ----------
-def make_placeholder_maze(cols, rows):
-    grid = [[1 if random.random()<0.25 else 0 for _ in range(cols)] for _ in range(rows)]
-    grid[0][0] = 0; grid[rows-1][cols-1] = 0
-    return grid
+def maze_from_plane(plane, cols, rows):
+    """Model status plane (0 = wall) -> View grid (1 = wall, 0 = walkable)"""
+    codes = np.frombuffer(plane, dtype=np.uint8, count=cols*rows).reshape(rows, cols)
+    return (codes == 0).astype(np.uint8).tolist()
 
 # ---------- App ----------
 class App:
@@ -231,6 +357,7 @@ class App:
         self.clock = pygame.time.Clock()
         self.window_rect = self.screen.get_rect()
         self.running = True
+        self._woken_by = None  # event that ended an idle wait, handled with the next frame
 
         # Performance optimization - Cache system
         self._image_cache = {}
@@ -238,24 +365,24 @@ class App:
         self._last_cell_size = None
         self._bg_cache = {}
 
-        # assets
-        self.bg_jungle = load_image(IMG("bg_jungle.png"))
+        # assets: only the start background is loaded here, the rest is decoded on a
+        # worker thread while the start screen shows and packed into per-cell-size atlases
         self.bg_start = load_image(IMG("bg_start.png"))
-        self.tile_wall = load_image(IMG("tile_wall.png"))
-        self.monkey_img = load_image(IMG("monkey.png"))
-        self.banana_img = load_image(IMG("banana_rainbow.png"))
-
-        # floor tiles
-        self.floor_tiles = []
-        tiles_dir = os.path.join(ASSETS, "tiles")
-        for name in sorted(os.listdir(tiles_dir)):
-            if name.lower().endswith(".png"):
-                self.floor_tiles.append(load_image(os.path.join(tiles_dir, name)))
+        self.bg_jungle = None
+        self.assets = AssetPipeline({
+            "bg_jungle": [IMG("bg_jungle.png")],
+            "floor": list_images(os.path.join(ASSETS, "tiles")),
+            "wall": [IMG("tile_wall.png")],
+            "idle": list_images(os.path.join(ASSETS, "monkey_stand"), (".png",".jpg",".jpeg")),
+            "monkey": [IMG("monkey.png")],
+            "banana": [IMG("banana_rainbow.png")],
+        })
 
         # fonts
         self.font_title = try_load_font(64)
         self.font_ui = try_load_font(26)
         self.font_small = try_load_font(20)
+        self.font_mono = pygame.font.SysFont("consolas,menlo,dejavusansmono,monospace", 15)
 
         # state
         self.state = "start"
@@ -265,8 +392,18 @@ class App:
         self.steps = 0
         self.timer = 0.0
         self.start_time = None
-        self.history = []
-        self.modal_history = ModalHistory(lambda: self.history)
+        try:
+            self.history = RunStore()
+        except (OSError, sqlite3.Error):
+            self.history = RunStore(":memory:")  # read-only home: keep this session's runs only
+        self.modal_history = ModalHistory(self.history)
+        self.recorder = None   # ReplayRecorder of the current level
+        self.replay = None     # ReplayPlayer while a replay is running
+        self.replay_time = 0.0; self.replay_speed = 1.0; self.replay_trace = -1
+        self.live_state = None
+        self.hints = None      # DistanceField to the goal, built with the level
+        self.hint_on = False; self.hint = None; self._hint_label = None
+        self.compare_summary = None; self._compare_labels = None  # side-by-side solver comparison (C)
 
         # window controls
         self.btn_close = Button((self.window_rect.w-48-12, 12, 48, 28), "✕", self.font_small, self.quit, theme='red')
@@ -274,28 +411,41 @@ class App:
         self.btn_min   = Button((self.window_rect.w-48-12-112, 12, 48, 28), "—", self.font_small, self.minimize, theme='yellow')
 
         # start screen
-        self.btn_start = Button((0,0,260,56), "START", self.font_ui, self.goto_game, theme='green')
+        self.btn_start = Button((0,0,260,56), "LOADING…", self.font_ui, self.goto_game, theme='green')
+        self.btn_start.enabled = False
 
         # game UI
+        self.camera = None
+        self.zoom_level = 0
+        self.chunks = ChunkRenderer()
+        self.maze_image = PlaneImage()
+        self.minimap = Minimap(self.maze_image)
+        self.heatmap = SearchHeatmap()
         self.compute_layout()
+        self.assets.start(cell_sizes=[self.cell_size])
         spx = self.window_rect.w - RIGHT_PANEL_W + 20
         cur_y = 110  # moved down so not covered by window controls
         self.btn_restart = Button((spx, cur_y, RIGHT_PANEL_W-40, 48), "↻  RESTART", self.font_ui, self.restart_level, theme='orange'); cur_y+=64
         self.btn_play    = Button((spx, cur_y, (RIGHT_PANEL_W-48)//2, 48), "▶  PLAY",  self.font_ui, self.toggle_play, theme='green')
         self.btn_pause   = Button((spx+(RIGHT_PANEL_W-48)//2+8, cur_y, (RIGHT_PANEL_W-48)//2, 48), "⏸  PAUSE", self.font_ui, self.toggle_play, theme='yellow'); cur_y+=64
         self.btn_auto    = Button((spx, cur_y, RIGHT_PANEL_W-40, 48), "⚙  AUTO SOLVE", self.font_ui, self.toggle_auto, theme='blue'); cur_y+=64
-        self.dropdown    = Dropdown((spx, cur_y, RIGHT_PANEL_W-40, 44), self.font_ui, ["BFS","DFS","UCS","A*","Bidirectional Search"], default_text="None", on_select=self.set_algo); cur_y+=64
+        self.dropdown    = Dropdown((spx, cur_y, RIGHT_PANEL_W-40, 44), self.font_ui, ["BFS","DFS","UCS","A*","Bidirectional Search","D* Lite","Dial"], default_text="None", on_select=self.set_algo); cur_y+=64
         self.btn_history = Button((spx, cur_y, RIGHT_PANEL_W-40, 48), "🕘  HISTORY", self.font_ui, self.open_history, theme='purple'); cur_y+=64
         self.btn_back    = Button((spx, cur_y, RIGHT_PANEL_W-40, 48), "←  BACK", self.font_ui, self.goto_start, theme='red')
 
-        # maze
-        self.maze = make_placeholder_maze(MAZE_COLS, MAZE_ROWS)
-        self.player = [0,0]
-        self.prepare_sprites()
+        # maze: generated / solved by the Controller off the UI thread
+        self.controller = GameController()
+        self.plane = bytes(MAZE_COLS*MAZE_ROWS)
+        self.maze = maze_from_plane(self.plane, MAZE_COLS, MAZE_ROWS)
+        self.player = [0,0]; self.goal = [MAZE_COLS-1, MAZE_ROWS-1]
+        self.level_ready = False; self.level_error = None
+        self.auto_path = []; self.auto_index = 0; self.auto_timer = 0.0
 
-        # prebuild random floor map for repeatability
+        # prebuild random terrain map for repeatability; it doubles as the solver cost plane
         random.seed(42)
-        self.floor_map = [[random.randrange(len(self.floor_tiles)) for _ in range(MAZE_COLS)] for _ in range(MAZE_ROWS)]
+        self.floor_map = [[random.randrange(len(TERRAIN_COSTS)) for _ in range(MAZE_COLS)] for _ in range(MAZE_ROWS)]
+        self.costs = bytes(TERRAIN_COSTS[t] for row in self.floor_map for t in row)
+        self.rebuild_maze_image()
 
     def prepare_sprites(self):
         cell = self.cell_size
@@ -304,27 +454,118 @@ class App:
             self.clear_size_dependent_cache()
             self._last_cell_size = cell
 
-        def scale_to_cell(img, ratio=0.9):
-            w = h = int(cell*ratio)
-            return self.get_scaled_image(img, (w,h))
-
-        # Pre-scale and cache all floor tiles for current cell size
-        self.scaled_floor_tiles = []
-        for tile in self.floor_tiles:
-            self.scaled_floor_tiles.append(self.get_scaled_image(tile, (cell, cell)))
-
-        # Pre-scale wall tile
-        self.scaled_wall_tile = self.get_scaled_image(self.tile_wall, (cell, cell))
-
-        # idle frames
-        stand_dir = os.path.join(ASSETS, "monkey_stand")
-        frames = []
-        if os.path.exists(stand_dir):
-            for name in sorted(os.listdir(stand_dir)):
-                if name.lower().endswith((".png",".jpg",".jpeg")):
-                    frames.append(scale_to_cell(load_image(os.path.join(stand_dir, name))))
-        self.monkey_idle = MonkeyIdle(frames, scale_to_cell(self.monkey_img), self.cell_size)
-        self.banana = FloatingBanana(scale_to_cell(self.banana_img, 0.85), self.cell_size)
+        # every sprite for this cell size comes from one pre-scaled atlas (memory/disk cached)
+        atlas = self.assets.atlas(cell)
+        floors = atlas.frames("floor")
+        self.scaled_floor_tiles = [terrain_tile(floors[t % len(floors)], cost) for t, cost in enumerate(TERRAIN_COSTS)]
+        self.scaled_wall_tile = atlas.get("wall")
+        self.monkey_idle = MonkeyIdle(atlas.frames("idle"), atlas.get("monkey"), self.cell_size)
+        self.banana = FloatingBanana(atlas.get("banana"), self.cell_size)
+        self.rebuild_maze_layer()
+
+    def rebuild_maze_layer(self):
+        """Re-point the chunk renderer at the current maze/tiles (drops pre-rendered chunks)"""
+        self.chunks.set_sources(self.maze, self.floor_map, self.scaled_floor_tiles, self.scaled_wall_tile, self.cell_size)
+        self.camera.snap(*self.player)
+
+    def show_search_trace(self, visit_order, play=True):
+        """Replay a solver's visit order (SolvingModel.visit_order) as a heatmap over the maze"""
+        self.heatmap.set_trace(visit_order, MAZE_COLS, MAZE_ROWS, play)
+
+    def rebuild_maze_image(self, plane=None):
+        """1px-per-cell image of the maze for the minimap and zoomed-out LOD"""
+        self.maze_image.set_plane(plane or self.plane, MAZE_COLS, MAZE_ROWS)
+
+    # ---- Controller results
+    def apply_result(self, result):
+        if result["kind"] == "generate":
+            self.load_level(result)
+        elif result["kind"] in ("compare", "compare_done"):
+            self.compare_summary = result["summary"]; self._compare_labels = None
+        elif result["kind"] == "solve":
+            self.show_search_trace(result["visit_order"])
+            if self.recorder: self.recorder.trace(result["visit_order"], result["path"], self.timer)
+            self.rebuild_maze_image(search_status_plane(self.plane, result["visit_order"], result["path"], MAZE_COLS))
+            self.auto_path = result["path"] if result["found"] else []
+            self.auto_index = 1; self.auto_timer = 0.0
+        else:
+            print("Controller error:", result.get("error"), file=sys.stderr)
+            if result.get("job_kind") == "generate": self.level_error = result.get("error") or "unknown error"
+
+    def load_level(self, level):
+        self.plane = level["plane"]
+        self.maze = maze_from_plane(self.plane, MAZE_COLS, MAZE_ROWS)
+        self.player = list(level["start"]); self.goal = list(level["end"])
+        self.level_ready = True
+        self.hints = level.get("field") or DistanceField(self.plane, MAZE_COLS, MAZE_ROWS, level["end"])
+        self.update_hint()
+        self.start_recording(level)
+        self.rebuild_maze_layer(); self.rebuild_maze_image(); self.heatmap.clear()
+        if self.auto_on: self.request_solve()
+
+    def update_hint(self):
+        """O(1): remaining distance and best next move from the player's cell"""
+        if self.hints is None: self.hint = None; return
+        c, r = self.player
+        self.hint = (self.hints.distance(c, r), self.hints.best_move(c, r), (c, r))
+
+    # ---- Replays
+    def start_recording(self, level):
+        self.stop_recording()
+        try:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, time.strftime("%Y%m%d-%H%M%S") + f"-{level['id']}.mzr")
+            self.recorder = ReplayRecorder(path, self.plane, MAZE_COLS, MAZE_ROWS, level["start"], level["mode"], level["seed"])
+        except OSError as e:
+            print("Replay recording disabled:", e, file=sys.stderr)
+
+    def stop_recording(self):
+        self.stop_replay()
+        if self.recorder: self.recorder.close(); self.recorder = None
+
+    def start_replay(self):
+        """Play back the current level's recording from the start (the live game waits)."""
+        if self.recorder is None: return
+        self.recorder.flush_block()
+        self.replay = ReplayPlayer(self.recorder.path)
+        self.live_state = (self.player, self.steps)
+        self.replay_time = 0.0; self.replay_trace = -1
+        self.heatmap.clear()
+
+    def stop_replay(self):
+        if self.replay is None: return
+        self.replay.close(); self.replay = None
+        self.player, self.steps = self.live_state
+        self.heatmap.clear()
+
+    def set_replay_speed(self, factor):
+        self.replay_speed = min(max(REPLAY_SPEEDS[0], self.replay_speed*factor), REPLAY_SPEEDS[1])
+
+    def seek_replay(self, seconds):
+        self.replay_time = min(max(0.0, self.replay_time+seconds), self.replay.duration)
+
+    def update_replay(self, dt):
+        self.replay_time += dt*self.replay_speed
+        state = self.replay.state_at(self.replay_time)
+        self.player = [state.x, state.y]; self.steps = state.steps
+        if state.trace_offset != self.replay_trace:
+            self.replay_trace = state.trace_offset
+            if state.trace_offset < 0: self.heatmap.clear()
+            else: self.show_search_trace(self.replay.trace(state.trace_offset)[0])
+        if self.replay_time > self.replay.duration + 1.0: self.stop_replay()
+
+    def toggle_compare(self):
+        """Run every solver on the current maze in parallel; C again closes the table."""
+        if self.compare_summary is not None or self.controller.comparison is not None:
+            self.controller.cancel_compare(); self.compare_summary = None
+        elif self.level_ready and self.controller.compare(start=self.player, costs=self.costs):
+            self.compare_summary = {"results": [], "finished": 0, "total": 0, "wall_time": 0.0}
+            self._compare_labels = None
+
+    def request_solve(self):
+        if not self.level_ready: return  # solved as soon as the level arrives
+        self.auto_path = []
+        self.controller.solve(self.selected_algo or DEFAULT_ALGO, start=self.player, costs=self.costs)
 
     # ---- Window controls
     def minimize(self):
@@ -341,9 +582,11 @@ class App:
         self.screen = pygame.display.get_surface()
         self.window_rect = self.screen.get_rect()
         self.compute_layout()
+        if self.state == "game": self.prepare_sprites()
 
     def quit(self):
         self.running = False
+        self.controller.shutdown()
 
     # ---- Layout
     def compute_layout(self):
@@ -354,81 +597,172 @@ class App:
         avail_h = screen.h - margin*2
         cell_w = avail_w // MAZE_COLS
         cell_h = avail_h // MAZE_ROWS
-        self.cell_size = min(cell_w, cell_h)
-        maze_w = self.cell_size * MAZE_COLS
-        maze_h = self.cell_size * MAZE_ROWS
+        # big mazes keep a readable cell size and scroll instead of shrinking
+        self.fit_cell_size = max(MIN_CELL_SIZE, min(cell_w, cell_h))
+        self.cell_size = self.zoom_cell(self.zoom_level)
+        maze_w = min(self.cell_size * MAZE_COLS, avail_w)
+        maze_h = min(self.cell_size * MAZE_ROWS, avail_h)
         self.maze_rect = pygame.Rect((left_space - maze_w)//2 + margin, (screen.h-maze_h)//2, maze_w, maze_h)
+        if self.camera is None:
+            self.camera = Camera(self.maze_rect, MAZE_COLS, MAZE_ROWS, self.cell_size)
+        else:
+            self.camera.configure(self.maze_rect, MAZE_COLS, MAZE_ROWS, self.cell_size)
+
+    def zoom_cell(self, level):
+        """Cell size at a zoom level: the fitted size doubled / halved, so level 0 is always the fitted layout"""
+        return self.fit_cell_size << level if level >= 0 else max(1, self.fit_cell_size >> -level)
+
+    def zoom(self, step):
+        """Double / halve the cell size; below LOD_CELL_SIZE the maze is drawn from the plane image"""
+        level = self.zoom_level + (1 if step > 0 else -1)
+        cell = self.zoom_cell(level)
+        if cell > MAX_CELL_SIZE or cell == self.cell_size: return
+        self.zoom_level = level
+        self.compute_layout(); self.prepare_sprites()
 
     # ---- State transitions
     def goto_start(self):
         self.save_run(label="Manual" if not self.auto_on else f"Auto ({self.selected_algo or 'None'})")
+        self.controller.cancel(); self.stop_recording()
         self.state = "start"; self.modal_history.visible=False
 
     def goto_game(self):
+        if self.bg_jungle is None: self.bg_jungle = self.assets.image("bg_jungle")
+        if self._last_cell_size != self.cell_size: self.prepare_sprites()
         self.state = "game"; self.reset_run()
 
     def reset_run(self):
         self.steps = 0; self.timer = 0.0; self.start_time = time.time()
         self.paused = False; self.auto_on=False
-        self.player=[0,0]
-        self.maze = make_placeholder_maze(MAZE_COLS, MAZE_ROWS)
+        self.auto_path = []; self.level_ready = False; self.level_error = None
+        self.compare_summary = None
+        self.stop_recording()
+        # drop whatever is still generating/solving and ask for a fresh level
+        self.controller.cancel()
+        self.controller.generate(MAZE_COLS, MAZE_ROWS, GEN_MODE)
 
     def restart_level(self): self.reset_run()
     def toggle_play(self): self.paused = not self.paused
-    def toggle_auto(self): self.auto_on = not self.auto_on
-    def set_algo(self, name): self.selected_algo = name
-    def open_history(self): self.modal_history.visible = True
+    def toggle_auto(self):
+        self.auto_on = not self.auto_on
+        if self.auto_on: self.request_solve()
+        else: self.auto_path = []
+    def set_algo(self, name):
+        self.selected_algo = name
+        if self.auto_on: self.request_solve()
+    def open_history(self): self.modal_history.open()
 
     def save_run(self, label="Manual"):
         if self.start_time is None: return
         duration = self.timer; steps=self.steps
         if duration<=0 and steps<=0: return
-        rank = "S" if duration<30 and steps<50 else ("A" if duration<60 else ("B" if duration<120 else "C"))
         mode = label if "Auto" in label else ("Manual" if not self.auto_on else f"Auto ({self.selected_algo or 'None'})")
-        self.history.append({"time_str": f"{int(duration//60):02d}:{int(duration%60):02d}", "steps": steps, "rank": rank, "mode": mode})
+        maze = self.controller.maze or {}
+        self.history.append(duration, steps, mode, run_rank(duration, steps),
+                            MAZE_COLS, MAZE_ROWS, maze.get("seed"))
 
     # ---- Input
+    def export_trace(self):
+        try: PROFILER.export_chrome_trace()
+        except OSError as e: print("Trace export failed:", e, file=sys.stderr)
+
     def handle_events(self):
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if self._woken_by is not None: events.insert(0, self._woken_by); self._woken_by = None
+        for event in events:
             if event.type == pygame.QUIT: self.quit()
+            if self.modal_history.handle_event(event): continue
+            if event.type == ASSETS_LOADED:
+                if event.error: print("Asset preload failed, loading uncached:", event.error, file=sys.stderr)
+                self.btn_start.text = "START"; self.btn_start.enabled = True
             if self.state == "start": self.btn_start.handle_event(event)
             for b in (self.btn_close, self.btn_max, self.btn_min): b.handle_event(event)
             if self.state == "game":
                 for b in (self.btn_restart, self.btn_play, self.btn_pause, self.btn_auto, self.btn_history, self.btn_back): b.handle_event(event)
                 self.dropdown.handle_event(event)
-                if event.type == pygame.KEYDOWN and not self.paused:
+                if event.type == pygame.KEYDOWN and self.replay:
+                    if event.key in (pygame.K_r, pygame.K_ESCAPE): self.stop_replay()
+                    elif event.key == pygame.K_PERIOD: self.set_replay_speed(2.0)
+                    elif event.key == pygame.K_COMMA: self.set_replay_speed(0.5)
+                    elif event.key in (pygame.K_LEFT, pygame.K_a): self.seek_replay(-REPLAY_SEEK)
+                    elif event.key in (pygame.K_RIGHT, pygame.K_d): self.seek_replay(REPLAY_SEEK)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_r: self.start_replay()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_c: self.toggle_compare()
+                elif event.type == pygame.KEYDOWN and not self.paused:
                     if event.key in (pygame.K_LEFT, pygame.K_a): self.move(-1,0)
                     if event.key in (pygame.K_RIGHT, pygame.K_d): self.move(1,0)
                     if event.key in (pygame.K_UP, pygame.K_w): self.move(0,-1)
                     if event.key in (pygame.K_DOWN, pygame.K_s): self.move(0,1)
-            if self.modal_history.visible and (event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)):
-                self.modal_history.visible=False
+                if event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS): self.zoom(1)
+                    if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS): self.zoom(-1)
+                    if event.key == pygame.K_m: self.minimap.visible = not self.minimap.visible
+                    if event.key == pygame.K_v: self.heatmap.visible = not self.heatmap.visible
+                    if event.key == pygame.K_h: self.hint_on = not self.hint_on
+                    if event.key == pygame.K_LEFTBRACKET: self.heatmap.scrub(-0.02)
+                    if event.key == pygame.K_RIGHTBRACKET: self.heatmap.scrub(0.02)
+                if event.type == pygame.MOUSEWHEEL and self.maze_rect.collidepoint(pygame.mouse.get_pos()):
+                    self.zoom(event.y)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3: PROFILER.hud_visible = not PROFILER.hud_visible
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4: self.export_trace()
 
     def move(self, dx, dy):
+        if not self.level_ready: return
         c, r = self.player; nc, nr = c+dx, r+dy
         if 0 <= nc < MAZE_COLS and 0 <= nr < MAZE_ROWS:
             if self.maze[nr][nc] == 0:
                 self.player=[nc,nr]; self.steps+=1
+                if self.recorder: self.recorder.move(dx, dy, self.timer)
+                self.update_hint()
 
     # ---- Update / Draw
     def update(self, dt):
-        if self.state=="game" and not self.paused:
+        for result in self.controller.poll(): self.apply_result(result)
+        if self.state=="game" and self.replay:
+            self.monkey_idle.update(dt); self.banana.update(dt)
+            self.update_replay(dt)
+        elif self.state=="game" and not self.paused:
             self.timer += dt; self.monkey_idle.update(dt); self.banana.update(dt)
+            self.update_auto_walk(dt)
+        if self.state=="game":
+            # the frame after an idle wait has a long dt; don't let it snap the camera
+            self.camera.follow(self.player[0], self.player[1], min(dt, 2.0/FPS)); self.heatmap.update(dt)
+
+    def update_auto_walk(self, dt):
+        """Walk the monkey along the solver's path once the search replay is over"""
+        if not (self.auto_on and self.auto_path) or self.heatmap.playing: return
+        self.auto_timer += dt
+        while self.auto_timer >= AUTO_STEP_TIME and self.auto_index < len(self.auto_path):
+            self.auto_timer -= AUTO_STEP_TIME
+            (c, r), (nc, nr) = self.player, self.auto_path[self.auto_index]
+            self.player = [nc, nr]; self.auto_index += 1; self.steps += 1
+            if self.recorder: self.recorder.move(nc-c, nr-r, self.timer)
 
     def draw_start(self):
-        # background full, no blur
-        bg = pygame.transform.smoothscale(self.bg_start, (self.window_rect.w, self.window_rect.h))
-        self.screen.blit(bg, (0,0))
+        # background full, no blur - use cached version
+        bg = self.get_scaled_background(self.bg_start, (self.window_rect.w, self.window_rect.h))
+        self.screen.blit(bg, (0,0)); PROFILER.count_blits()
         # place START slightly left and lower (~82% h)
         self.btn_start.rect.center = (int(self.window_rect.centerx*0.85), int(self.window_rect.h*0.82))
         self.btn_start.draw(self.screen)
         for b in (self.btn_min, self.btn_max, self.btn_close): b.draw(self.screen)
 
     def draw_game(self):
-        # jungle background full - use cached version
-        bg_scaled = self.get_scaled_background(self.bg_jungle, (self.window_rect.w, self.window_rect.h))
-        self.screen.blit(bg_scaled, (0,0))
-
+        with PROFILER.span("background"):
+            # jungle background full - use cached version
+            bg_scaled = self.get_scaled_background(self.bg_jungle, (self.window_rect.w, self.window_rect.h))
+            self.screen.blit(bg_scaled, (0,0)); PROFILER.count_blits()
+        with PROFILER.span("sidebar"): self.draw_sidebar()
+        with PROFILER.span("maze"): self.draw_maze_layer()
+        with PROFILER.span("sprites"): self.draw_sprites()
+        with PROFILER.span("modal"):
+            # window buttons
+            for b in (self.btn_min, self.btn_max, self.btn_close): b.draw(self.screen)
+            if self.compare_summary is not None: self.draw_compare()
+            # history modal
+            self.modal_history.draw(self.screen, self.window_rect, self.font_ui, self.font_small)
+
+    def draw_sidebar(self):
         # sidebar card
         sidebar = pygame.Rect(self.window_rect.w-RIGHT_PANEL_W+10, 14, RIGHT_PANEL_W-20, self.window_rect.h-28)
         draw_glass_card(self.screen, sidebar, radius=22, bg=(18,24,18,190), border=(110,150,110), border_alpha=70)
@@ -437,10 +771,10 @@ class App:
         chip_h = 36; x0 = sidebar.x+18; y0 = sidebar.y+50
         chip1 = pygame.Rect(x0, y0, 140, chip_h)
         draw_smooth_rect(self.screen, chip1, (26,34,26,220), radius=18, border=2, border_color=(86,116,86))
-        self.screen.blit(self.font_small.render("⏱  "+t, True, (235,235,235)), (chip1.x+12, chip1.y+7))
+        self.screen.blit(self.font_small.render("⏱  "+t, True, (235,235,235)), (chip1.x+12, chip1.y+7)); PROFILER.count_blits()
         chip2 = pygame.Rect(chip1.right+10, y0, 120, chip_h)
         draw_smooth_rect(self.screen, chip2, (26,34,26,220), radius=18, border=2, border_color=(86,116,86))
-        self.screen.blit(self.font_small.render("🚶  "+str(self.steps), True, (235,235,235)), (chip2.x+12, chip2.y+7))
+        self.screen.blit(self.font_small.render("🚶  "+str(self.steps), True, (235,235,235)), (chip2.x+12, chip2.y+7)); PROFILER.count_blits()
 
         # buttons
         spx = sidebar.x+18; cur_y = y0 + chip_h + 24
@@ -455,42 +789,109 @@ class App:
             b.draw(self.screen)
         self.dropdown.draw(self.screen)
 
+    def draw_maze_layer(self):
         # maze frame card
         draw_glass_card(self.screen, self.maze_rect, radius=16, bg=(12,22,12,140), border=(90,120,90), border_alpha=55)
 
-        # draw random floor tiles using cached scaled versions
+        # floor + walls: only the pre-rendered chunks under the viewport are blitted
+        self.screen.set_clip(self.maze_rect)
+        if self.cell_size < LOD_CELL_SIZE: self.maze_image.draw_lod(self.screen, self.camera)
+        else: PROFILER.count_blits(self.chunks.draw(self.screen, self.camera))
+        self.heatmap.draw(self.screen, self.camera)
+        self.screen.set_clip(None)
+
+    def draw_hint(self):
+        if self.hint is None or self.hint[2] != tuple(self.player): self.update_hint()
+        if self.hint is None: return
+        dist, move, (c, r) = self.hint
+        if move:
+            cell = self.cell_size
+            x, y = self.camera.to_screen(c+move[0], r+move[1])
+            pulse = 0.5 + 0.5*math.sin(pygame.time.get_ticks()*0.008)
+            pygame.draw.circle(self.screen, (255,225,90), (x+cell//2, y+cell//2), max(2, int(cell*(0.18+0.08*pulse))), max(1, cell//14))
+        if self._hint_label is None or self._hint_label[0] != dist:
+            text = f"🍌 {dist} steps" if dist > 0 else ("🍌 here!" if dist == 0 else "no way to the banana")
+            self._hint_label = (dist, self.font_small.render(text, True, (250,240,200)))
+        label = self._hint_label[1]
+        chip = label.get_rect(topleft=(self.maze_rect.x+14, self.maze_rect.y+12)).inflate(24, 12)
+        draw_smooth_rect(self.screen, chip, (18,24,18,210), radius=12, border=2, border_color=(150,130,60))
+        self.screen.blit(label, label.get_rect(center=chip.center)); PROFILER.count_blits(2)
+
+    def draw_compare(self):
+        """Solver comparison table along the bottom of the maze, one column per algorithm."""
+        summary = self.compare_summary
+        if self._compare_labels is None:
+            small = self.font_small
+            head = f"Compare  {summary['finished']}/{summary['total']}  wall {summary['wall_time']*1000:.0f} ms"
+            if summary.get("slowest"): head += f"  slowest {summary['slowest']*1000:.0f} ms"
+            cols = []
+            for r in summary["results"]:
+                if r is None: cols.append(None); continue
+                best = r["algorithm"] in (summary.get("fastest"), summary.get("fewest_expanded"))
+                color = (255,225,90) if best else (235,235,235)
+                if "error" in r: lines = [r["algorithm"], "error"]
+                else: lines = [r["algorithm"], f"{r['time']*1000:.1f} ms", f"{r['nodes_expanded']} exp",
+                               f"len {r['path_length']}" if r["found"] else "no path"]
+                cols.append(([small.render(t, True, color) for t in lines], r.get("time", 0.0)))
+            self._compare_labels = (self.font_ui.render(head, True, (240,240,240)), cols)
+        head, cols = self._compare_labels
+        line_h = self.font_small.get_linesize()
+        card = pygame.Rect(self.maze_rect.x+10, 0, self.maze_rect.w-20, head.get_height() + line_h*4 + 40)
+        card.bottom = self.maze_rect.bottom - 10
+        draw_smooth_rect(self.screen, card, (18,24,18,220), radius=14, border=2, border_color=(86,116,86))
+        self.screen.blit(head, (card.x+14, card.y+8)); PROFILER.count_blits(2)
+        if not cols: return
+        col_w = (card.w - 28) // len(cols); top = card.y + head.get_height() + 16
+        slowest = summary.get("slowest") or 1.0
+        for i, col in enumerate(cols):
+            x = card.x + 14 + i*col_w
+            if col is None:
+                self.screen.blit(self.font_small.render("…", True, (160,160,160)), (x, top)); PROFILER.count_blits(); continue
+            labels, t = col
+            pygame.draw.rect(self.screen, (72,118,170), (x, top + line_h*4 + 2, max(2, int((col_w-10)*t/slowest)), 4))
+            for k, label in enumerate(labels):
+                self.screen.blit(label, (x, top + k*line_h))
+            PROFILER.count_blits(len(labels))
+
+    def draw_sprites(self):
         cell = self.cell_size
-        for r in range(MAZE_ROWS):
-            for c in range(MAZE_COLS):
-                x = self.maze_rect.x + c*cell
-                y = self.maze_rect.y + r*cell
-                idx = self.floor_map[r][c]
-                # Use pre-scaled cached tiles instead of scaling every frame
-                self.screen.blit(self.scaled_floor_tiles[idx], (x,y))
-
-        # draw walls using cached scaled tile
-        for r in range(MAZE_ROWS):
-            for c in range(MAZE_COLS):
-                if self.maze[r][c] == 1:
-                    x = self.maze_rect.x + c*cell; y = self.maze_rect.y + r*cell
-                    # Use pre-scaled cached wall tile
-                    self.screen.blit(self.scaled_wall_tile, (x, y))
+        lod = cell < LOD_CELL_SIZE
+        self.screen.set_clip(self.maze_rect)
 
         # draw player
-        px = self.maze_rect.x + self.player[0]*cell + (cell - self.monkey_idle.current().get_width())//2
-        py = self.maze_rect.y + self.player[1]*cell + (cell - self.monkey_idle.current().get_height())//2
-        self.screen.blit(self.monkey_idle.current(), (px, py))
+        x, y = self.camera.to_screen(*self.player)
+        if lod:
+            pygame.draw.rect(self.screen, (255,90,60), (x-1, y-1, cell+2, cell+2))
+        else:
+            px = x + (cell - self.monkey_idle.current().get_width())//2
+            py = y + (cell - self.monkey_idle.current().get_height())//2
+            self.screen.blit(self.monkey_idle.current(), (px, py)); PROFILER.count_blits()
 
         # draw banana goal
-        gx = self.maze_rect.x + (MAZE_COLS-1)*cell + (cell - self.banana.base_image.get_width())//2
-        gy = self.maze_rect.y + (MAZE_ROWS-1)*cell + (cell - self.banana.base_image.get_height())//2
-        self.banana.draw(self.screen, (gx, gy))
-
-        # window buttons
-        for b in (self.btn_min, self.btn_max, self.btn_close): b.draw(self.screen)
-
-        # history modal
-        self.modal_history.draw(self.screen, self.window_rect, self.font_ui, self.font_small)
+        if not lod and self.camera.is_visible(*self.goal):
+            x, y = self.camera.to_screen(*self.goal)
+            gx = x + (cell - self.banana.base_image.get_width())//2
+            gy = y + (cell - self.banana.base_image.get_height())//2
+            self.banana.draw(self.screen, (gx, gy))
+        if self.hint_on: self.draw_hint()
+        # corner minimap once the maze no longer fits the frame
+        if self.camera.world_w > self.maze_rect.w or self.camera.world_h > self.maze_rect.h:
+            self.minimap.draw(self.screen, self.maze_rect, self.camera, self.player)
+        self.screen.set_clip(None)
+
+        # worker status
+        status = "Generating…" if not self.level_ready else ("Solving…" if self.controller.busy else None)
+        if self.level_error:
+            error = self.level_error if len(self.level_error) <= 48 else self.level_error[:47]+"…"
+            status = f"Generation failed: {error}  (RESTART to retry)"
+        if status and self.controller.comparison is not None: status = "Comparing…"
+        if self.replay:
+            status = f"Replay ×{self.replay_speed:g}  {self.replay_time:.1f}/{self.replay.duration:.1f}s"
+        if status:
+            label = self.font_ui.render(status, True, (240,240,240))
+            chip = label.get_rect(center=self.maze_rect.center).inflate(32, 16)
+            draw_smooth_rect(self.screen, chip, (18,24,18,210), radius=14, border=2, border_color=(86,116,86))
+            self.screen.blit(label, label.get_rect(center=chip.center)); PROFILER.count_blits()
 
     def get_cached_surface(self, key, creator_func):
         """Cache system for expensive surface operations"""
@@ -518,13 +919,45 @@ class App:
             self._bg_cache[cache_key] = pygame.transform.smoothscale(image, size)
         return self._bg_cache[cache_key]
 
+    # ---- Frame pacing
+    def animating(self):
+        """Something moves every frame: run at full FPS"""
+        if PROFILER.hud_visible or self.controller.busy: return True
+        if self.state != "game": return False
+        if self.replay or self.heatmap.playing: return True
+        if self.camera.target != (self.camera.x, self.camera.y): return True
+        return not self.paused and self.auto_on and self.auto_index < len(self.auto_path)
+
+    def idle_delay(self):
+        """Seconds until the next visible change when nothing animates (None = wait for input)"""
+        if self.state != "game" or self.paused: return None
+        monkey = self.monkey_idle.next_frame_in()
+        delay = min(self.banana.next_frame_in(), 1.0 if monkey is None else monkey,
+                    1.0 - self.timer % 1.0)  # sidebar clock shows whole seconds
+        return min(delay, 1.0/HINT_PULSE_FPS) if self.hint_on else delay
+
+    def wait_for_event(self):
+        """Sleep until input arrives or the next idle frame is due; the event is handled next frame"""
+        delay = self.idle_delay()
+        timeout = IDLE_WAIT_MAX if delay is None else min(IDLE_WAIT_MAX, max(1, int(delay*1000)))
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT: self._woken_by = event
+
     def run(self):
         while self.running:
             dt = self.clock.tick(FPS)/1000.0
-            self.handle_events(); self.update(dt)
-            if self.state=="start": self.draw_start()
-            else: self.draw_game()
-            pygame.display.flip()
+            PROFILER.begin_frame()
+            with PROFILER.span("events"): self.handle_events()
+            with PROFILER.span("update"): self.update(dt)
+            with PROFILER.span("draw"):
+                if self.state=="start": self.draw_start()
+                else: self.draw_game()
+                PROFILER.draw_hud(self.screen, self.font_mono)
+            with PROFILER.span("flip"): pygame.display.flip()
+            PROFILER.end_frame()
+            if self.running and not self.animating(): self.wait_for_event()
+        self.stop_recording()
+        self.history.close()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+import os, json, hashlib, threading
+import pygame
+
+ATLAS_VERSION = 1
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".monkeys_treasure", "atlas")
+ASSETS_LOADED = pygame.event.custom_type()
+
+# sprite name -> size as a fraction of the cell (same ratios prepare_sprites always used)
+ATLAS_RATIOS = {"floor": 1.0, "wall": 1.0, "idle": 0.9, "monkey": 0.9, "banana": 0.85}
+
+def decode_image(path):
+    """Decode a PNG without convert() so it can run off the main thread."""
+    try:
+        return pygame.image.load(path)
+    except Exception:
+        surf = pygame.Surface((64,64), pygame.SRCALPHA)
+        surf.fill((200,50,50,160))
+        return surf
+
+def list_images(folder, exts=(".png",)):
+    if not os.path.exists(folder): return []
+    return [os.path.join(folder, n) for n in sorted(os.listdir(folder)) if n.lower().endswith(exts)]
+
+# ---------- Atlas ----------
+class SpriteAtlas:
+    """All scaled sprites for one cell size packed into a single sheet."""
+    def __init__(self, sheet, rects):
+        self.sheet = sheet
+        self.rects = rects  # name -> [Rect, ...]
+        self._subs = {}
+
+    def frames(self, name):
+        if name not in self._subs:
+            self._subs[name] = [self.sheet.subsurface(r) for r in self.rects.get(name, [])]
+        return self._subs[name]
+
+    def get(self, name, index=0):
+        frames = self.frames(name)
+        return frames[index] if frames else None
+
+    @classmethod
+    def pack(cls, cell, images):
+        """Shelf-pack images {name: [Surface, ...]} scaled by ATLAS_RATIOS into one sheet."""
+        items = []
+        for name, surfs in images.items():
+            side = max(1, int(cell*ATLAS_RATIOS.get(name, 1.0)))
+            for surf in surfs:
+                items.append((name, pygame.transform.smoothscale(surf, (side, side))))
+        sheet_w = max(cell*8, max((s.get_width() for _, s in items), default=1))
+        rects = {}; x = y = shelf_h = 0
+        for name, surf in items:
+            w, h = surf.get_size()
+            if x + w > sheet_w:
+                x = 0; y += shelf_h; shelf_h = 0
+            rects.setdefault(name, []).append(pygame.Rect(x, y, w, h))
+            x += w; shelf_h = max(shelf_h, h)
+        sheet = pygame.Surface((sheet_w, max(1, y+shelf_h)), pygame.SRCALPHA)
+        sheet.fill((0,0,0,0))
+        placed = {name: iter(r) for name, r in rects.items()}
+        for name, surf in items:
+            sheet.blit(surf, next(placed[name]))
+        return cls(sheet, rects)
+
+    def save(self, base_path):
+        pygame.image.save(self.sheet, base_path + ".png")
+        with open(base_path + ".json", "w") as f:
+            json.dump({name: [list(r) for r in rs] for name, rs in self.rects.items()}, f)
+
+    @classmethod
+    def load(cls, base_path):
+        with open(base_path + ".json") as f:
+            rects = {name: [pygame.Rect(r) for r in rs] for name, rs in json.load(f).items()}
+        return cls(pygame.image.load(base_path + ".png"), rects)
+
+# ---------- Pipeline ----------
+class AssetPipeline:
+    """Decodes images on a worker thread and serves per-cell-size sprite atlases.
+
+    sources: name -> list of file paths. Names in ATLAS_RATIOS go into the atlas,
+    anything else (backgrounds) is only decoded and handed back through image().
+    Atlases are cached in memory and on disk, keyed by the sources' mtime/size.
+    """
+    def __init__(self, sources, cache_dir=CACHE_DIR):
+        self.sources = sources
+        self.cache_dir = cache_dir
+        self._decoded = {}    # name -> [Surface] (not converted)
+        self._built = {}      # cell -> SpriteAtlas (not converted)
+        self._atlases = {}    # cell -> SpriteAtlas (converted, main thread only)
+        self._converted = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.error = None         # worker failure; later atlases are built on demand, uncached
+        self.use_cache = True
+
+    # ---- worker
+    def start(self, cell_sizes=()):
+        self._thread = threading.Thread(target=self._work, args=(tuple(cell_sizes),), daemon=True)
+        self._thread.start()
+
+    def _work(self, cell_sizes):
+        try:
+            for name in self.sources:
+                if name not in ATLAS_RATIOS: self._decode(name)
+            for cell in cell_sizes:
+                atlas = self._load_or_build(cell)
+                with self._lock: self._built[cell] = atlas
+        except Exception as e:
+            # whatever is missing gets decoded/built on the main thread, without the disk cache
+            self.error = repr(e); self.use_cache = False
+        finally:
+            # always announce, or START would stay disabled
+            try: pygame.event.post(pygame.event.Event(ASSETS_LOADED, error=self.error))
+            except pygame.error: pass
+
+    def _decode(self, name):
+        with self._lock:
+            if name in self._decoded: return self._decoded[name]
+        surfs = [decode_image(p) for p in self.sources[name]]
+        with self._lock:
+            return self._decoded.setdefault(name, surfs)
+
+    def ready(self):
+        return self._thread is None or not self._thread.is_alive()
+
+    def wait(self):
+        if self._thread is not None: self._thread.join()
+
+    # ---- disk cache
+    def cache_key(self, cell):
+        h = hashlib.sha1(f"v{ATLAS_VERSION}:{cell}:{sorted(ATLAS_RATIOS.items())}".encode())
+        for name in sorted(ATLAS_RATIOS):
+            for path in self.sources.get(name, []):
+                try: st = os.stat(path); stamp = (st.st_mtime_ns, st.st_size)
+                except OSError: stamp = (0, 0)
+                h.update(f"{name}:{os.path.basename(path)}:{stamp}".encode())
+        return os.path.join(self.cache_dir, f"atlas_{cell}_{h.hexdigest()[:16]}")
+
+    def _load_or_build(self, cell):
+        if not self.use_cache:
+            return SpriteAtlas.pack(cell, {name: self._decode(name) for name in ATLAS_RATIOS if name in self.sources})
+        base = self.cache_key(cell)
+        if os.path.exists(base + ".png") and os.path.exists(base + ".json"):
+            try: return SpriteAtlas.load(base)
+            except Exception: pass
+        atlas = SpriteAtlas.pack(cell, {name: self._decode(name) for name in ATLAS_RATIOS if name in self.sources})
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atlas.save(base)
+        except (OSError, pygame.error):
+            pass
+        return atlas
+
+    # ---- main thread
+    def atlas(self, cell):
+        """Converted atlas for a cell size (memory -> disk -> build)."""
+        if cell not in self._atlases:
+            with self._lock: built = self._built.pop(cell, None)
+            if built is None: built = self._load_or_build(cell)
+            built.sheet = built.sheet.convert_alpha()
+            self._atlases[cell] = built
+        return self._atlases[cell]
+
+    def image(self, name, index=0, alpha=True):
+        """Converted source image (e.g. backgrounds); decodes now if the worker has not yet."""
+        key = (name, index)
+        if key not in self._converted:
+            surf = self._decode(name)[index]
+            self._converted[key] = surf.convert_alpha() if alpha else surf.convert()
+        return self._converted[key]
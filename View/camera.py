@@ -0,0 +1,122 @@
+import pygame
+from collections import OrderedDict
+
+MIN_CELL_SIZE = 28      # cells never shrink below this, the camera scrolls instead
+CHUNK_CELLS = 16        # chunk = CHUNK_CELLS x CHUNK_CELLS cells pre-rendered once
+MAX_CACHED_CHUNKS = 48  # LRU limit, a full screen needs far fewer than this
+FOLLOW_SPEED = 10.0     # camera catch-up rate (1/s)
+
+# ---------- Camera ----------
+class Camera:
+    """Viewport over the maze. Offsets are in maze pixels (cell * cell_size)."""
+    def __init__(self, viewport, cols, rows, cell_size):
+        self.x = 0.0; self.y = 0.0
+        self.target = (0.0, 0.0)
+        self.configure(viewport, cols, rows, cell_size)
+
+    def configure(self, viewport, cols, rows, cell_size):
+        self.viewport = pygame.Rect(viewport)
+        self.cols, self.rows = cols, rows
+        self.cell_size = cell_size
+        self.world_w = cols*cell_size; self.world_h = rows*cell_size
+        self.x, self.y = self._clamp(self.x, self.y)
+
+    def _clamp(self, x, y):
+        max_x = max(0, self.world_w - self.viewport.w)
+        max_y = max(0, self.world_h - self.viewport.h)
+        return min(max(0.0, x), max_x), min(max(0.0, y), max_y)
+
+    def _center_on(self, col, row):
+        cell = self.cell_size
+        return self._clamp(col*cell + cell/2 - self.viewport.w/2, row*cell + cell/2 - self.viewport.h/2)
+
+    def follow(self, col, row, dt):
+        """Ease toward the cell (col,row) so panning stays smooth."""
+        self.target = self._center_on(col, row)
+        k = min(1.0, dt*FOLLOW_SPEED)
+        self.x += (self.target[0]-self.x)*k
+        self.y += (self.target[1]-self.y)*k
+        if abs(self.target[0]-self.x) < 0.5 and abs(self.target[1]-self.y) < 0.5:
+            self.x, self.y = self.target
+
+    def snap(self, col, row):
+        self.x, self.y = self.target = self._center_on(col, row)
+
+    def offset(self):
+        return int(round(self.x)), int(round(self.y))
+
+    def visible_cells(self):
+        """(c0, r0, c1, r1) of the cells intersecting the viewport, end exclusive."""
+        ox, oy = self.offset(); cell = self.cell_size
+        c0 = ox//cell; r0 = oy//cell
+        c1 = min(self.cols, (ox+self.viewport.w + cell-1)//cell)
+        r1 = min(self.rows, (oy+self.viewport.h + cell-1)//cell)
+        return c0, r0, c1, r1
+
+    def to_screen(self, col, row):
+        ox, oy = self.offset()
+        return self.viewport.x + col*self.cell_size - ox, self.viewport.y + row*self.cell_size - oy
+
+    def is_visible(self, col, row):
+        c0, r0, c1, r1 = self.visible_cells()
+        return c0 <= col < c1 and r0 <= row < r1
+
+# ---------- Chunked maze layer ----------
+class ChunkRenderer:
+    """Pre-renders floor + walls in CHUNK_CELLS blocks so a frame costs a handful of blits."""
+    def __init__(self, chunk_cells=CHUNK_CELLS, max_chunks=MAX_CACHED_CHUNKS):
+        self.chunk_cells = chunk_cells
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict()
+        self.maze = None
+
+    def set_sources(self, maze, floor_map, floor_tiles, wall_tile, cell_size):
+        self.maze = maze; self.floor_map = floor_map
+        self.floor_tiles = floor_tiles; self.wall_tile = wall_tile
+        self.cell_size = cell_size
+        self.rows = len(maze); self.cols = len(maze[0]) if maze else 0
+        self.invalidate()
+
+    def invalidate(self, cells=None):
+        """Drop every chunk, or only the chunks containing the given (col,row) cells."""
+        if cells is None:
+            self._chunks.clear(); return
+        n = self.chunk_cells
+        for c, r in cells:
+            self._chunks.pop((c//n, r//n), None)
+
+    def _render_chunk(self, cx, cy):
+        n = self.chunk_cells; cell = self.cell_size
+        c0, r0 = cx*n, cy*n
+        c1, r1 = min(self.cols, c0+n), min(self.rows, r0+n)
+        surf = pygame.Surface(((c1-c0)*cell, (r1-r0)*cell)).convert()
+        for r in range(r0, r1):
+            maze_row = self.maze[r]; floor_row = self.floor_map[r]
+            y = (r-r0)*cell
+            for c in range(c0, c1):
+                x = (c-c0)*cell
+                surf.blit(self.floor_tiles[floor_row[c]], (x, y))
+                if maze_row[c] == 1:
+                    surf.blit(self.wall_tile, (x, y))
+        return surf
+
+    def get_chunk(self, cx, cy):
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = self._render_chunk(cx, cy)
+            if len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+        else:
+            self._chunks.move_to_end(key)
+        return chunk
+
+    def draw(self, surface, camera):
+        """Blit the chunks under the camera; returns the number of blits."""
+        if not self.maze: return 0
+        n = self.chunk_cells; blits = 0
+        c0, r0, c1, r1 = camera.visible_cells()
+        for cy in range(r0//n, (r1-1)//n + 1):
+            for cx in range(c0//n, (c1-1)//n + 1):
+                surface.blit(self.get_chunk(cx, cy), camera.to_screen(cx*n, cy*n)); blits += 1
+        return blits
@@ -0,0 +1,199 @@
+"""Headless PNG export of a maze, its solution path and search heatmap (no display needed).
+
+The image is rendered in horizontal strips of cells straight from the maze buffer (the bits of
+a .mz MazeFile or a status plane) and each strip is deflated into the PNG as it is produced, so
+memory stays bounded by STRIP_PIXELS whatever the maze size. Pixels are palette indices (status
+colors + heatmap levels), one byte each. With --tile the image is split into tile x tile cell
+PNGs written side by side from the same strips.
+
+    python -m View.export huge.mz --out huge.png --cell 1 --tile 8192
+    python -m View.export --generate 301x301 --mode Wilson --solve A* --heatmap --cell 4 --out wilson.png
+"""
+import argparse
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+from View.minimap import STATUS_COLORS
+from View.heatmap import make_colormap, HEATMAP_ALPHA
+
+DEFAULT_CELL = 4          # pixels per cell side
+STRIP_PIXELS = 1 << 24    # pixels rendered per strip (bounds memory)
+IDAT_BYTES = 1 << 18      # compressed bytes buffered per PNG chunk
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PATH_CODE = 4             # STATUS_COLORS index of the solution path
+HEAT_BASE = len(STATUS_COLORS)
+HEAT_LEVELS = 256 - HEAT_BASE
+
+def make_palette():
+    """Status colors, then the heatmap ramp blended over the floor color like the in-game overlay"""
+    a = HEATMAP_ALPHA / 255.0
+    heat = make_colormap(HEAT_LEVELS)*a + STATUS_COLORS[1]*(1-a)
+    return np.concatenate([STATUS_COLORS, heat.astype(np.uint8)])
+
+class PngStream:
+    """8-bit palette PNG written row block by row block (filter 'Up', so repeated rows cost ~nothing)."""
+    def __init__(self, path, width, height, palette, level=6):
+        self.path, self.width, self.height = path, width, height
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._zip = zlib.compressobj(level)
+        self._prev = np.zeros(width, np.uint8)
+        self._pending = []; self._pending_size = 0
+        self._file.write(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+        self._chunk(b"PLTE", palette.astype(np.uint8).tobytes())
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack(">I", len(data)) + kind + data)
+        self._file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+    def _emit(self, data, force=False):
+        if data: self._pending.append(data); self._pending_size += len(data)
+        if self._pending_size >= IDAT_BYTES or (force and self._pending):
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []; self._pending_size = 0
+
+    def write(self, rows):
+        """rows: uint8 palette indices (rows, width)"""
+        out = np.empty((len(rows), rows.shape[1]+1), np.uint8)
+        out[:, 0] = 2  # Up: each byte minus the byte above
+        np.subtract(rows[1:], rows[:-1], out=out[1:, 1:])
+        np.subtract(rows[0], self._prev, out=out[0, 1:])
+        self._prev = rows[-1].copy()
+        self.rows += len(rows)
+        self._emit(self._zip.compress(out.tobytes()))
+
+    def close(self):
+        if self._file is None: return
+        if self.rows == self.height:  # an interrupted export leaves the file without IEND
+            self._emit(self._zip.flush(), force=True)
+            self._chunk(b"IEND", b"")
+        self._file.close(); self._file = None
+
+def _row_reader(source, width):
+    """MazeFile or status plane -> read(r0, r1): status codes of rows [r0, r1) as a flat uint8 array"""
+    bits = getattr(source, "bits", None)
+    if bits is None:
+        plane = np.frombuffer(source, np.uint8)
+        return lambda r0, r1: plane[r0*width:r1*width].copy()
+    bits = np.frombuffer(bits, np.uint8)
+    marks = [(pos[1]*width + pos[0], code) for pos, code in ((source.start_pos, 2), (source.end_pos, 3)) if pos]
+    def read(r0, r1):
+        lo, hi = r0*width, r1*width
+        codes = np.unpackbits(bits[lo >> 3:(hi+7) >> 3], bitorder="little")[(lo & 7):(lo & 7) + hi-lo]
+        for i, code in marks:
+            if lo <= i < hi: codes[i-lo] = code
+        return codes
+    return read
+
+def _tile_path(path, row, col):
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{row}_{col}{ext or '.png'}"
+
+def render_strip(codes, r0, width, path_cells=None, order=None, order_max=0):
+    """Status codes of rows r0.. (flat, modified in place) -> palette indices (rows, width), 1px per cell"""
+    np.minimum(codes, HEAT_BASE-1, out=codes)
+    if order is not None:
+        seen = (order >= 0) & (codes == 1)
+        codes[seen] = HEAT_BASE + (order[seen] * ((HEAT_LEVELS-1) / max(order_max, 1))).astype(np.uint8)
+    if path_cells is not None and len(path_cells):
+        cells = path_cells - r0*width
+        codes[cells[(codes[cells] <= 1) | (codes[cells] >= HEAT_BASE)]] = PATH_CODE  # keep start / end markers
+    return codes.reshape(-1, width)
+
+def export_png(path, source, width, height, cell=DEFAULT_CELL, solution=None, visit_order=None,
+               tile=None, level=6):
+    """Write the maze as PNG(s); returns the written paths.
+
+    source: Model.maze_file.MazeFile or a status plane (1 byte per cell, row-major).
+    solution: [(x, y), ...] drawn as path cells; visit_order: int32 per cell (-1 = not visited),
+    e.g. SolvingModel.visit_order or a np.memmap, drawn as the search heatmap.
+    tile: cells per tile side; None writes a single image.
+    """
+    read = _row_reader(source, width)
+    tile = tile or max(width, height)
+    tiles_x = -(-width // tile)
+    path_cells = None
+    if solution:
+        path_cells = np.unique(np.fromiter((y*width + x for x, y in solution), np.int64, len(solution)))
+    order = order_max = None
+    if visit_order is not None:
+        order = np.frombuffer(visit_order, np.int32, count=width*height) if not isinstance(visit_order, np.ndarray) \
+            else visit_order.reshape(-1)
+        order_max = int(order.max())
+    palette = make_palette()
+    strip_rows = max(1, STRIP_PIXELS // (width*cell*cell))
+
+    written = []
+    for ty in range(0, height, tile):
+        t1 = min(ty+tile, height)
+        writers = []
+        for tx in range(tiles_x):
+            c0, c1 = tx*tile, min((tx+1)*tile, width)
+            name = path if tiles_x == 1 and tile >= height else _tile_path(path, ty//tile, tx)
+            writers.append((c0*cell, c1*cell, PngStream(name, (c1-c0)*cell, (t1-ty)*cell, palette, level)))
+        try:
+            for r0 in range(ty, t1, strip_rows):
+                r1 = min(r0+strip_rows, t1)
+                cells = None
+                if path_cells is not None:
+                    lo, hi = np.searchsorted(path_cells, (r0*width, r1*width))
+                    cells = path_cells[lo:hi]
+                pixels = render_strip(read(r0, r1), r0, width, cells,
+                                      None if order is None else order[r0*width:r1*width], order_max)
+                if cell > 1: pixels = pixels.repeat(cell, axis=0).repeat(cell, axis=1)
+                for x0, x1, writer in writers: writer.write(pixels[:, x0:x1])
+        finally:
+            for _, _, writer in writers: writer.close()
+        written += [writer.path for _, _, writer in writers]
+    return written
+
+def main(argv=None):
+    from Controller.cli import parse_size
+    import Model
+    from Model.maze_file import MazeFile
+    from Model.node_cell import Node_Cell
+    parser = argparse.ArgumentParser(description="Export a maze (and optionally its solution) to PNG without a display.")
+    parser.add_argument("maze", nargs="?", help=".mz maze file (read through mmap)")
+    parser.add_argument("--generate", type=parse_size, metavar="WxH", help="generate a maze instead of reading one")
+    parser.add_argument("--mode", default="DFS", choices=Model.GENERATION_MODES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solve", choices=Model.SOLVING_ALGORITHMS, help="draw this solver's path")
+    parser.add_argument("--heatmap", action="store_true", help="also draw the solver's visit order")
+    parser.add_argument("--cell", type=int, default=DEFAULT_CELL, help="pixels per cell")
+    parser.add_argument("--tile", type=int, help="split into tiles of this many cells per side")
+    parser.add_argument("--level", type=int, default=6, help="zlib level 0-9")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+    if (args.maze is None) == (args.generate is None):
+        parser.error("pass either a maze file or --generate WxH")
+    if args.heatmap and not args.solve:
+        parser.error("--heatmap needs --solve")
+
+    if args.maze:
+        source = grid = MazeFile(args.maze)
+        width, height, start, end = source.width, source.height, source.start_pos, source.end_pos
+    else:
+        width, height = args.generate
+        generator = Model.GenerationModel(width, height, Node_Cell, args.mode, args.seed)
+        generator.generate_maze()
+        source, grid, start, end = generator.get_status_plane(), generator.grid, generator.start_pos, generator.end_pos
+    try:
+        solution = visit_order = None
+        if args.solve:
+            solver = Model.SolvingModel(grid, width, height)
+            solver.start_pos, solver.end_pos = start, end
+            if solver.solve_maze(args.solve): solution = solver.solution_path
+            if args.heatmap: visit_order = solver.visit_order
+        for path in export_png(args.out, source, width, height, args.cell, solution, visit_order, args.tile, args.level):
+            print(path)
+    finally:
+        if args.maze: source.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
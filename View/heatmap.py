@@ -0,0 +1,78 @@
+import numpy as np
+import pygame
+from View.profiler import PROFILER
+
+REPLAY_SECONDS = 6.0   # a full replay lasts this long whatever the search size
+HEATMAP_ALPHA = 150
+
+def make_colormap(n=256):
+    """Dark purple -> red -> yellow ramp (inferno-like). Never pure black, black is the colorkey."""
+    anchors = np.array([(40,10,90), (140,30,110), (230,70,50), (250,180,40), (252,250,160)], dtype=np.float32)
+    t = np.linspace(0, len(anchors)-1, n)
+    i = np.minimum(t.astype(np.int32), len(anchors)-2)
+    f = (t - i)[:, None]
+    lut = anchors[i]*(1-f) + anchors[i+1]*f
+    return np.maximum(lut, 1).astype(np.uint8)
+
+class SearchHeatmap:
+    """Overlay of 'visited up to step t' built from the solver's visit_order array."""
+    def __init__(self):
+        self.order = None
+        self.total = 0
+        self.step = 0.0
+        self.playing = False
+        self.visible = True
+        self.lut = make_colormap()
+        self._key = None; self._surf = None
+        self._canvas = None; self._mapped = None
+
+    def set_trace(self, visit_order, cols, rows, play=True):
+        """visit_order: int32 buffer (row-major, -1 = never visited), e.g. SolvingModel.visit_order"""
+        self.order = np.frombuffer(visit_order, dtype=np.int32, count=cols*rows).reshape(rows, cols)
+        self.total = int(self.order.max()) + 1
+        self.step = 0.0 if play else float(self.total)
+        self.playing = play
+        self._key = None
+
+    def clear(self):
+        self.order = None; self.total = 0; self.playing = False; self._key = None
+
+    def scrub(self, fraction):
+        """Move the replay cursor by a fraction of the whole search."""
+        self.step = min(max(0.0, self.step + fraction*self.total), float(self.total))
+        self.playing = False
+
+    def update(self, dt):
+        if self.playing and self.total:
+            self.step += self.total * dt / REPLAY_SECONDS
+            if self.step >= self.total:
+                self.step = float(self.total); self.playing = False
+
+    def render(self, step, c0, r0, c1, r1):
+        """1px-per-cell surface of the window [c0,c1) x [r0,r1) up to the given step."""
+        size = (c1-c0, r1-r0)
+        if self._canvas is None or self._canvas.get_size() != size:
+            self._canvas = pygame.Surface(size, depth=32)
+            self._canvas.set_colorkey((0, 0, 0))
+            self._canvas.set_alpha(HEATMAP_ALPHA)
+            # colors pre-mapped to the surface pixel format so blit_array takes plain ints
+            self._mapped = np.array([self._canvas.map_rgb(tuple(c)) for c in self.lut], dtype=np.uint32)
+        order = self.order[r0:r1, c0:c1].T
+        idx = (order * ((len(self.lut)-1) / max(step, 1))).astype(np.int32)
+        np.clip(idx, 0, len(self.lut)-1, out=idx)
+        pixels = self._mapped[idx]
+        pixels[(order < 0) | (order > step)] = 0
+        pygame.surfarray.blit_array(self._canvas, pixels)
+        return self._canvas
+
+    def draw(self, surface, camera):
+        if not self.visible or self.order is None: return
+        c0, r0, c1, r1 = camera.visible_cells()
+        if c1 <= c0 or r1 <= r0: return
+        step = int(self.step)
+        key = (step, c0, r0, c1, r1, camera.cell_size)
+        if key != self._key:
+            cell = camera.cell_size
+            self._surf = pygame.transform.scale(self.render(step, c0, r0, c1, r1), ((c1-c0)*cell, (r1-r0)*cell))
+            self._key = key
+        surface.blit(self._surf, camera.to_screen(c0, r0)); PROFILER.count_blits()
@@ -0,0 +1,86 @@
+import numpy as np
+import pygame
+from View.profiler import PROFILER
+
+LOD_CELL_SIZE = 6    # below this cell size the maze is drawn from the 1px-per-cell image
+MINIMAP_MAX = 180    # longest side of the corner minimap (px)
+
+# Colors indexed by Node_Cell status: 0 wall, 1 path, 2 start, 3 end, 4 path found, 5 moved path
+STATUS_COLORS = np.array([
+    (34, 52, 30),
+    (150, 170, 110),
+    (90, 200, 255),
+    (255, 215, 60),
+    (250, 120, 60),
+    (120, 150, 200),
+], dtype=np.uint8)
+
+def plane_to_surface(plane, cols, rows, size=None):
+    """Status plane (row-major, 1 byte per cell) -> RGB surface in one surfarray call, scaled once."""
+    codes = np.frombuffer(plane, dtype=np.uint8, count=cols*rows).reshape(rows, cols)
+    rgb = STATUS_COLORS[np.minimum(codes, len(STATUS_COLORS)-1)]
+    surf = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+    if size is not None and size != (cols, rows):
+        surf = pygame.transform.scale(surf, size)
+    return surf
+
+def search_status_plane(plane, visit_order, path, cols):
+    """Copy of a status plane with visited cells (5) and the solution path (4) marked."""
+    codes = np.frombuffer(plane, dtype=np.uint8).copy()
+    order = np.frombuffer(visit_order, dtype=np.int32, count=codes.size)
+    codes[(order >= 0) & (codes == 1)] = 5
+    for x, y in path:
+        if codes[y*cols + x] in (1, 5): codes[y*cols + x] = 4
+    return codes.tobytes()
+
+class PlaneImage:
+    """1 pixel per cell image of the maze; used for the minimap and zoomed-out levels of detail."""
+    def __init__(self):
+        self.base = None
+        self._scaled = {}
+        self._lod_key = None; self._lod_surf = None
+
+    def set_plane(self, plane, cols, rows):
+        self.cols, self.rows = cols, rows
+        self.base = plane_to_surface(plane, cols, rows)
+        self._scaled.clear(); self._lod_key = None
+
+    def scaled(self, size):
+        if size not in self._scaled:
+            self._scaled[size] = pygame.transform.scale(self.base, size)
+        return self._scaled[size]
+
+    def draw_lod(self, surface, camera):
+        """Draw the visible part of the maze, rescaling only when the view changes."""
+        if self.base is None: return
+        c0, r0, c1, r1 = camera.visible_cells()
+        if c1 <= c0 or r1 <= r0: return
+        key = (c0, r0, c1, r1, camera.cell_size)
+        if key != self._lod_key:
+            sub = self.base.subsurface(pygame.Rect(c0, r0, c1-c0, r1-r0))
+            self._lod_surf = pygame.transform.scale(sub, ((c1-c0)*camera.cell_size, (r1-r0)*camera.cell_size))
+            self._lod_key = key
+        surface.blit(self._lod_surf, camera.to_screen(c0, r0)); PROFILER.count_blits()
+
+class Minimap:
+    def __init__(self, image, max_size=MINIMAP_MAX):
+        self.image = image
+        self.max_size = max_size
+        self.visible = True
+
+    def size(self):
+        img = self.image
+        scale = min(self.max_size/img.cols, self.max_size/img.rows)
+        return max(1, int(img.cols*scale)), max(1, int(img.rows*scale))
+
+    def draw(self, surface, anchor_rect, camera, player):
+        if not self.visible or self.image.base is None: return
+        w, h = self.size()
+        rect = pygame.Rect(anchor_rect.right-w-12, anchor_rect.y+12, w, h)
+        pygame.draw.rect(surface, (12,18,12), rect.inflate(6, 6), border_radius=4)
+        surface.blit(self.image.scaled((w, h)), rect.topleft); PROFILER.count_blits()
+        sx = w/self.image.cols; sy = h/self.image.rows
+        c0, r0, c1, r1 = camera.visible_cells()
+        view = pygame.Rect(rect.x+int(c0*sx), rect.y+int(r0*sy), max(2, int((c1-c0)*sx)), max(2, int((r1-r0)*sy)))
+        pygame.draw.rect(surface, (240,240,240), view, 1)
+        pygame.draw.circle(surface, (255,90,60), (rect.x+int((player[0]+0.5)*sx), rect.y+int((player[1]+0.5)*sy)), 3)
@@ -0,0 +1,103 @@
+import os, sys, json, time
+from collections import deque
+from contextlib import contextmanager
+import pygame
+
+TRACE_DIR = os.path.join(os.path.expanduser("~"), ".monkeys_treasure", "traces")
+HUD_REFRESH = 0.25  # seconds between HUD text rebuilds
+
+def percentile(sorted_values, q):
+    if not sorted_values: return 0
+    i = min(len(sorted_values)-1, int(round(q*(len(sorted_values)-1))))
+    return sorted_values[i]
+
+class FrameProfiler:
+    """perf_counter_ns spans per frame phase, rolling percentiles and Chrome trace export.
+
+    "live_blocks" is the net change of live interpreter blocks (sys.getallocatedblocks) over a
+    frame: temporaries freed within the frame cancel out and a frame that releases more than it
+    keeps is negative. A steadily positive value is a leak.
+    """
+    def __init__(self, history=600, trace_limit=50000):
+        self.hud_visible = False
+        self.frames = deque(maxlen=history)        # [{phase: ns}, ...] one dict per frame
+        self.events = deque(maxlen=trace_limit)    # (name, start_ns, dur_ns) for the trace
+        self.order = []                            # phases in first-seen order for the HUD
+        self.blits = 0
+        self._t0 = time.perf_counter_ns()
+        self._frame = None; self._frame_start = 0; self._live_blocks = 0
+        self._hud = None; self._hud_time = 0.0
+
+    # ---- recording
+    def begin_frame(self):
+        self._frame = {}; self.blits = 0
+        self._live_blocks = sys.getallocatedblocks()
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if self._frame is None: return
+        end = time.perf_counter_ns()
+        self._frame["frame"] = end - self._frame_start
+        self._frame["blits"] = self.blits
+        self._frame["live_blocks"] = sys.getallocatedblocks() - self._live_blocks
+        self.events.append(("frame", self._frame_start, end - self._frame_start))
+        self.frames.append(self._frame); self._frame = None
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter_ns() - start
+            if self._frame is not None:
+                self._frame[name] = self._frame.get(name, 0) + dur
+                if name not in self.order: self.order.append(name)
+            self.events.append((name, start, dur))
+
+    def count_blits(self, n=1):
+        self.blits += n
+
+    # ---- stats
+    def stats(self, name):
+        """(p50, p99) of a phase over the rolling window, in ms (counts for blits/live_blocks)."""
+        values = sorted(f[name] for f in self.frames if name in f)
+        scale = 1 if name in ("blits", "live_blocks") else 1e-6
+        return percentile(values, 0.50)*scale, percentile(values, 0.99)*scale
+
+    def export_chrome_trace(self, path=None):
+        """Write the recorded spans as Chrome trace-format JSON (chrome://tracing, Perfetto)."""
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        events = [{"name": name, "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                   "ts": (start - self._t0)/1000.0, "dur": dur/1000.0}
+                  for name, start, dur in self.events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    # ---- HUD
+    def draw_hud(self, surface, font):
+        """Rolling p50/p99 table in the bottom-left corner (rebuilt every HUD_REFRESH s)."""
+        if not self.hud_visible: return
+        now = time.perf_counter()
+        if self._hud is None or now - self._hud_time >= HUD_REFRESH:
+            lines = ["phase            p50     p99 (ms)"]
+            for name in ["frame"] + self.order:
+                p50, p99 = self.stats(name)
+                lines.append(f"{name:<14} {p50:7.2f} {p99:7.2f}")
+            b50, b99 = self.stats("blits"); l50, l99 = self.stats("live_blocks")
+            lines.append(f"blits/frame    {b50:7.0f} {b99:7.0f}")
+            lines.append(f"Δlive blocks   {l50:7.0f} {l99:7.0f}")
+            rows = [font.render(line, True, (230,240,230)) for line in lines]
+            w = max(r.get_width() for r in rows) + 20; h = sum(r.get_height() for r in rows) + 16
+            self._hud = pygame.Surface((w, h), pygame.SRCALPHA)
+            self._hud.fill((0,0,0,170))
+            y = 8
+            for r in rows:
+                self._hud.blit(r, (10, y)); y += r.get_height()
+            self._hud_time = now
+        surface.blit(self._hud, (12, surface.get_height()-self._hud.get_height()-12))
+
+PROFILER = FrameProfiler()
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+import Model
+from Model.distance_field import DistanceField, DIRECTIONS
+from Model.node_cell import Node_Cell
+
+
+def maze(width=31, height=21, seed=4):
+    generator = Model.GenerationModel(width, height, Node_Cell, "DFS", seed)
+    generator.generate_maze()
+    return bytearray(generator.get_status_plane()), generator.end_pos
+
+
+def assert_matches_rebuild(field):
+    fresh = DistanceField(field.open, field.width, field.height, field.goal)
+    assert field.dist == fresh.dist
+    for i in range(len(field.dist)):  # any shortest-path move is fine, not necessarily the same one
+        x, y = i % field.width, i // field.width
+        move = field.best_move(x, y)
+        if fresh.dist[i] <= 0:
+            assert move is None
+        else:
+            dx, dy = move
+            assert field.distance(x + dx, y + dy) == fresh.dist[i] - 1
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_updates_match_full_rebuild(seed):
+    plane, goal = maze(seed=seed)
+    width, height = 31, 21
+    field = DistanceField(plane, width, height, goal)
+    rng = random.Random(seed)
+    inner = [(x, y) for y in range(1, height - 1) for x in range(1, width - 1)]
+    for _ in range(150):
+        x, y = rng.choice(inner)
+        field.set_open(x, y, not field.open[y * width + x])
+        assert_matches_rebuild(field)
+
+
+def test_toggling_goal_rebuilds():
+    plane, goal = maze()
+    field = DistanceField(plane, 31, 21, goal)
+    field.set_open(*goal, False)
+    assert field.distance(*goal) == -1
+    field.set_open(*goal, True)
+    assert_matches_rebuild(field)
+    assert field.distance(*goal) == 0
+
+
+def test_path_from_follows_best_moves():
+    plane, goal = maze()
+    field = DistanceField(plane, 31, 21, goal)
+    path = field.path_from(1, 1)
+    assert path[0] == (1, 1) and path[-1] == goal
+    assert len(path) == field.distance(1, 1) + 1
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert (x2 - x1, y2 - y1) in DIRECTIONS
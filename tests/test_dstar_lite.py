@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import Model
+from Model.node_cell import Node_Cell
+
+WIDTH, HEIGHT = 31, 21
+
+
+def maze(seed, mode="Kruskal"):
+    generator = Model.GenerationModel(WIDTH, HEIGHT, Node_Cell, mode, seed)
+    generator.generate_maze()
+    return bytearray(generator.get_status_plane()), generator.start_pos, generator.end_pos
+
+
+def ucs(plane, start, end, costs=None):
+    """Reference: a fresh solver on a fresh grid every time."""
+    solver = Model.SolvingModel(Model.grid_from_status_plane(plane, WIDTH, HEIGHT), WIDTH, HEIGHT)
+    solver.set_cost_plane(costs)
+    solver.start_pos, solver.end_pos = start, end
+    metrics = solver.solve_maze("UCS")
+    return bool(metrics), solver.path_cost
+
+
+def check_path(solver, plane):
+    path = solver.solution_path
+    assert path[0] == solver.start_pos and path[-1] == solver.end_pos
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x2 - x1) + abs(y2 - y1) == 1
+        assert plane[y2 * WIDTH + x2]
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_dstar_lite_matches_ucs_under_changes(seed, weighted):
+    plane, start, end = maze(seed)
+    rng = random.Random(seed)
+    costs = [rng.randint(1, 5) for _ in range(WIDTH * HEIGHT)] if weighted else None
+    grid = Model.grid_from_status_plane(plane, WIDTH, HEIGHT)
+    solver = Model.SolvingModel(grid, WIDTH, HEIGHT)
+    solver.set_cost_plane(costs)
+    solver.start_pos, solver.end_pos = start, end
+    inner = [(x, y) for y in range(1, HEIGHT - 1) for x in range(1, WIDTH - 1)]
+
+    for _ in range(40):
+        found = bool(solver.solve_maze("D* Lite"))
+        expected_found, expected_cost = ucs(plane, solver.start_pos, end, costs)
+        assert found == expected_found
+        if found:
+            assert solver.path_cost == expected_cost
+            check_path(solver, plane)
+            if len(solver.solution_path) > 2 and rng.random() < 0.5:  # the agent moves along its path
+                solver.start_pos = solver.solution_path[rng.randrange(1, len(solver.solution_path) - 1)]
+        # open or close a few cells, never the current start / goal
+        changed = [cell for cell in rng.sample(inner, 3) if cell not in (solver.start_pos, end)]
+        for x, y in changed:
+            plane[y * WIDTH + x] = 0 if plane[y * WIDTH + x] else 1
+            grid[y][x].status = plane[y * WIDTH + x]
+        solver.update_cells(changed)
@@ -0,0 +1,56 @@
+from collections import deque
+
+import pytest
+
+import Model
+from Model.node_cell import Node_Cell
+
+
+def generate(width, height, mode, seed=0):
+    generator = Model.GenerationModel(width, height, Node_Cell, mode, seed)
+    generator.generate_maze()
+    return generator
+
+
+def reachable(generator):
+    """Open cells reachable from the start position (4-neighbourhood)."""
+    width, height = generator.maze_width, generator.height_width
+    plane = generator.get_status_plane()
+    seen = {generator.start_pos}
+    queue = deque(seen)
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and plane[ny * width + nx] and (nx, ny) not in seen:
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return seen
+
+
+@pytest.mark.parametrize("width, height", [(20, 14), (14, 20), (4, 4), (21, 14), (20, 13)])
+@pytest.mark.parametrize("seed", range(5))
+def test_wilson_even_sizes_terminate(width, height, seed):
+    generator = generate(width, height, "Wilson", seed)
+    plane = generator.get_status_plane()
+    assert generator.generation_complete
+    assert len(reachable(generator)) == sum(1 for v in plane if v)
+
+
+@pytest.mark.parametrize("mode", Model.GENERATION_MODES)
+def test_modes_generate_connected_mazes(mode):
+    generator = generate(21, 13, mode, seed=3)
+    plane = generator.get_status_plane()
+    assert generator.end_pos in reachable(generator)
+    assert len(reachable(generator)) == sum(1 for v in plane if v)
+
+
+@pytest.mark.parametrize("width, height", [(3, 3), (21, 13), (101, 5)])
+def test_check_maze_size_accepts_odd_sizes(width, height):
+    Model.check_maze_size(width, height)
+
+
+@pytest.mark.parametrize("width, height", [(20, 14), (21, 14), (1, 1), (0, 0), (-3, 5)])
+def test_check_maze_size_rejects_even_and_small_sizes(width, height):
+    with pytest.raises(ValueError):
+        Model.check_maze_size(width, height)
@@ -0,0 +1,70 @@
+import struct
+
+import pytest
+
+import Model
+from Model.maze_file import (HEADER_FORMATS, MAGIC, MODE_SIZE, FLAG_SEED, MazeFile, decode_header,
+                             encode_header, pack_plane, read_maze, write_maze)
+from Model.node_cell import Node_Cell
+
+
+def generate(mode, width=31, height=17, seed=5):
+    generator = Model.GenerationModel(width, height, Node_Cell, mode, seed)
+    generator.generate_maze()
+    return generator
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("mode", Model.GENERATION_MODES)
+def test_round_trip_every_mode(tmp_path, mode, compress):
+    generator = generate(mode)
+    plane = bytes(generator.get_status_plane())
+    path = str(tmp_path / "maze.mz")
+    generator.save(path, compress)
+
+    info = read_maze(path)
+    assert info["mode"] == mode
+    assert info["seed"] == 5
+    assert (info["start"], info["end"]) == (generator.start_pos, generator.end_pos)
+    assert bytes(info["plane"]) == plane
+
+    with MazeFile(path) as maze:
+        assert maze.mode == mode
+        assert bytes(maze.to_plane()) == plane
+
+    loaded = Model.GenerationModel.load(path)
+    assert loaded.mode == mode
+    assert bytes(loaded.get_status_plane()) == plane
+
+
+def test_reads_version_1_header(tmp_path):
+    generator = generate("Wilson", seed=3)
+    plane = generator.get_status_plane()
+    path = tmp_path / "v1.mz"
+    path.write_bytes(struct.pack(HEADER_FORMATS[1], MAGIC, 1, FLAG_SEED, 0, 31, 17,
+                                 *generator.start_pos, *generator.end_pos, 3, b"Wilson") + pack_plane(plane))
+    info = read_maze(str(path))
+    assert (info["mode"], info["seed"]) == ("Wilson", 3)
+    assert bytes(info["plane"]) == bytes(plane)
+
+
+def test_long_mode_name_is_rejected():
+    encode_header(3, 3, None, None, "x" * MODE_SIZE, None, False)
+    with pytest.raises(ValueError):
+        encode_header(3, 3, None, None, "x" * (MODE_SIZE + 1), None, False)
+
+
+def test_bad_headers_are_rejected(tmp_path):
+    header = encode_header(3, 3, (1, 1), None, "DFS", None, False)
+    with pytest.raises(ValueError):
+        decode_header(b"NOPE" + header[4:])
+    with pytest.raises(ValueError):
+        decode_header(header[:4] + bytes([99]) + header[5:])
+    with pytest.raises(ValueError):
+        decode_header(header[:20])
+    path = str(tmp_path / "short.mz")
+    write_maze(path, bytes(9), 3, 3)
+    with open(path, "r+b") as f:
+        f.truncate(len(header))
+    with pytest.raises(ValueError):
+        MazeFile(path)
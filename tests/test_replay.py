@@ -0,0 +1,101 @@
+import random
+from array import array
+
+import pytest
+
+from Model.replay import DIRECTIONS, ReplayPlayer, ReplayRecorder
+
+WIDTH, HEIGHT = 21, 13
+TICK_MS = 10
+
+
+def record(path, events, keyframe_every, close=True):
+    """Writes events; returns the expected state after each: (ticks, x, y, steps, trace or None)."""
+    recorder = ReplayRecorder(path, bytes([1]) * (WIDTH * HEIGHT), WIDTH, HEIGHT, (1, 1), "DFS", 7,
+                              tick_ms=TICK_MS, keyframe_every=keyframe_every)
+    expected, ticks, trace = [], 0, None
+    for t, kind, value in events:
+        ticks = max(ticks, int(t * 1000 / TICK_MS))
+        if kind == "move":
+            recorder.move(*value, t)
+        elif kind == "position":
+            recorder.position(*value, t)
+        else:
+            recorder.trace(*value, t)
+            trace = value
+        expected.append((ticks, recorder.x, recorder.y, recorder.steps, trace))
+    if close:
+        recorder.close()
+    else:
+        recorder.flush_block()
+    return recorder, expected
+
+
+def random_events(count, seed):
+    rng = random.Random(seed)
+    events, t = [], 0.0
+    for _ in range(count):
+        t += rng.choice([0.0, 0.01, 0.05, 0.3, 1.0, 2.5])  # includes gaps past the 1-byte dt range
+        roll = rng.random()
+        if roll < 0.05:
+            events.append((t, "position", (rng.randrange(WIDTH), rng.randrange(HEIGHT))))
+        elif roll < 0.1:
+            order = array("i", [-1]) * (WIDTH * HEIGHT)
+            for rank, cell in enumerate(rng.sample(range(WIDTH * HEIGHT), 40)):
+                order[cell] = rank
+            x, y = rng.randrange(WIDTH), rng.randrange(HEIGHT)
+            steps = [rng.choice(DIRECTIONS) for _ in range(rng.randrange(0, 30))]
+            trail = [(x, y)]
+            for dx, dy in steps:
+                x += dx; y += dy
+                trail.append((x, y))
+            events.append((t, "trace", (order, trail)))
+        else:
+            events.append((t, "move", rng.choice(DIRECTIONS)))
+    return events
+
+
+def expected_at(expected, ticks):
+    state = (0, 1, 1, 0, None)
+    for entry in expected:
+        if entry[0] > ticks:
+            break
+        state = entry
+    return state
+
+
+def check_seek(player, expected, seed):
+    rng = random.Random(seed)
+    last = expected[-1][0] * TICK_MS / 1000
+    times = [entry[0] * TICK_MS / 1000 for entry in expected] + [rng.uniform(-1, last + 1) for _ in range(300)]
+    rng.shuffle(times)  # seeking backwards and forwards
+    for t in times:
+        state = player.state_at(t)
+        _, x, y, steps, trace = expected_at(expected, t * 1000 / TICK_MS)
+        assert (state.x, state.y, state.steps) == (x, y, steps), t
+        if trace is None:
+            assert state.trace_offset == -1
+        else:
+            order, trail = player.trace(state.trace_offset)
+            assert (order, trail) == (trace[0], trace[1])
+
+
+@pytest.mark.parametrize("keyframe_every", [1, 7, 256])
+def test_seek_matches_sequential_playback(tmp_path, keyframe_every):
+    path = str(tmp_path / "run.mzr")
+    events = random_events(500, seed=keyframe_every)
+    _, expected = record(path, events, keyframe_every)
+    with ReplayPlayer(path) as player:
+        assert (player.width, player.height, player.mode, player.seed) == (WIDTH, HEIGHT, "DFS", 7)
+        assert player.duration == pytest.approx(expected[-1][0] * TICK_MS / 1000)
+        check_seek(player, expected, seed=1)
+
+
+def test_unclosed_file_plays_without_index(tmp_path):
+    path = str(tmp_path / "crashed.mzr")
+    recorder, expected = record(path, random_events(200, seed=3), keyframe_every=16, close=False)
+    try:
+        with ReplayPlayer(path) as player:
+            check_seek(player, expected, seed=2)
+    finally:
+        recorder.close()